@@ -4,7 +4,12 @@ from flask_migrate import Migrate
 from flask_restful import Api
 
 from db import db
+from managers.availability_manager import availability_manager
+from managers.photo_deletion_manager import photo_deletion_manager
+from managers.table_version_manager import TableVersionManager
+from managers.upload_manager import UploadManager
 from resources.routes import routes
+from services.image_pipeline import image_pipeline
 
 
 class ProductionConfiguration:
@@ -31,6 +36,12 @@ class TestingConfiguration:
     FLASK_ENV = "TestConfiguration"
     TESTING = True
     DEBUG = True
+    # the variants are created in background threads, the tests which need them enable it
+    IMAGE_VARIANTS_ENABLED = False
+    # the queued photos are deleted in a background thread as well, the tests drain the queue themselves
+    PHOTO_DELETION_WORKER_ENABLED = False
+    # the availability filter is loaded by the tests after the tables are created
+    AVAILABILITY_PRELOAD_ENABLED = False
     SQLALCHEMY_DATABASE_URI = (
         f"postgresql://{config('DB_USER')}:{config('DB_PASSWORD')}"
         f"@localhost:{config('DB_PORT')}/{config('TEST_DB_NAME')}")
@@ -47,6 +58,11 @@ def create_app(configuration=None):
     api = Api(app)
     migrate = Migrate(app, db)
     db.init_app(app)
+    TableVersionManager.listen()
+    image_pipeline.listen()
+    photo_deletion_manager.listen(app)
+    UploadManager.listen()
+    availability_manager.listen(app)
 
     # CORS(app)
 
@@ -0,0 +1,35 @@
+# Authenticated users are cached for PRINCIPAL_CACHE_TTL seconds, at most PRINCIPAL_CACHE_SIZE at once
+PRINCIPAL_CACHE_SIZE = 10000
+PRINCIPAL_CACHE_TTL = 60
+
+# Lifetime in seconds of the access tokens and of the refresh tokens which are used to get new access tokens
+ACCESS_TOKEN_TTL = 15 * 60
+REFRESH_TOKEN_TTL = 14 * 24 * 60 * 60
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Revoked token ids are kept in a bloom filter sized for REVOCATION_BLOOM_CAPACITY ids with the given false positive
+# rate. New revocations are read every REVOCATION_SYNC_INTERVAL seconds and the filter is rebuilt without the expired
+# ids every REVOCATION_REBUILD_INTERVAL seconds. Revocations which are committed up to REVOCATION_SYNC_OVERLAP seconds
+# after their transaction started are still synced.
+REVOCATION_BLOOM_CAPACITY = 100000
+REVOCATION_BLOOM_ERROR_RATE = 0.001
+REVOCATION_SYNC_INTERVAL = 5
+REVOCATION_REBUILD_INTERVAL = 60 * 60
+REVOCATION_SYNC_OVERLAP = 60
+
+# Passwords are hashed with PASSWORD_HASH_METHOD in a pool of PASSWORD_HASH_WORKERS processes (env variable, default
+# below). When PASSWORD_HASH_MAX_PENDING hashes are queued or running, new requests get 503 with Retry-After.
+# Hashes created with other parameters are rehashed on the next successful login.
+PASSWORD_HASH_METHOD = "pbkdf2:sha256:260000"
+PASSWORD_HASH_SALT_LENGTH = 16
+DEFAULT_PASSWORD_HASH_WORKERS = 2
+DEFAULT_PASSWORD_HASH_MAX_PENDING = 32
+PASSWORD_HASH_RETRY_AFTER = 1
+
+# Normalized usernames and emails of the users are kept in a bloom filter for the availability checks. Users
+# registered by other processes are read every AVAILABILITY_SYNC_INTERVAL seconds.
+AVAILABILITY_BLOOM_CAPACITY = 1000000
+AVAILABILITY_BLOOM_ERROR_RATE = 0.01
+AVAILABILITY_SYNC_INTERVAL = 5
+AVAILABILITY_SYNC_OVERLAP = 60
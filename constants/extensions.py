@@ -1,2 +1,19 @@
 VALID_PHOTO_EXTENSIONS = ["jpg", "jpeg", "png"]
 VALID_DOCUMENT_EXTENSIONS = ["jpg", "jpeg", "png", "pdf"]
+# images which names end with it are documents, the others are photos
+DOCUMENT_IMAGE_SUFFIX = "_documents"
+
+CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "pdf": "application/pdf",
+    "webp": "image/webp",
+}
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+# leading bytes of the allowed file types, the content type of the upload is taken from them and not from the name
+CONTENT_TYPE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"%PDF-", "application/pdf"),
+)
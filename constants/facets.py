@@ -0,0 +1,4 @@
+PRODUCT_FACETS = ("category", "shop", "price")
+DEFAULT_PRODUCT_FACETS = ["category"]
+# Lower bounds of the product price buckets, the last bucket has no upper bound
+PRICE_BUCKETS = (0, 10, 25, 50, 100, 250, 500)
@@ -1,3 +1,5 @@
 IMAGE_SUFFIX_IN_DB = "_image_url"
 IMAGE_SUFFIX_IN_SCHEMA = "_photo"
 EXTENSION_SUFFIX_IN_SCHEMA = "_extension"
+# JSON column of the generated variants, only images which have it get variants
+IMAGE_VARIANTS_SUFFIX_IN_DB = "_image_variants"
@@ -0,0 +1,11 @@
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+DEFAULT_SORT = "registered_on"
+CURSOR_QUERY_PARAM = "cursor"
+LIMIT_QUERY_PARAM = "limit"
+SORT_QUERY_PARAM = "sort"
+STREAM_QUERY_PARAM = "stream"
+PAGINATION_QUERY_PARAMS = (CURSOR_QUERY_PARAM, LIMIT_QUERY_PARAM, SORT_QUERY_PARAM, STREAM_QUERY_PARAM)
+# Rows fetched from the server side cursor at once when a listing is streamed
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
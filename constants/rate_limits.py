@@ -0,0 +1,10 @@
+# Token buckets as (capacity, period in seconds), a bucket is refilled with capacity tokens per period
+LOGIN_IP_RATE_LIMIT = (20, 60)
+LOGIN_IDENTIFIER_RATE_LIMIT = (5, 5 * 60)
+REGISTER_IP_RATE_LIMIT = (10, 60 * 60)
+
+# "database" shares the buckets between all workers, "memory" keeps them per process (single worker only)
+DEFAULT_RATE_LIMIT_BACKEND = "database"
+RATE_LIMIT_MEMORY_SIZE = 100000
+# full buckets are deleted from the database at most once per RATE_LIMIT_PRUNE_INTERVAL seconds per process
+RATE_LIMIT_PRUNE_INTERVAL = 60
@@ -1,4 +1,5 @@
 import os
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-TEMP_DIR = os.path.join(ROOT_DIR, 'static/temp_files')
+# sorted lower-cased common passwords, one per line
+COMMON_PASSWORDS_PATH = os.path.join(ROOT_DIR, 'static/common_passwords.txt')
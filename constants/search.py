@@ -0,0 +1,2 @@
+# PostgreSQL text search configuration used for the product search vector and the search queries
+SEARCH_CONFIG = "english"
@@ -0,0 +1,35 @@
+# Threads shared by all requests for the uploads to S3, the photos of one request are uploaded at once
+S3_UPLOAD_WORKERS = 8
+
+# Presigned uploads go from the client directly to S3, the object is attached to its record by the finalize request
+PRESIGNED_UPLOAD_EXPIRES = 15 * 60
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+# objects of uploads which are not finalized in PENDING_UPLOAD_TTL seconds are deleted
+PENDING_UPLOAD_TTL = 60 * 60
+# expired uploads are collected at most once per PENDING_UPLOAD_GC_INTERVAL seconds per process
+PENDING_UPLOAD_GC_INTERVAL = 5 * 60
+PENDING_UPLOAD_GC_BATCH_SIZE = 500
+
+# Variants of uploaded images are created after the commit, images are resized in a pool of IMAGE_VARIANT_WORKERS
+# processes (env variable, default below). Every size is a bounding box, the image is not enlarged.
+DEFAULT_IMAGE_VARIANT_WORKERS = 2
+IMAGE_VARIANT_SIZES = {
+    "small": (160, 160),
+    "medium": (480, 480),
+    "large": (1024, 1024),
+}
+# the original size has only webp variant
+ORIGINAL_VARIANT = "original"
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+# photos are named by the sha256 of their content, which is read in chunks of HASH_CHUNK_SIZE bytes
+HASH_CHUNK_SIZE = 64 * 1024
+
+# objects queued for deletion are deleted after the commit, the queue is drained also every
+# PHOTO_DELETION_DRAIN_INTERVAL seconds, so the failed deletes and the rows left by crashed processes are retried
+PHOTO_DELETION_DRAIN_INTERVAL = 5 * 60
+# an object which fails to delete is retried after PHOTO_DELETION_RETRY_DELAY seconds, doubled after every failed
+# attempt up to PHOTO_DELETION_MAX_RETRY_DELAY seconds
+PHOTO_DELETION_RETRY_DELAY = 60
+PHOTO_DELETION_MAX_RETRY_DELAY = 24 * 60 * 60
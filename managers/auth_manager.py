@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta
 
 import jwt
@@ -7,7 +8,10 @@ from flask_httpauth import HTTPTokenAuth
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from werkzeug.exceptions import Unauthorized
 
+from constants.auth import ACCESS_TOKEN_TTL, REFRESH_TOKEN_TTL, ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE
+from managers.token_revocation_manager import token_revocation_manager
 from utils.helpers import get_user_or_admin_model
+from utils.principal_cache import principal_cache, Principal
 
 
 class AuthManager:
@@ -15,37 +19,124 @@ class AuthManager:
     TOKEN_EXPIRED_MESSAGE = "Token expired!"
     INVALID_TOKEN_MESSAGE = "Invalid token!"
 
+    TOKEN_REVOKED_MESSAGE = "Token revoked!"
+
+    @classmethod
+    def encode_token(cls, user, family=None):
+        """Short lived access token, family is the id of the login session the token belongs to"""
+        return cls._encode(user, ACCESS_TOKEN_TYPE, ACCESS_TOKEN_TTL, family or uuid.uuid4().hex)
+
+    @classmethod
+    def encode_refresh_token(cls, user, family):
+        return cls._encode(user, REFRESH_TOKEN_TYPE, REFRESH_TOKEN_TTL, family)
+
+    @classmethod
+    def issue_tokens(cls, user, family=None):
+        """Access and refresh token of new login session or of the given session on refresh"""
+        family = family or uuid.uuid4().hex
+        return {"token": cls.encode_token(user, family), "refresh_token": cls.encode_refresh_token(user, family)}
+
+    @classmethod
+    def decode_token(cls, token):
+        payload = cls._decode(token, ACCESS_TOKEN_TYPE)
+        # no query unless the bloom filter contains the token or its family
+        if token_revocation_manager.is_revoked(payload["jti"], payload["fam"]):
+            raise Unauthorized(cls.TOKEN_REVOKED_MESSAGE)
+        return {"id": payload["sub"], "role": payload["role"]}
+
+    @classmethod
+    def refresh(cls, refresh_token):
+        """Rotates the refresh token, every refresh token can be used only once
+
+        Second use of a refresh token means it was stolen, so the whole session is revoked.
+        """
+        payload = cls._decode(refresh_token, REFRESH_TOKEN_TYPE)
+        if token_revocation_manager.is_revoked(payload["fam"]):
+            raise Unauthorized(cls.TOKEN_REVOKED_MESSAGE)
+        if not token_revocation_manager.revoke(payload["jti"], datetime.utcfromtimestamp(payload["exp"])):
+            cls.revoke_family(payload["fam"])
+            raise Unauthorized(cls.TOKEN_REVOKED_MESSAGE)
+
+        user = get_user_or_admin_model(payload["role"]).query.filter_by(id=payload["sub"]).first()
+        if not user:
+            raise Unauthorized(cls.INVALID_TOKEN_MESSAGE)
+        return cls.issue_tokens(user, payload["fam"])
+
+    @classmethod
+    def revoke_session(cls, token):
+        """Revokes the access token and all tokens of its login session"""
+        payload = cls._decode(token, ACCESS_TOKEN_TYPE)
+        token_revocation_manager.revoke(payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+        cls.revoke_family(payload["fam"])
+
+    @staticmethod
+    def revoke_family(family):
+        # every token of the family expires before the last refresh token issued for it
+        token_revocation_manager.revoke(family, datetime.utcnow() + timedelta(seconds=REFRESH_TOKEN_TTL))
+
     @staticmethod
-    def encode_token(user):
-        payload = {"sub": user.id, "exp": datetime.utcnow() + timedelta(hours=2), "role": user.role.name}
+    def _encode(user, token_type, ttl, family):
+        payload = {
+            "sub": user.id,
+            "exp": datetime.utcnow() + timedelta(seconds=ttl),
+            "role": user.role.name,
+            "jti": uuid.uuid4().hex,
+            "fam": family,
+            "type": token_type,
+        }
         return jwt.encode(payload, key=config("JWT_SECRET"), algorithm="HS256")
 
     @classmethod
-    def decode_token(cls, token):
+    def _decode(cls, token, token_type):
         if not token:
             raise Unauthorized(cls.MISSING_TOKEN_MESSAGE)
         try:
-            payload = jwt.decode(token, key=config("JWT_SECRET"), algorithms=["HS256"])
-            return {"id": payload["sub"], "role": payload["role"]}
-
+            payload = jwt.decode(
+                token, key=config("JWT_SECRET"), algorithms=["HS256"], options={"require": ["jti", "fam", "type"]})
         except ExpiredSignatureError:
             raise Unauthorized(cls.TOKEN_EXPIRED_MESSAGE)
         except InvalidTokenError:
             raise Unauthorized(cls.INVALID_TOKEN_MESSAGE)
 
+        if not payload["type"] == token_type:
+            raise Unauthorized(cls.INVALID_TOKEN_MESSAGE)
+        return payload
+
+    @classmethod
+    def get_principal(cls, token, stateless=False):
+        """Returns cached snapshot of the user, the user is selected only on cache miss
+
+        In stateless mode the principal is created only from the token claims, without checking the user exists.
+        """
+        claims = cls.decode_token(token)
+        user_id, user_role = claims["id"], claims["role"]
+        if stateless:
+            try:
+                return Principal.from_claims(user_id, user_role)
+            except (KeyError, TypeError, ValueError):
+                raise Unauthorized(cls.INVALID_TOKEN_MESSAGE)
+
+        model = get_user_or_admin_model(user_role)
+        return principal_cache.get(user_role, user_id, lambda: model.query.filter_by(id=user_id).first())
+
 
 class Auth(HTTPTokenAuth):
     @staticmethod
-    def login_optional(func):
-        """Create current_user if request is authenticated"""
+    def login_optional(func=None, stateless=False):
+        """Create current_user if request is authenticated
+
+        Use @auth.login_optional(stateless=True) for endpoints which need only the id and the role of the user,
+        then the current user is created from the token claims without a query.
+        """
+        if func is None:
+            return lambda f: Auth.login_optional(f, stateless)
 
         def wrapper(*args, **kwargs):
             token = request.headers.get('Authorization')
+            # reset, so the user of previous request in the same app context is never reused
+            g.flask_httpauth_user = None
             if token:
-                user_id, user_role = AuthManager.decode_token(token[7:]).values()
-                model = get_user_or_admin_model(user_role)
-                user = model.query.filter_by(id=user_id).first()
-                g.flask_httpauth_user = user
+                g.flask_httpauth_user = AuthManager.get_principal(token[7:], stateless)
 
             return func(*args, **kwargs)
 
@@ -57,6 +148,4 @@ auth = Auth()
 
 @auth.verify_token
 def verify(token):
-    user_id, user_role = AuthManager.decode_token(token).values()
-    model = get_user_or_admin_model(user_role)
-    return model.query.filter_by(id=user_id).first()
+    return AuthManager.get_principal(token)
@@ -0,0 +1,101 @@
+import time
+from datetime import timedelta
+from threading import Lock, Thread
+
+from sqlalchemy import func, literal, select, union_all
+
+from constants.auth import AVAILABILITY_BLOOM_CAPACITY, AVAILABILITY_BLOOM_ERROR_RATE, AVAILABILITY_SYNC_INTERVAL, \
+    AVAILABILITY_SYNC_OVERLAP
+from db import db
+from models import CustomerModel, ShopOwnerModel
+from utils.bloom_filter import BloomFilter
+
+
+class AvailabilityManager:
+    """Answers if username or email is free from an in-memory bloom filter of the lower-cased taken values
+
+    Values which are not in the filter are free without a query. The db is queried only for values in the filter,
+    because it has false positives. The filter is loaded in a background thread when the app is created, until then
+    the db is queried for every value. Users of other processes are synced every AVAILABILITY_SYNC_INTERVAL
+    seconds, so it is only a hint, the registration validates against the db.
+    """
+    MODELS = (CustomerModel, ShopOwnerModel)
+    COLUMNS = ("username", "email")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.clear()
+
+    def listen(self, app):
+        if app.config.get("AVAILABILITY_PRELOAD_ENABLED", True):
+            Thread(target=self._load_in_background, args=(app,), name="availability-load", daemon=True).start()
+
+    def load(self):
+        """Loads the taken values of all users in the filter, the checks use it from now on"""
+        self._sync()
+        self._loaded = True
+
+    def is_available(self, column, value):
+        normalized = value.lower()
+        if not self._loaded:
+            return self._is_available_in_db(column, normalized)
+        self._sync()
+        if self._get_key(column, normalized) not in self._bloom:
+            return True
+        return self._is_available_in_db(column, normalized)
+
+    def _is_available_in_db(self, column, normalized):
+        return not db.session.query(union_all(*[
+            select(literal(1)).where(func.lower(getattr(model, column)) == normalized) for model in self.MODELS
+        ]).exists()).scalar()
+
+    def add(self, user):
+        with self._lock:
+            self._add(user.username, user.email)
+
+    def clear(self):
+        with self._lock:
+            self._bloom = BloomFilter(AVAILABILITY_BLOOM_CAPACITY, AVAILABILITY_BLOOM_ERROR_RATE)
+            # registered_on of the newest synced user, in db time
+            self._synced_until = None
+            self._next_sync = 0
+            self._loaded = False
+
+    def _sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        with self._lock:
+            if now < self._next_sync:
+                return
+            synced_until = self._synced_until
+            for model in self.MODELS:
+                query = db.session.query(model.username, model.email, model.registered_on)
+                if self._synced_until:
+                    # registered_on is the start of the transaction, so overlap for the ones committed later
+                    query = query.filter(
+                        model.registered_on > self._synced_until - timedelta(seconds=AVAILABILITY_SYNC_OVERLAP))
+                for username, email, registered_on in query:
+                    self._add(username, email)
+                    synced_until = max(synced_until, registered_on) if synced_until else registered_on
+
+            self._synced_until = synced_until
+            self._next_sync = now + AVAILABILITY_SYNC_INTERVAL
+
+    def _load_in_background(self, app):
+        with app.app_context():
+            try:
+                self.load()
+            finally:
+                db.session.remove()
+
+    def _add(self, username, email):
+        self._bloom.add(self._get_key("username", username.lower()))
+        self._bloom.add(self._get_key("email", email.lower()))
+
+    @staticmethod
+    def _get_key(column, normalized):
+        return f"{column}:{normalized}"
+
+
+availability_manager = AvailabilityManager()
@@ -1,16 +1,18 @@
-import os
-
-from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy import or_, true
+from sqlalchemy.exc import InvalidRequestError, DBAPIError
 from werkzeug.exceptions import NotFound, Forbidden
 
-from constants.image_suffix import IMAGE_SUFFIX_IN_DB, IMAGE_SUFFIX_IN_SCHEMA, EXTENSION_SUFFIX_IN_SCHEMA
-from constants.roots import TEMP_DIR
+from constants.image_suffix import IMAGE_SUFFIX_IN_DB, IMAGE_SUFFIX_IN_SCHEMA, EXTENSION_SUFFIX_IN_SCHEMA, \
+    IMAGE_VARIANTS_SUFFIX_IN_DB
 from db import db
-from models import AdminRoles
+from models import AdminRoles, UserRoles
+from managers.photo_deletion_manager import photo_deletion_manager
+from managers.photo_storage_manager import PhotoStorageManager
+from services.image_pipeline import image_pipeline
 from services.s3 import s3
 from utils import helpers
 from utils.decorators import handle_unique_constrain_violation
-from utils.helpers import save_file, create_photo, has_photo, get_photo_name_by_url
+from utils.helpers import create_photo, has_photo, get_photo_name_by_url, get_variant_photo_names
 
 
 class BaseManager:
@@ -18,7 +20,11 @@ class BaseManager:
     UNIQUE = False
     UNIQUE_CONSTRAINT_MESSAGE = "Unique constraint: Object already exist!"
     PERMISSION_DENIED_MESSAGE = "Permission denied!"
+    # Boolean column which makes the record visible to everyone (e.g. active, listed)
+    VISIBILITY_FIELD = None
     _INSTANCE = None
+    # photos uploaded by the manager, they are not referenced by anything else if its transaction fails
+    _UPLOADED_PHOTO_NAMES = frozenset()
 
     @handle_unique_constrain_violation
     def create(self, data, user, add_to_db=True, **kwargs):
@@ -38,7 +44,8 @@ class BaseManager:
 
     def get_list(self, filter_by, **kwargs):
         try:
-            return self.get_model().query.filter_by(**filter_by).all()
+            query = self.get_model().query.filter_by(**filter_by).options(*self._get_list_loader_options())
+            return self._paginate(query, kwargs.get("page"))
         except InvalidRequestError:
             # Invalid query string
             return []
@@ -66,13 +73,15 @@ class BaseManager:
         self._check_access(pk, **kwargs)
         instance = self._get_instance(pk)
         image_field_name_with_suffix = image_field_name + IMAGE_SUFFIX_IN_DB
-        photo_url = getattr(instance, image_field_name_with_suffix)
-        photo = get_photo_name_by_url(photo_url)
+        photo, variant_photos = self._get_photos(instance, image_field_name)
         if not photo:
             raise NotFound('Picture not found!')
 
-        self.get_model().query.filter_by(id=instance.id).update({image_field_name_with_suffix: None})
-        s3.delete_photo(photo)
+        data = {image_field_name_with_suffix: None}
+        if variant_photos:
+            data[image_field_name + IMAGE_VARIANTS_SUFFIX_IN_DB] = None
+        self.get_model().query.filter_by(id=instance.id).update(data)
+        self._delete_photos([(photo, variant_photos)])
         return instance
 
     def _get_instance(self, pk):
@@ -91,8 +100,10 @@ class BaseManager:
     def _processed_with_photos(self, model, data, instance=None, add_to_db=True):
         is_edit = bool(instance)
         image_field_names = model.get_all_image_field_names()
+        photos = []
         photo_names = []
-        paths = []
+        acquired_photo_names = []
+        new_photo_names = set()
         previous_pictures = []
         try:
             for image_field_name in image_field_names:
@@ -104,30 +115,51 @@ class BaseManager:
                     continue
 
                 if is_edit:
-                    photo_url = getattr(instance, image_field_name + IMAGE_SUFFIX_IN_DB)
-                    previous_picture = get_photo_name_by_url(photo_url)
-                    previous_pictures.append(previous_picture)
+                    previous_pictures.append(self._get_photos(instance, image_field_name))
+                if hasattr(model, image_field_name + IMAGE_VARIANTS_SUFFIX_IN_DB):
+                    # the variants of the new photo are created after the commit
+                    data[image_field_name + IMAGE_VARIANTS_SUFFIX_IN_DB] = None
 
                 photo_name, photo = create_photo(photo_str, extension)
-                photo_names.append(photo_name)
-                path = os.path.join(TEMP_DIR, photo_name)
-                paths.append(path)
-                save_file(path, photo)
-
-                photo_url = s3.upload_photo(path, photo_name)
-                data[image_field_name + IMAGE_SUFFIX_IN_DB] = photo_url
+                photos.append((image_field_name, photo_name, photo))
+
+            # only the photos which are not stored yet are uploaded, from memory and all at once,
+            # the failed upload deletes the others
+            new_photo_names = PhotoStorageManager.acquire([photo_name for _, photo_name, _ in photos])
+            acquired_photo_names = [photo_name for _, photo_name, _ in photos]
+            uploads = {
+                photo_name: photo for _, photo_name, photo in photos
+                if photo is not None and photo_name in new_photo_names
+            }
+            photo_urls = dict(zip(uploads, s3.upload_photos(list(uploads.items()))))
+            photo_names = list(uploads)
+            self._UPLOADED_PHOTO_NAMES = self._UPLOADED_PHOTO_NAMES | set(photo_names)
+            for image_field_name, photo_name, photo in photos:
+                data[image_field_name + IMAGE_SUFFIX_IN_DB] = photo_urls.get(photo_name) or s3.get_url(photo_name)
+                image_pipeline.schedule(model, image_field_name, photo_name)
 
             if is_edit:
                 model.query.filter_by(id=instance.id).update(data)
-                [s3.delete_photo(previous_picture) for previous_picture in previous_pictures if previous_picture]
+                self._delete_photos(previous_pictures)
             else:
                 instance = self._create_obj(model, data, add_to_db=add_to_db)
 
         except Exception as ex:
-            [s3.delete_photo(photo_name) for photo_name in photo_names]
+            if isinstance(ex, DBAPIError) and db.session.is_active:
+                # the failed statement (e.g. unique violation of the update) aborted the transaction, no more
+                # statements can run in it, so it is rolled back with the references
+                db.session.rollback()
+            if db.session.is_active:
+                # the references of this request are removed and the photos which are not referenced anymore are
+                # deleted after the commit, except the new ones which were not uploaded
+                released = PhotoStorageManager.release(acquired_photo_names)
+                photo_deletion_manager.enqueue(
+                    (name, name) for name in released if name in photo_names or name not in new_photo_names
+                )
+            else:
+                # the failed transaction is rolled back with the references, only the uploaded photos are deleted
+                PhotoStorageManager.discard(photo_names)
             raise ex
-        finally:
-            [os.remove(path) for path in paths]
 
         return instance
 
@@ -135,17 +167,62 @@ class BaseManager:
     def get_model(cls):
         return cls.MODEL
 
-    @staticmethod
-    def _delete_with_photos(model, instance, **kwargs):
-        image_field_names = model.get_all_image_field_names()
-        photo_to_delete = []
+    @classmethod
+    def _get_visibility_filter(cls, user):
+        """Returns SQL predicate for the records which user is allowed to see in listings"""
+        model = cls.get_model()
+        # admins see all records
+        if helpers.is_admin(user):
+            return true()
+
+        is_visible = getattr(model, cls.VISIBILITY_FIELD)
+        # shop owners see their own records and all the rest which are visible
+        if user and user.role == UserRoles.owner:
+            return or_(is_visible, model.holder_id == user.id)
+
+        # not auth users and customers see only visible records
+        return is_visible
+
+    def _get_list_loader_options(self):
+        """Loader options (e.g. eager loading of serialized relationships) applied to listing queries"""
+        return []
+
+    def _paginate(self, query, page=None):
+        if not page:
+            return query.all()
+        return page.paginate(query, self.get_model())
 
-        for image_field_name in image_field_names:
-            photo_name = get_photo_name_by_url(getattr(instance, image_field_name + IMAGE_SUFFIX_IN_DB))
-            photo_to_delete.append(photo_name)
+    @classmethod
+    def _delete_with_photos(cls, model, instance, **kwargs):
+        image_field_names = model.get_all_image_field_names()
+        photos = [cls._get_photos(instance, image_field_name) for image_field_name in image_field_names]
 
         model.query.filter_by(id=instance.id).delete()
-        [s3.delete_photo(photo) for photo in photo_to_delete if photo]
+        cls._delete_photos(photos)
+
+    @staticmethod
+    def _get_photos(instance, image_field_name):
+        """Returns (photo name, variant photo names) of the image"""
+        photo = get_photo_name_by_url(getattr(instance, image_field_name + IMAGE_SUFFIX_IN_DB))
+        variants = getattr(instance, image_field_name + IMAGE_VARIANTS_SUFFIX_IN_DB, None)
+        return photo, get_variant_photo_names(variants)
+
+    @staticmethod
+    def _delete_photos(photos):
+        """Removes the references of the (photo, variant photos), the photos which are not referenced anymore are
+        deleted after the commit
+        """
+        released = PhotoStorageManager.release([photo for photo, _ in photos])
+        photo_deletion_manager.enqueue(
+            (key, photo) for photo, variant_photos in photos if photo in released for key in (photo, *variant_photos)
+        )
+
+    def _discard_photos(self, photos):
+        """Removes the (photo, variant photos) of records which are not saved because of an error"""
+        if db.session.is_active:
+            return self._delete_photos(photos)
+        # the failed transaction is rolled back with the references, so only the photos uploaded in it are deleted
+        PhotoStorageManager.discard(photo for photo, _ in photos if photo in self._UPLOADED_PHOTO_NAMES)
 
     def _check_uniqueness(self, user):
         if self.get_model().query.filter_by(holder_id=user.id).first():
@@ -0,0 +1,136 @@
+from threading import Lock, Timer
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from constants.uploads import PHOTO_DELETION_DRAIN_INTERVAL, PHOTO_DELETION_RETRY_DELAY, \
+    PHOTO_DELETION_MAX_RETRY_DELAY
+from db import db
+from models import PhotoDeletionModel
+from services.s3 import s3
+from utils.post_commit_jobs import PostCommitJobs
+
+
+class PhotoDeletionManager:
+    """Queue of the objects which are deleted from S3 after the commit
+
+    The objects are queued in the transaction of the records, so the rolled back transaction keeps its photos. After
+    the commit the queue is drained by a background thread with batched deletes, and every
+    PHOTO_DELETION_DRAIN_INTERVAL seconds, so the objects which were not deleted are retried after their backoff
+    (failed objects are put behind the newer ones, so they cannot block the queue). The rows are locked
+    while their objects are deleted, so the photo stored again by other request (which cancels its deletion) waits
+    for the drain and is uploaded after it. Other periodic cleanups which queue objects (e.g. of expired uploads)
+    are added with add_periodic_job and run before the periodic drain.
+    """
+    MODEL = PhotoDeletionModel
+
+    def __init__(self):
+        self._jobs = PostCommitJobs("photo-deletion", self.drain)
+        self._periodic_jobs = PostCommitJobs("photo-deletion-periodic", self._run_periodic_jobs)
+        self._periodic_funcs = []
+        self._timer = None
+        self._lock = Lock()
+
+    def listen(self, app):
+        self._jobs.listen()
+        if app.config.get("PHOTO_DELETION_WORKER_ENABLED", True):
+            self._start_timer(app)
+
+    def add_periodic_job(self, func):
+        """Runs func every PHOTO_DELETION_DRAIN_INTERVAL seconds in its own transaction, before the drain"""
+        with self._lock:
+            if func not in self._periodic_funcs:
+                self._periodic_funcs.append(func)
+
+    def enqueue(self, keys, connection=None):
+        """Queues (key, photo) pairs, the photo is the one which the object belongs to, e.g. for variants
+
+        The pairs are queued in the transaction of the session and drained after its commit. The queue in the
+        transaction of the given connection is drained by start_drain() after the commit.
+        """
+        values = {key: photo for key, photo in keys if key}
+        if not values:
+            return
+        table = self.MODEL.__table__
+        statement = insert(table).values([{"key": key, "photo": values[key]} for key in sorted(values)])
+        (connection or db.session.connection()).execute(statement.on_conflict_do_nothing(index_elements=[table.c.key]))
+        if not connection and current_app.config.get("PHOTO_DELETION_WORKER_ENABLED", True):
+            self._jobs.schedule()
+
+    def start_drain(self):
+        """Drains the queue in the background right away"""
+        if current_app.config.get("PHOTO_DELETION_WORKER_ENABLED", True):
+            self._jobs.submit(current_app._get_current_object())
+
+    def cancel(self, photos):
+        """Removes the queued objects of the photos, which are stored again"""
+        if not photos:
+            return
+        table = self.MODEL.__table__
+        db.session.connection().execute(table.delete().where(table.c.photo.in_(sorted(photos))))
+
+    def drain(self):
+        """Deletes the queued objects in batches, returns the number of deleted objects
+
+        Objects which are not deleted stay in the queue and are retried by a later drain after their backoff.
+        """
+        table = self.MODEL.__table__
+        deleted = 0
+        while True:
+            # rows locked by other drain or cancelled by not committed transaction are skipped
+            keys = [row.key for row in db.session.query(self.MODEL.key)
+                    .filter(self.MODEL.next_attempt_on <= func.now()).order_by(self.MODEL.next_attempt_on)
+                    .limit(s3.DELETE_BATCH_SIZE).with_for_update(skip_locked=True)]
+            if not keys:
+                return deleted
+            try:
+                failed = set(s3.delete_photos(keys))
+            except Exception:
+                db.session.rollback()
+                raise
+            keys = [key for key in keys if key not in failed]
+            if keys:
+                db.session.connection().execute(table.delete().where(table.c.key.in_(keys)))
+            if failed:
+                self._postpone(failed)
+            db.session.commit()
+            deleted += len(keys)
+
+    def _postpone(self, keys):
+        table = self.MODEL.__table__
+        delay = func.least(PHOTO_DELETION_RETRY_DELAY * func.power(2, table.c.attempts), PHOTO_DELETION_MAX_RETRY_DELAY)
+        db.session.connection().execute(table.update().where(table.c.key.in_(sorted(keys))).values(
+            attempts=table.c.attempts + 1,
+            next_attempt_on=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+        ))
+
+    def wait(self):
+        """Waits for the submitted drains, e.g. in tests"""
+        self._periodic_jobs.wait()
+        self._jobs.wait()
+
+    def _start_timer(self, app):
+        with self._lock:
+            # one timer per process, for the first app
+            if self._timer:
+                return
+            self._timer = Timer(PHOTO_DELETION_DRAIN_INTERVAL, self._drain_periodically, args=(app,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _drain_periodically(self, app):
+        self._periodic_jobs.submit(app)
+        with self._lock:
+            self._timer = None
+        self._start_timer(app)
+
+
+    def _run_periodic_jobs(self):
+        for func in list(self._periodic_funcs):
+            func()
+            db.session.commit()
+        self.drain()
+
+
+photo_deletion_manager = PhotoDeletionManager()
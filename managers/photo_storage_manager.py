@@ -0,0 +1,84 @@
+from collections import Counter
+
+from sqlalchemy.dialects.postgresql import insert
+
+from db import db
+from managers.photo_deletion_manager import photo_deletion_manager
+from models import StoredPhotoModel
+
+
+class PhotoStorageManager:
+    """Reference counts of the photos in S3
+
+    Photos are named by the hash of their content, so the same photo is stored once for all records. The counts are
+    changed in the transaction of the records, the rows are locked until its end, so the photo which is uploaded by
+    one request is not deleted by other one.
+    """
+    MODEL = StoredPhotoModel
+
+    @classmethod
+    def acquire(cls, keys):
+        """Adds reference for each of the keys, returns the keys which are not stored yet and have to be uploaded"""
+        counts = Counter(keys)
+        if not counts:
+            return set()
+        table = cls.MODEL.__table__
+        # sorted, so concurrent transactions lock the rows in the same order
+        statement = insert(table).values([{"key": key, "reference_count": counts[key]} for key in sorted(counts)])
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"reference_count": table.c.reference_count + statement.excluded.reference_count},
+        ).returning(table.c.key, table.c.reference_count)
+        # executed on the connection, the counts are not a listing and do not change table versions
+        rows = db.session.connection().execute(statement)
+        new_keys = {row.key for row in rows if row.reference_count == counts[row.key]}
+        # the photo which was released before can be still queued for deletion
+        photo_deletion_manager.cancel(new_keys)
+        return new_keys
+
+    @classmethod
+    def release(cls, keys):
+        """Removes reference for each of the keys, returns the keys which are not referenced anymore
+
+        Photos stored before the reference counting have no row, they are referenced by a single record.
+        """
+        counts = Counter(key for key in keys if key)
+        if not counts:
+            return set()
+        table = cls.MODEL.__table__
+        connection = db.session.connection()
+        remaining = {}
+        for count in sorted(set(counts.values())):
+            statement = table.update() \
+                .where(table.c.key.in_(sorted(key for key in counts if counts[key] == count))) \
+                .values(reference_count=table.c.reference_count - count) \
+                .returning(table.c.key, table.c.reference_count)
+            remaining.update((row.key, row.reference_count) for row in connection.execute(statement))
+
+        released = {key for key in counts if remaining.get(key, 0) <= 0}
+        if released:
+            connection.execute(table.delete().where(table.c.key.in_(released), table.c.reference_count <= 0))
+        return released
+
+    @classmethod
+    def discard(cls, keys):
+        """Queues for deletion the photos which are not referenced, after the transaction which uploaded them failed
+
+        The failed transaction is rolled back, so the photos are queued in a new one. The keys are locked by rows
+        without references first, so the request which stores the same photo meanwhile waits for the commit and
+        then cancels its deletion, and the photos referenced meanwhile are kept.
+        """
+        keys = sorted({key for key in keys if key})
+        if not keys:
+            return
+        table = cls.MODEL.__table__
+        with db.engine.begin() as connection:
+            statement = insert(table).values([{"key": key, "reference_count": 0} for key in keys])
+            rows = connection.execute(statement.on_conflict_do_nothing(index_elements=[table.c.key])
+                                      .returning(table.c.key))
+            unreferenced = [row.key for row in rows]
+            if not unreferenced:
+                return
+            photo_deletion_manager.enqueue(((key, key) for key in unreferenced), connection)
+            connection.execute(table.delete().where(table.c.key.in_(unreferenced)))
+        photo_deletion_manager.start_drain()
@@ -1,21 +1,27 @@
-from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy import func, distinct, Float, and_
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import selectinload
 from werkzeug.exceptions import BadRequest
 
+from constants.facets import PRICE_BUCKETS
 from db import db
 from managers.base_manager import BaseManager
 from managers.shop_manager import ShopManager
-from models import ProductModel, UserRoles
-from services.s3 import s3
+from managers.table_version_manager import TableVersionManager
+from models import ProductModel, ProductCategories, ShopModel
+from models.association_tables import shops_products
+from schemas.response.shop_schemas_out import ShopShortSchemaOut
 from services.stripeService import StripeService
-from utils import helpers
-from utils.helpers import get_photo_name_by_url
 
 
 class ProductManager(BaseManager):
     MODEL = ProductModel
+    VISIBILITY_FIELD = "listed"
     SHOP_ID_ERROR_MESSAGE = "Invalid shop id!"
     INACTIVE_SHOP_ERROR_MESSAGE = "Provided shops must be active if product is listed!"
     FOREIGN_SHOP_ERROR_MESSAGE = "Foreign shop provided!"
+    # facets -> (versions of the product and shop tables, counts), invalidated by any write to these tables
+    _FACETS_CACHE = {}
 
     def create(self, data, user, **kwargs):
         products = []
@@ -29,10 +35,8 @@ class ProductManager(BaseManager):
             return products
 
         except Exception as ex:
+            self._discard_photos([self._get_photos(product, "product") for product in products])
             for product in products:
-                photo = get_photo_name_by_url(product.product_image_url)
-                if photo:
-                    s3.delete_photo(photo)
                 if product.stripe_price_id:
                     StripeService.deactivate(product.stripe_price_id)
             raise ex
@@ -62,9 +66,7 @@ class ProductManager(BaseManager):
                 product.stripe_price_id = stripe_data.get("price").get("id")
                 product.stripe_product_id = stripe_data.get("product").get("id")
         except Exception as ex:
-            photo = get_photo_name_by_url(product.product_image_url)
-            if photo:
-                s3.delete_photo(photo)
+            self._discard_photos([self._get_photos(product, "product")])
             if product.stripe_price_id:
                 StripeService.deactivate(product.stripe_price_id)
             raise ex
@@ -73,46 +75,75 @@ class ProductManager(BaseManager):
     def get_list(self, criteria, **kwargs):
 
         user = kwargs.get('user')
-        try:
-            p = self._fetch_data(self.get_model(), criteria, user)
-            return p
-        except InvalidRequestError:
-            # not sure empty list or BadRequest
-            return []
+        query = self._fetch_data(self.get_model(), criteria, user).options(*self._get_list_loader_options())
+        return self._paginate(query, kwargs.get('page'))
+
+    def _fetch_data(self, model, criteria, user):
+        return criteria.apply(model.query).filter(self._get_visibility_filter(user))
+
+    def _get_list_loader_options(self):
+        # Load the shops of all listed products with one query and only with the columns which are serialized
+        shop_model = ShopManager.get_model()
+        shop_columns = [getattr(shop_model, field) for field in ShopShortSchemaOut._declared_fields]
+        return [selectinload(self.get_model().in_shops).load_only(*shop_columns)]
+
+    def get_facets(self, facets):
+        """Counts of the listed products by each of the facets (category, shop, price bucket)"""
+        facets = tuple(sorted(set(facets)))
+        table_names = (self.get_model().__tablename__, ShopModel.__tablename__)
+        versions = tuple((v.table_name, v.version) for v in TableVersionManager.get_versions(table_names))
+        cached = self._FACETS_CACHE.get(facets)
+        if cached and cached[0] == versions:
+            return cached[1]
+
+        result = self._count_facets(facets)
+        self._FACETS_CACHE[facets] = (versions, result)
+        return result
+
+    def _count_facets(self, facets):
+        model = self.get_model()
+        columns = {
+            "category": model.category,
+            "shop": ShopModel.id,
+            "price": func.width_bucket(model.price, array([float(bucket) for bucket in PRICE_BUCKETS], type_=Float)),
+        }
+        columns = {facet: columns[facet] for facet in facets}
+        # a single GROUP BY with one grouping set per facet, grouping() tells which facet the row is for
+        query = db.session.query(
+            *[column.label(facet) for facet, column in columns.items()],
+            *[func.grouping(column).label(f"{facet}_grouping") for facet, column in columns.items()],
+            func.count(distinct(model.id)).label("count"),
+        ).filter(model.listed)
+        if "shop" in columns:
+            # only active shops are counted, as only they are visible in the listing of shops
+            query = query.outerjoin(shops_products, shops_products.c.product_id == model.id) \
+                .outerjoin(ShopModel, and_(ShopModel.id == shops_products.c.shop_id, ShopModel.active))
+        rows = query.group_by(func.grouping_sets(*columns.values())).all()
+
+        result = {facet: self._get_empty_facet(facet) for facet in facets}
+        for row in rows:
+            facet = [facet for facet in facets if getattr(row, f"{facet}_grouping") == 0][0]
+            value = getattr(row, facet)
+            if value is None:
+                continue
+            result[facet][self._get_facet_key(facet, value)] = row.count
+        return result
+
+    @classmethod
+    def _get_empty_facet(cls, facet):
+        if facet == "category":
+            return {category.name: 0 for category in ProductCategories}
+        if facet == "price":
+            return {cls._get_facet_key(facet, index): 0 for index in range(1, len(PRICE_BUCKETS) + 1)}
+        return {}
 
     @staticmethod
-    def _fetch_data(model, criteria, user):
-        filtered_query = model.query
-        if criteria.get("shop_ids"):
-            shop_ids_list = [int(id_) for id_ in criteria.pop("shop_ids").split("-")]
-            filtered_query = db.session.query(model).filter(
-                model.in_shops.any(ShopManager.get_model().id.in_(shop_ids_list))
-            )
-        # if not auth user or customer return products by criteria which are listed
-        if not user or user.role == UserRoles.customer:
-            criteria = criteria | {"listed": True}
-            return filtered_query.filter_by(**criteria).all()
-
-        # if admin return all products by criteria
-        if helpers.is_admin(user):
-            return filtered_query.filter_by(**criteria).all()
-
-        # if user want his own products
-        if criteria.get('holder_id') == str(user.id):
-            return model.query.filter_by(**criteria).all()
-
-        # if user want all products fetch his products and all the rest which are listed
-        if not criteria.get('holder_id'):
-            user_shops = []
-            if not criteria.get('listed'):
-                holder_criteria = criteria | {"holder_id": user.id, "listed": False}
-                user_shops = filtered_query.filter_by(**holder_criteria).all()
-
-            foreign_criteria = criteria | {"listed": True}
-            foreign_shops = filtered_query.filter_by(**foreign_criteria).all()
-            return user_shops + foreign_shops
-
-        # if user want someone else products fetch products by criteria which are listed
-        if not criteria.get('holder_id') == str(user.id):
-            foreign_criteria = criteria | {"listed": True}
-            return filtered_query.filter_by(**foreign_criteria).all()
+    def _get_facet_key(facet, value):
+        if facet == "category":
+            return value.name
+        if facet == "price":
+            # width_bucket returns the 1-based index of the bucket
+            if value == len(PRICE_BUCKETS):
+                return f"{PRICE_BUCKETS[-1]}+"
+            return f"{PRICE_BUCKETS[value - 1]}-{PRICE_BUCKETS[value]}"
+        return str(value)
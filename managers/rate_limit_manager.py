@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from threading import Lock
+
+from decouple import config
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from constants.rate_limits import RATE_LIMIT_MEMORY_SIZE, RATE_LIMIT_PRUNE_INTERVAL, DEFAULT_RATE_LIMIT_BACKEND
+from db import db
+from models import RateLimitBucketModel
+
+
+class MemoryRateLimitBackend:
+    """Token buckets of the process, the least recently used are dropped above max_size"""
+
+    def __init__(self, max_size=RATE_LIMIT_MEMORY_SIZE):
+        self.max_size = max_size
+        self._buckets = OrderedDict()
+        self._lock = Lock()
+
+    def consume(self, key, capacity, period):
+        """Takes one token from the bucket, returns 0 or the seconds until a token is available"""
+        rate = capacity / period
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        return 0 if allowed else (1 - tokens) / rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class DatabaseRateLimitBackend:
+    """Token buckets in a table shared by all workers
+
+    Every bucket is refilled and consumed with a single upsert in its own short transaction, so the row lock is not
+    held while the request is processed and the consumed token is kept if the request fails.
+    """
+    MODEL = RateLimitBucketModel
+
+    def __init__(self):
+        self._next_prune = 0
+
+    def consume(self, key, capacity, period):
+        rate = capacity / period
+        table = self.MODEL.__table__
+        expires_on = func.now() + timedelta(seconds=period)
+        refilled = func.least(capacity, table.c.tokens + func.extract("epoch", func.now() - table.c.updated_on) * rate)
+        statement = insert(table).values(key=key, tokens=capacity - 1, updated_on=func.now(), expires_on=expires_on)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"tokens": refilled - 1, "updated_on": func.now(), "expires_on": expires_on},
+            # an empty bucket is not updated and no row is returned
+            where=refilled >= 1,
+        ).returning(table.c.key)
+
+        with db.engine.begin() as connection:
+            self._prune(connection)
+            if connection.execute(statement).first():
+                return 0
+            tokens = connection.execute(select(refilled).where(table.c.key == key)).scalar()
+        return (1 - tokens) / rate
+
+    def clear(self):
+        self._next_prune = 0
+
+    def _prune(self, connection):
+        now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + RATE_LIMIT_PRUNE_INTERVAL
+        connection.execute(self.MODEL.__table__.delete().where(self.MODEL.expires_on < func.now()))
+
+
+BACKENDS = {
+    "memory": MemoryRateLimitBackend,
+    "database": DatabaseRateLimitBackend,
+}
+
+rate_limiter = BACKENDS[config("RATE_LIMIT_BACKEND", default=DEFAULT_RATE_LIMIT_BACKEND)]()
@@ -1,4 +1,3 @@
-from sqlalchemy.exc import InvalidRequestError
 from werkzeug.exceptions import Forbidden, NotFound, BadRequest
 
 from managers.base_manager import BaseManager
@@ -9,6 +8,7 @@ from utils.helpers import is_admin
 
 class ShopManager(BaseManager):
     MODEL = ShopModel
+    VISIBILITY_FIELD = "active"
     DELETE_DENIED_MESSAGE = "Cannot delete verified shop!"
     NOT_FOUND_MESSAGE = "Page not found!"
     NAME_ERROR_MESSAGE = "Cannot change name of verified resource! Please contact admin!"
@@ -26,11 +26,8 @@ class ShopManager(BaseManager):
     def get_list(self, criteria, **kwargs):
 
         user = kwargs.get('user')
-        try:
-            return self._fetch_data(self.get_model(), criteria, user)
-        except InvalidRequestError:
-            # not sure empty list or BadRequest
-            return []
+        query = self._fetch_data(self.get_model(), criteria, user).options(*self._get_list_loader_options())
+        return self._paginate(query, kwargs.get('page'))
 
     def edit(self, data, pk, **kwargs):
         self._check_access(pk, **kwargs)
@@ -61,33 +58,5 @@ class ShopManager(BaseManager):
     def get_shops_by_ids(self, ids):
         return self.get_model().query.filter(ShopModel.id.in_(ids)).all()
 
-    @staticmethod
-    def _fetch_data(model, criteria, user):
-        # if not auth user or customer return shops by criteria which are active
-        if not user or user.role == UserRoles.customer:
-            criteria = criteria | {"active": True}
-            return model.query.filter_by(**criteria).all()
-
-        # if admin return all shops by criteria
-        if helpers.is_admin(user):
-            return model.query.filter_by(**criteria).all()
-
-        # if user want his own shop fetch his shops
-        if criteria.get('holder_id') == str(user.id):
-            return model.query.filter_by(**criteria).all()
-
-        # if user want all shop fetch his shops and all the rest which are active
-        if not criteria.get('holder_id'):
-            user_shops = []
-            if not criteria.get('active'):
-                holder_criteria = criteria | {"holder_id": user.id, "active": False}
-                user_shops = model.query.filter_by(**holder_criteria).all()
-
-            foreign_criteria = criteria | {"active": True}
-            foreign_shops = model.query.filter_by(**foreign_criteria).all()
-            return user_shops + foreign_shops
-
-        # if user do  want someone else shops fetch shops by criteria which are active
-        if not criteria.get('holder_id') == str(user.id):
-            foreign_criteria = criteria | {"active": True}
-            return model.query.filter_by(**foreign_criteria).all()
+    def _fetch_data(self, model, criteria, user):
+        return criteria.apply(model.query).filter(self._get_visibility_filter(user))
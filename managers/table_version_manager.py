@@ -0,0 +1,76 @@
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import attributes
+
+from db import db
+from models import TableVersionModel
+
+
+class TableVersionManager:
+    MODEL = TableVersionModel
+
+    @classmethod
+    def get_versions(cls, table_names):
+        return cls.MODEL.query.filter(cls.MODEL.table_name.in_(table_names)).all()
+
+    @classmethod
+    def listen(cls):
+        """Collects the tables changed by flushes and ORM bulk update/delete, bumps their versions on commit
+
+        The versions are bumped just before the commit, so the rows of the hot tables are locked only by the commit
+        and not for the rest of the request (e.g. during calls to external services).
+        """
+        if not event.contains(db.session, "after_flush", cls._after_flush):
+            event.listen(db.session, "after_flush", cls._after_flush)
+            event.listen(db.session, "do_orm_execute", cls._do_orm_execute)
+            event.listen(db.session, "before_commit", cls._before_commit)
+            event.listen(db.session, "after_soft_rollback", cls._after_soft_rollback)
+
+    @classmethod
+    def bump(cls, connection, table_names):
+        table_names = sorted(set(table_names) - {cls.MODEL.__tablename__})
+        if not table_names:
+            return
+        table = cls.MODEL.__table__
+        statement = insert(table).values([{"table_name": name, "version": 1} for name in table_names])
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.table_name],
+            set_={"version": table.c.version + 1, "last_changed": func.now()},
+        ))
+
+    @classmethod
+    def _after_flush(cls, session, flush_context):
+        table_names = set()
+        for instance in session.new | session.dirty | session.deleted:
+            if instance in session.dirty and not session.is_modified(instance):
+                continue
+            mapper = inspect(instance).mapper
+            table_names.add(mapper.local_table.name)
+            # changed collections (e.g. shop.products) change the listings of the related table as well
+            table_names.update(
+                relationship.mapper.local_table.name for relationship in mapper.relationships
+                if attributes.get_history(instance, relationship.key, attributes.PASSIVE_NO_INITIALIZE).has_changes()
+            )
+        cls._add_changed(session, table_names)
+
+    @classmethod
+    def _do_orm_execute(cls, orm_execute_state):
+        # query.update() and query.delete() do not flush, so they are tracked separately
+        if orm_execute_state.is_update or orm_execute_state.is_delete:
+            cls._add_changed(orm_execute_state.session, [orm_execute_state.statement.table.name])
+
+    @classmethod
+    def _before_commit(cls, session):
+        # the commit flushes after this event, so the pending changes are flushed first to collect their tables
+        session.flush()
+        table_names = session.info.pop("changed_tables", None)
+        if table_names:
+            cls.bump(session.connection(), table_names)
+
+    @staticmethod
+    def _after_soft_rollback(session, previous_transaction):
+        session.info.pop("changed_tables", None)
+
+    @staticmethod
+    def _add_changed(session, table_names):
+        session.info.setdefault("changed_tables", set()).update(table_names)
@@ -0,0 +1,85 @@
+import time
+from datetime import timedelta
+from threading import Lock
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from constants.auth import REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE, REVOCATION_SYNC_INTERVAL, \
+    REVOCATION_REBUILD_INTERVAL, REVOCATION_SYNC_OVERLAP
+from db import db
+from models import RevokedTokenModel
+from utils.bloom_filter import BloomFilter
+
+
+class TokenRevocationManager:
+    """Revoked token ids in a db table and in an in-memory bloom filter synced from it
+
+    Most tokens are not revoked, the filter answers for them without a query. Only ids which are in the filter
+    are checked in the db, because the filter has false positives. Revocations of other processes are seen
+    after at most REVOCATION_SYNC_INTERVAL seconds.
+    """
+    MODEL = RevokedTokenModel
+
+    def __init__(self):
+        self._lock = Lock()
+        self.clear()
+
+    def revoke(self, jti, expires_on):
+        """Returns False if the id was already revoked"""
+        table = self.MODEL.__table__
+        statement = insert(table).values(jti=jti, expires_on=expires_on)
+        revoked = db.session.execute(
+            statement.on_conflict_do_nothing(index_elements=[table.c.jti]).returning(table.c.jti)
+        ).first()
+        # added before the commit, if the transaction is rolled back it is only a false positive
+        with self._lock:
+            self._bloom.add(jti)
+        return revoked is not None
+
+    def is_revoked(self, *jtis):
+        self._sync()
+        candidates = [jti for jti in jtis if jti and jti in self._bloom]
+        if not candidates:
+            return False
+        return db.session.query(
+            self.MODEL.query.filter(self.MODEL.jti.in_(candidates)).exists()
+        ).scalar()
+
+    def clear(self):
+        with self._lock:
+            self._bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+            # revoked_on of the newest synced revocation, in db time
+            self._synced_until = None
+            self._next_sync = 0
+            self._next_rebuild = 0
+
+    def _sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        with self._lock:
+            if now < self._next_sync:
+                return
+            rebuild = now >= self._next_rebuild
+            bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE) if rebuild else self._bloom
+            query = db.session.query(self.MODEL.jti, self.MODEL.revoked_on).filter(
+                self.MODEL.expires_on > func.now())
+            if not rebuild and self._synced_until:
+                # revoked_on is the start of the transaction, so overlap for the ones committed later
+                query = query.filter(
+                    self.MODEL.revoked_on > self._synced_until - timedelta(seconds=REVOCATION_SYNC_OVERLAP))
+
+            synced_until = None if rebuild else self._synced_until
+            for jti, revoked_on in query:
+                bloom.add(jti)
+                synced_until = max(synced_until, revoked_on) if synced_until else revoked_on
+
+            self._bloom = bloom
+            self._synced_until = synced_until
+            self._next_sync = now + REVOCATION_SYNC_INTERVAL
+            if rebuild:
+                self._next_rebuild = now + REVOCATION_REBUILD_INTERVAL
+
+
+token_revocation_manager = TokenRevocationManager()
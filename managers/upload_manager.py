@@ -0,0 +1,120 @@
+import time
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import func
+from werkzeug.exceptions import NotFound, BadRequest
+
+from constants.extensions import CONTENT_TYPES
+from constants.image_suffix import IMAGE_SUFFIX_IN_SCHEMA, EXTENSION_SUFFIX_IN_SCHEMA, IMAGE_SUFFIX_IN_DB
+from constants.uploads import PRESIGNED_UPLOAD_EXPIRES, MAX_UPLOAD_SIZE, PENDING_UPLOAD_TTL, \
+    PENDING_UPLOAD_GC_INTERVAL, PENDING_UPLOAD_GC_BATCH_SIZE
+from db import db
+from managers.details_managers.customer_details_manager import CustomerDetailsManager
+from managers.details_managers.shop_owner_details_manager import ShopOwnerDetailsManager
+from managers.photo_deletion_manager import photo_deletion_manager
+from managers.product_manager import ProductManager
+from managers.shop_manager import ShopManager
+from models import PendingUploadModel
+from services.s3 import s3
+from utils.helpers import get_photo_name_by_url
+
+
+class UploadManager:
+    """Presigned uploads from the client directly to S3
+
+    The upload is issued for an image of a record, the client posts the file to S3 and then finalizes the upload,
+    which attaches the object to the record with the edit of its manager. Objects of uploads which are not
+    finalized are deleted when the uploads expire.
+    """
+    MODEL = PendingUploadModel
+    TARGETS = {
+        manager.get_model().__tablename__: manager
+        for manager in (ShopManager, ProductManager, CustomerDetailsManager, ShopOwnerDetailsManager)
+    }
+    UPLOAD_NOT_FOUND_MESSAGE = "Upload not found or expired!"
+    NOT_UPLOADED_MESSAGE = "The file is not uploaded yet!"
+    INVALID_UPLOAD_MESSAGE = "The uploaded file does not match the upload!"
+    _next_gc = 0
+
+    @classmethod
+    def listen(cls):
+        # expired uploads are collected by the periodic drain as well, so they are deleted without new uploads
+        photo_deletion_manager.add_periodic_job(cls.collect_garbage)
+
+    @classmethod
+    def issue(cls, data, user):
+        cls.collect_garbage()
+        # only the holder of the record and admins can change its images
+        cls.TARGETS[data["target"]]().get(data["target_id"], holder_required=True, user=user)
+
+        extension = data["extension"].lower()
+        upload = cls.MODEL(
+            key=f"{uuid.uuid4()}.{extension}",
+            holder_id=user.id,
+            holder_role=user.role.name,
+            target=data["target"],
+            target_id=data["target_id"],
+            image=data["image"],
+            extension=extension,
+            content_type=CONTENT_TYPES[extension],
+            expires_on=func.now() + timedelta(seconds=PENDING_UPLOAD_TTL),
+        )
+        db.session.add(upload)
+        db.session.flush()
+
+        presigned = s3.create_presigned_upload(upload.key, upload.content_type, MAX_UPLOAD_SIZE,
+                                               PRESIGNED_UPLOAD_EXPIRES)
+        return {
+            "key": upload.key,
+            "url": presigned["url"],
+            "fields": presigned["fields"],
+            "expires_in": PRESIGNED_UPLOAD_EXPIRES,
+            "max_size": MAX_UPLOAD_SIZE,
+        }
+
+    @classmethod
+    def finalize(cls, key, user):
+        upload = cls.MODEL.query.filter(cls.MODEL.key == key, cls.MODEL.expires_on > func.now()) \
+            .with_for_update().first()
+        if not upload or not (upload.holder_id == user.id and upload.holder_role == user.role.name):
+            raise NotFound(cls.UPLOAD_NOT_FOUND_MESSAGE)
+
+        info = s3.get_photo_info(key)
+        if not info:
+            raise BadRequest(cls.NOT_UPLOADED_MESSAGE)
+        size, content_type = info
+        if size > MAX_UPLOAD_SIZE or not content_type == upload.content_type:
+            raise BadRequest(cls.INVALID_UPLOAD_MESSAGE)
+
+        data = {
+            upload.image + IMAGE_SUFFIX_IN_SCHEMA: upload,
+            upload.image + EXTENSION_SUFFIX_IN_SCHEMA: upload.extension,
+        }
+        instance = cls.TARGETS[upload.target]().edit(data, upload.target_id, holder_required=True, user=user)
+        # the manager can refuse to change the image (e.g. documents of verified owner), then it is collected later
+        if get_photo_name_by_url(getattr(instance, upload.image + IMAGE_SUFFIX_IN_DB)) == key:
+            db.session.delete(upload)
+        return instance
+
+    @classmethod
+    def collect_garbage(cls, force=False):
+        """Deletes expired uploads and queues their objects for deletion, returns the number of deleted uploads"""
+        now = time.monotonic()
+        if not force and now < cls._next_gc:
+            return 0
+        cls._next_gc = now + PENDING_UPLOAD_GC_INTERVAL
+
+        # rows locked by other collection or by finalize are skipped
+        keys = [upload.key for upload in cls.MODEL.query.filter(cls.MODEL.expires_on <= func.now())
+                .order_by(cls.MODEL.expires_on).limit(PENDING_UPLOAD_GC_BATCH_SIZE)
+                .with_for_update(skip_locked=True)]
+        if not keys:
+            return 0
+        photo_deletion_manager.enqueue((key, key) for key in keys)
+        cls.MODEL.query.filter(cls.MODEL.key.in_(keys)).delete(synchronize_session=False)
+        return len(keys)
+
+    @classmethod
+    def clear(cls):
+        cls._next_gc = 0
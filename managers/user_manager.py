@@ -1,11 +1,14 @@
+from sqlalchemy import func, or_
 from werkzeug.exceptions import BadRequest
-from werkzeug.security import check_password_hash
 
 from db import db
 from managers.auth_manager import AuthManager
+from managers.availability_manager import availability_manager
 from models import AdminRoles
 from utils import helpers
 from utils.decorators import handle_unique_constrain_violation
+from utils.password_hasher import password_hasher
+from utils.principal_cache import principal_cache
 
 
 class UserManager:
@@ -20,7 +23,12 @@ class UserManager:
         user = user_model(**data)
         db.session.add(user)
         db.session.flush()
-        return AuthManager.encode_token(user)
+        availability_manager.add(user)
+        return AuthManager.issue_tokens(user)
+
+    @staticmethod
+    def get_availability(data):
+        return {column: availability_manager.is_available(column, value) for column, value in data.items()}
 
     @classmethod
     def register_admin(cls, data):
@@ -37,20 +45,46 @@ class UserManager:
         admin = admin_model(**admin_data)
         db.session.add(admin)
         db.session.flush()
+        cls._invalidate_principal(user)
         return {"updated": True}
 
     @classmethod
     def login(cls, data):
         user_model = cls._get_model(data.pop("role"))
 
-        user = user_model.query.filter_by(email=data["identifier"]).first() \
-               or user_model.query.filter_by(username=data["identifier"]).first()
+        user = cls._get_by_identifier(user_model, data["identifier"])
+        if not user:
+            password_hasher.check_unknown_user(data["password"])
+            raise BadRequest(cls.CREDENTIALS_ERROR_MESSAGE)
 
-        if user and check_password_hash(user.password, data["password"]):
-            return AuthManager.encode_token(user)
+        if password_hasher.check(user.password, data["password"]):
+            if password_hasher.needs_rehash(user.password):
+                user.password = password_hasher.hash(data["password"])
+            return AuthManager.issue_tokens(user)
 
         raise BadRequest(cls.CREDENTIALS_ERROR_MESSAGE)
 
+    @staticmethod
+    def _get_by_identifier(user_model, identifier):
+        """Selects the user by email or username with one query, case insensitive, but exact match goes first
+
+        Users registered before the uniqueness was case insensitive can differ only in case, without exact match
+        the first registered one is selected.
+        """
+        normalized = identifier.lower()
+        return user_model.query.filter(or_(
+            func.lower(user_model.email) == normalized,
+            func.lower(user_model.username) == normalized,
+        )).order_by(
+            or_(user_model.email == identifier, user_model.username == identifier).desc(),
+            user_model.id,
+        ).first()
+
+    @staticmethod
+    def _invalidate_principal(user):
+        # must be called by every path which changes the user or its role
+        principal_cache.invalidate(user.role.name, user.id)
+
     @staticmethod
     def _get_model(role):
         return helpers.get_user_or_admin_model(role)
@@ -0,0 +1,32 @@
+"""Add lower identifier indexes
+
+Revision ID: 19cd9a3894bf
+Revises: b97abc33048c
+Create Date: 2026-10-18 12:40:06.116336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '19cd9a3894bf'
+down_revision = 'b97abc33048c'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('admin', 'customer', 'shop_owner')
+COLUMNS = ('email', 'username')
+
+
+def upgrade():
+    for table in TABLES:
+        for column in COLUMNS:
+            op.create_index(f'ix_{table}_lower_{column}', table, [sa.text(f'lower({column})')], unique=False)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        for column in reversed(COLUMNS):
+            op.drop_index(f'ix_{table}_lower_{column}', table_name=table)
@@ -2,3 +2,9 @@ from models.details_models import *
 from models.product_model import *
 from models.shop_model import *
 from models.user_models import *
+from models.table_version_model import *
+from models.revoked_token_model import *
+from models.rate_limit_model import *
+from models.pending_upload_model import *
+from models.stored_photo_model import *
+from models.photo_deletion_model import *
@@ -5,4 +5,7 @@ shops_products = db.Table(
     db.Model.metadata,
     db.Column("shop_id", db.Integer, db.ForeignKey("shop.id")),
     db.Column("product_id", db.Integer, db.ForeignKey("product.id")),
+    db.Index("ix_shops_products_shop_id", "shop_id"),
+    # used by the eager loading of the shops of listed products
+    db.Index("ix_shops_products_product_id_shop_id", "product_id", "shop_id"),
 )
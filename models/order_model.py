@@ -6,6 +6,8 @@ from models.enums import PaymentMethod
 
 class OrderProductModel(db.Model):
     __tablename__ = "order_products"
+    # product_id is not the leading column of the primary key, so the lookups by product need own index
+    __table_args__ = (db.Index("ix_order_products_product_id", "product_id"),)
     order_id = db.Column("order_id", db.ForeignKey("order.id"), primary_key=True)
     product_id = db.Column("product_id", db.ForeignKey("product.id"), primary_key=True)
     order_quantity = db.Column(db.Integer, nullable=False, default=0)
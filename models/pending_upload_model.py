@@ -0,0 +1,33 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from db import db
+
+
+class PendingUploadModel(db.Model):
+    """Presigned upload which is not finalized yet, its object is deleted after expires_on"""
+    __tablename__ = 'pending_upload'
+    __table_args__ = {'extend_existing': True}
+
+    query: Query
+
+    key = db.Column(db.String(64), primary_key=True)
+
+    holder_id = db.Column(db.Integer, nullable=False)
+
+    holder_role = db.Column(db.String(32), nullable=False)
+
+    # table name, id and image field name of the record which the object is attached to
+    target = db.Column(db.String(64), nullable=False)
+
+    target_id = db.Column(db.Integer, nullable=False)
+
+    image = db.Column(db.String(64), nullable=False)
+
+    extension = db.Column(db.String(8), nullable=False)
+
+    content_type = db.Column(db.String(64), nullable=False)
+
+    created_on = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+
+    expires_on = db.Column(db.DateTime, nullable=False, index=True)
@@ -0,0 +1,23 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from db import db
+
+
+class PhotoDeletionModel(db.Model):
+    """Object in S3 which is deleted after the commit of the transaction which queued it"""
+    __tablename__ = 'photo_deletion'
+    __table_args__ = {'extend_existing': True}
+
+    query: Query
+
+    key = db.Column(db.String(255), primary_key=True)
+
+    # the photo which the object belongs to (e.g. of the variant), its deletion is cancelled when it is stored again
+    photo = db.Column(db.String(255), nullable=False, index=True)
+
+    queued_on = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+
+    # failed deletes are retried after a delay which grows with the attempts, so they do not block the newer rows
+    attempts = db.Column(db.Integer, server_default="0", nullable=False)
+    next_attempt_on = db.Column(db.DateTime, server_default=func.now(), nullable=False, index=True)
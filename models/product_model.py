@@ -1,6 +1,8 @@
 from sqlalchemy import func
-from sqlalchemy.orm import Query
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB
+from sqlalchemy.orm import Query, deferred, query_expression
 
+from constants.search import SEARCH_CONFIG
 from db import db
 from models.enums import ProductCategories
 from models.mixins import ImageMixin
@@ -8,7 +10,19 @@ from models.mixins import ImageMixin
 
 class ProductModel(db.Model, ImageMixin):
     __tablename__ = 'product'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index("ix_product_registered_on_id", "registered_on", "id"),
+        db.Index("ix_product_listed_registered_on_id", "listed", "registered_on", "id"),
+        db.Index("ix_product_price_id", "price", "id"),
+        db.Index("ix_product_holder_id", "holder_id"),
+        db.Index("ix_product_category", "category"),
+        # partial indexes matching the listing predicates for anonymous users and customers (listed only)
+        db.Index("ix_product_category_registered_on_id_listed", "category", "registered_on", "id",
+                 postgresql_where=db.text("listed")),
+        db.Index("ix_product_price_id_listed", "price", "id", postgresql_where=db.text("listed")),
+        db.Index("ix_product_search_vector", "search_vector", postgresql_using="gin"),
+        {'extend_existing': True},
+    )
 
     query: Query
 
@@ -18,6 +32,9 @@ class ProductModel(db.Model, ImageMixin):
 
     product_image_url = db.Column(db.String(255))
 
+    # {size: {format: url}} of the resized copies, created in the background after the upload
+    product_image_variants = db.Column(JSONB)
+
     description = db.Column(db.Text)
 
     quantity = db.Column(db.Integer, nullable=False, default=0)
@@ -37,3 +54,13 @@ class ProductModel(db.Model, ImageMixin):
     stripe_price_id = db.Column(db.String(255), unique=True)
 
     stripe_product_id = db.Column(db.String(255), unique=True)
+
+    # Generated by the database from name and description, deferred so it is not loaded with the product
+    search_vector = deferred(db.Column(TSVECTOR, db.Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+        persisted=True,
+    )))
+
+    # Relevance of the product for the search query, populated only by search listings
+    search_rank = query_expression()
@@ -0,0 +1,20 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from db import db
+
+
+class RateLimitBucketModel(db.Model):
+    """Token bucket shared by all workers, the row can be deleted after expires_on, when the bucket is full again"""
+    __tablename__ = 'rate_limit_bucket'
+    __table_args__ = {'extend_existing': True}
+
+    query: Query
+
+    key = db.Column(db.String(255), primary_key=True)
+
+    tokens = db.Column(db.Float, nullable=False)
+
+    updated_on = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+
+    expires_on = db.Column(db.DateTime, nullable=False, index=True)
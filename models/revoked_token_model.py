@@ -0,0 +1,18 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from db import db
+
+
+class RevokedTokenModel(db.Model):
+    """Id of revoked token or of revoked token family, kept until the token would expire anyway"""
+    __tablename__ = 'revoked_token'
+    __table_args__ = {'extend_existing': True}
+
+    query: Query
+
+    jti = db.Column(db.String(32), primary_key=True)
+
+    expires_on = db.Column(db.DateTime, nullable=False, index=True)
+
+    revoked_on = db.Column(db.DateTime, server_default=func.now(), nullable=False, index=True)
@@ -1,4 +1,5 @@
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Query
 
 from db import db
@@ -8,7 +9,15 @@ from models.mixins import ImageMixin
 
 class ShopModel(db.Model, ImageMixin):
     __tablename__ = 'shop'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index("ix_shop_registered_on_id", "registered_on", "id"),
+        db.Index("ix_shop_active_registered_on_id", "active", "registered_on", "id"),
+        db.Index("ix_shop_holder_id", "holder_id"),
+        db.Index("ix_shop_city", "city"),
+        db.Index("ix_shop_city_registered_on_id_active", "city", "registered_on", "id",
+                 postgresql_where=db.text("active")),
+        {'extend_existing': True},
+    )
 
     query: Query
 
@@ -18,6 +27,7 @@ class ShopModel(db.Model, ImageMixin):
     bulstat = db.Column(db.String(9), nullable=False)
 
     brand_logo_image_url = db.Column(db.String(255))
+    brand_logo_image_variants = db.Column(JSONB)
     city = db.Column(db.String(64), nullable=False)
     address = db.Column(db.Text, nullable=False)
     website = db.Column(db.String(255))
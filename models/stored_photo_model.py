@@ -0,0 +1,18 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from db import db
+
+
+class StoredPhotoModel(db.Model):
+    """Photo in S3 named by the hash of its content, with the number of image fields which reference it"""
+    __tablename__ = 'stored_photo'
+    __table_args__ = {'extend_existing': True}
+
+    query: Query
+
+    key = db.Column(db.String(255), primary_key=True)
+
+    reference_count = db.Column(db.Integer, nullable=False)
+
+    created_on = db.Column(db.DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from db import db
+
+
+class TableVersionModel(db.Model):
+    """Incremented in the same transaction as every write to the table, used to validate cached listings"""
+    __tablename__ = 'table_version'
+    __table_args__ = {'extend_existing': True}
+
+    query: Query
+
+    table_name = db.Column(db.String(64), primary_key=True)
+
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    last_changed = db.Column(db.DateTime, server_default=func.now(), nullable=False)
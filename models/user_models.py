@@ -1,5 +1,5 @@
 from sqlalchemy import func
-from sqlalchemy.orm import Query
+from sqlalchemy.orm import Query, declared_attr
 
 from db import db
 from models.enums import UserRoles, AdminRoles
@@ -15,10 +15,20 @@ class BaseUserModel(db.Model):
     registered_on = db.Column(db.DateTime, server_default=func.now(), nullable=False)
     last_changed = db.Column(db.DateTime, onupdate=func.now())
 
+    @declared_attr
+    def __table_args__(cls):
+        # login matches the identifier case insensitively against the email or the username
+        return (
+            db.Index(f"ix_{cls.__tablename__}_lower_email", db.text("lower(email)")),
+            db.Index(f"ix_{cls.__tablename__}_lower_username", db.text("lower(username)")),
+            # users registered since the last sync are read by registered_on (availability filter)
+            db.Index(f"ix_{cls.__tablename__}_registered_on", "registered_on"),
+            {'extend_existing': True},
+        )
+
 
 class CustomerModel(BaseUserModel):
     __tablename__ = 'customer'
-    __table_args__ = {'extend_existing': True}
     query: Query
 
     role = db.Column(db.Enum(UserRoles), default=UserRoles.customer, nullable=False)
@@ -29,7 +39,6 @@ class CustomerModel(BaseUserModel):
 
 class ShopOwnerModel(BaseUserModel):
     __tablename__ = 'shop_owner'
-    __table_args__ = {'extend_existing': True}
     query: Query
 
     role = db.Column(db.Enum(UserRoles), default=UserRoles.owner, nullable=False)
@@ -1,20 +1,40 @@
-from managers.auth_manager import auth
+from flask import request
+from marshmallow import ValidationError
+from werkzeug.exceptions import BadRequest
+
+from constants.rate_limits import LOGIN_IP_RATE_LIMIT, LOGIN_IDENTIFIER_RATE_LIMIT, REGISTER_IP_RATE_LIMIT
+from managers.auth_manager import auth, AuthManager
 from managers.user_manager import UserManager
 from models import AdminRoles
-from resources.helpers.access_validators import ValidateSchema, ValidateRole
+from resources.helpers.access_validators import ValidateSchema, ValidateRole, ValidateRateLimit
 from resources.helpers.resources_mixins import BaseResource
-from schemas.request.authentication_schemas_in import RegisterSchemaIn, RegisterAdminSchemaIn, LoginSchemaIn
+from schemas.request.authentication_schemas_in import RegisterSchemaIn, RegisterAdminSchemaIn, LoginSchemaIn, \
+    RefreshTokenSchemaIn, AvailabilitySchemaIn
 from utils.decorators import execute_access_validators
 
 
 class RegisterResource(BaseResource):
     SCHEMA_IN = RegisterSchemaIn
 
-    @execute_access_validators(ValidateSchema())
+    @execute_access_validators(
+        ValidateRateLimit("register", REGISTER_IP_RATE_LIMIT),
+        ValidateSchema(),
+    )
     def post(self):
         data = self.get_data()
-        token = UserManager.register(data)
-        return {"token": token}, 201
+        tokens = UserManager.register(data)
+        return tokens, 201
+
+
+class AvailabilityResource(BaseResource):
+    SCHEMA_IN = AvailabilitySchemaIn
+
+    def get(self):
+        try:
+            data = self.get_schema_in()().load(request.args)
+        except ValidationError as ex:
+            raise BadRequest(ex.messages)
+        return UserManager.get_availability(data), 200
 
 
 class RegisterAdminResource(BaseResource):
@@ -35,7 +55,28 @@ class RegisterAdminResource(BaseResource):
 class LoginResource(BaseResource):
     SCHEMA_IN = LoginSchemaIn
 
+    @execute_access_validators(
+        ValidateRateLimit("login", LOGIN_IP_RATE_LIMIT, "identifier", LOGIN_IDENTIFIER_RATE_LIMIT),
+        ValidateSchema(),
+    )
     def post(self):
         data = self.get_data()
-        token = UserManager.login(data)
-        return {"token": token}, 200
+        tokens = UserManager.login(data)
+        return tokens, 200
+
+
+class RefreshTokenResource(BaseResource):
+    SCHEMA_IN = RefreshTokenSchemaIn
+
+    @execute_access_validators(ValidateSchema())
+    def post(self):
+        data = self.get_data()
+        tokens = AuthManager.refresh(data["refresh_token"])
+        return tokens, 200
+
+
+class LogoutResource(BaseResource):
+    @auth.login_required
+    def post(self):
+        AuthManager.revoke_session(request.headers.get("Authorization")[7:])
+        return None, 204
@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from managers.auth_manager import auth
 from managers.details_managers.DeliveryAddressManager import DeliveryAddressDetailsManager
 from managers.details_managers.customer_details_manager import CustomerDetailsManager
@@ -25,7 +27,7 @@ class DeliveryAddressDetailsResource(CreateResourceMixin, GetListResourceMixin):
     def post(self):
         result = super().post()
         current_user = auth.current_user()
-        if current_user and current_user.role == UserRoles.customer and not current_user.details:
+        if current_user and current_user.role == UserRoles.customer and not self._details:
             self._create_customer_details(current_user)
         return result
 
@@ -43,19 +45,23 @@ class DeliveryAddressDetailsResource(CreateResourceMixin, GetListResourceMixin):
         return {}
 
     def get_schema_in(self):
-        current_user = auth.current_user()
-        if current_user and current_user.details:
+        if self._details:
             return AuthCreateDeliveryAddressDetailsSchemaIn
         return NoAuthCreateDeliveryAddressDetailsSchemaIn
 
     def get_data(self):
         data = super().get_data()
-        current_user = auth.current_user()
-        if current_user and current_user.details:
-            data['first_name'] = current_user.details.first_name
-            data['last_name'] = current_user.details.last_name
+        if self._details:
+            data['first_name'] = self._details.first_name
+            data['last_name'] = self._details.last_name
         return data
 
+    @cached_property
+    def _details(self):
+        # the resource is created for every request, so the details are selected once per request
+        current_user = auth.current_user()
+        return current_user.details if current_user else None
+
     def _create_customer_details(self, user):
         data = self.get_data()
         CustomerDetailsManager().create(
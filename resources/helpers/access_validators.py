@@ -1,7 +1,11 @@
+import hashlib
+import math
+
 from flask import request
-from werkzeug.exceptions import BadRequest, Forbidden
+from werkzeug.exceptions import BadRequest, Forbidden, TooManyRequests
 
 from managers.auth_manager import auth
+from managers.rate_limit_manager import rate_limiter
 from models import AdminRoles
 
 
@@ -28,9 +32,45 @@ class ValidateSchema:
         self.many = many
 
     def validate(self, instance, *args, **kwargs):
-        data = request.get_json()
+        data = instance.get_request_data(*args, **kwargs)
         schema = self.schema or instance.get_schema_in(*args, **kwargs)
         errors = schema(many=self.many).validate(data)
 
         if errors:
             raise BadRequest(errors)
+
+
+class ValidateRateLimit:
+    """Takes a token from the bucket of the client ip and of the identifier in the body, if the field is given
+
+    Must be the first validator, so a limited request is rejected before any query or password hashing.
+    """
+    ERROR_MESSAGE = "Too many requests, try again later!"
+
+    def __init__(self, name, ip_limit, identifier_field=None, identifier_limit=None):
+        self.name = name
+        self.ip_limit = ip_limit
+        self.identifier_field = identifier_field
+        self.identifier_limit = identifier_limit
+
+    def validate(self, instance, *args, **kwargs):
+        for key, (capacity, period) in self._get_buckets():
+            retry_after = rate_limiter.consume(key, capacity, period)
+            if retry_after:
+                raise TooManyRequests(self.ERROR_MESSAGE, retry_after=math.ceil(retry_after))
+
+    def _get_buckets(self):
+        buckets = [(f"{self.name}:ip:{self._get_digest(request.remote_addr)}", self.ip_limit)]
+        if self.identifier_field:
+            # the body is not validated yet, it can be any json
+            data = request.get_json(silent=True)
+            identifier = data.get(self.identifier_field) if isinstance(data, dict) else None
+            if isinstance(identifier, str):
+                buckets.append((f"{self.name}:identifier:{self._get_digest(identifier.lower())}",
+                                self.identifier_limit))
+        return buckets
+
+    @staticmethod
+    def _get_digest(value):
+        # the keys have fixed length, whatever the length of the value
+        return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
@@ -1,10 +1,20 @@
+import os
 from abc import ABC, abstractmethod
 
-from flask import request
+from flask import request, Response, stream_with_context, json
 from flask_restful import Resource
+from marshmallow import fields
+from werkzeug.exceptions import Forbidden
 
+from constants.image_suffix import IMAGE_SUFFIX_IN_SCHEMA, EXTENSION_SUFFIX_IN_SCHEMA
+from constants.pagination import NEXT_CURSOR_HEADER, STREAM_BATCH_SIZE
 from managers.auth_manager import auth
 from managers.base_manager import BaseManager
+from managers.table_version_manager import TableVersionManager
+from utils import helpers
+from utils.conditional_requests import make_etag, get_last_modified, get_validator_headers, not_modified_response
+from utils.pagination import Page
+from utils.serializers import get_serializer
 
 
 class BaseResource(Resource):
@@ -12,12 +22,37 @@ class BaseResource(Resource):
     MANAGER = BaseManager
     SCHEMA_IN = None
     SCHEMA_OUT = None
+    # the schema in loads list of objects, multipart/form-data body is a single one of them
+    MANY_IN = False
 
     def get_data(self, *args, **kwargs):
         schema = self.get_schema_in(*args, **kwargs)
-        data = request.get_json() if request.data else None
+        data = self.get_request_data(*args, **kwargs)
         return schema(many=isinstance(data, list)).load(data) if data else None
 
+    def get_request_data(self, *args, **kwargs):
+        """JSON body or multipart/form-data body in which photos are file parts, they are not read in memory"""
+        if request.mimetype == "multipart/form-data":
+            data = self._get_form_data(*args, **kwargs)
+            return [data] if self.MANY_IN else data
+        return request.get_json() if request.data else None
+
+    def _get_form_data(self, *args, **kwargs):
+        schema_fields = self.get_schema_in(*args, **kwargs)._declared_fields
+        data = {
+            key: request.form.getlist(key) if isinstance(schema_fields.get(key), fields.List) else request.form[key]
+            for key in request.form
+        }
+        for key, file in request.files.items():
+            if not file:
+                continue
+            data[key] = file
+            # the extension is taken from the file name, if it is not sent
+            extension_key = key[:-len(IMAGE_SUFFIX_IN_SCHEMA)] + EXTENSION_SUFFIX_IN_SCHEMA
+            if key.endswith(IMAGE_SUFFIX_IN_SCHEMA) and extension_key not in data:
+                data[extension_key] = os.path.splitext(file.filename)[1].lstrip(".").lower()
+        return data
+
     def get_schema_in(self, *args, **kwargs):
         return self.SCHEMA_IN
 
@@ -48,19 +83,89 @@ class GetResourceMixin(ABC, BaseResource):
     @abstractmethod
     def get(self, pk, **kwargs):
         instance = self.get_manager()().get(pk, **kwargs)
-        return self.get_schema_out(instance=instance)().dump(instance), 200
+        schema_out = self.get_schema_out(instance=instance)
+        # the schema out is part of the etag, because it depends on the role of the caller
+        last_modified = get_last_modified(instance)
+        etag = make_etag(instance.__tablename__, instance.id, last_modified, schema_out.__name__)
+        not_modified = not_modified_response(etag, last_modified)
+        if not_modified:
+            return not_modified
+        return get_serializer(schema_out).dump(instance), 200, get_validator_headers(etag, last_modified)
 
 
 class GetListResourceMixin(ABC, BaseResource):
     """Minimum required class attributes: SCHEMA_OUT"""
+    FILTER_SCHEMA = None
+    # tables which data is in the listing, the model table if not set
+    LIST_TABLES = None
+    STREAM_PERMISSION_DENIED_MESSAGE = "Only admins can stream listings!"
 
     @abstractmethod
     def get(self, **kwargs):
-        obj_list = self.get_manager()().get_list(self.filter_by(), **kwargs)
-        return [self.get_schema_out(instance=instance)().dump(instance) for instance in obj_list if instance], 200
+        page = self.get_page()
+        if page.stream and not helpers.is_admin(auth.current_user()):
+            raise Forbidden(self.STREAM_PERMISSION_DENIED_MESSAGE)
+
+        criteria = self.filter_by()
+        if page.stream:
+            obj_list = self.get_manager()().get_list(criteria, page=page, **kwargs)
+            return Response(stream_with_context(self.stream_json_array(obj_list)), 200, mimetype="application/json")
+
+        etag, last_modified = self.get_list_validators()
+        not_modified = not_modified_response(etag, last_modified)
+        if not_modified:
+            return not_modified
+
+        obj_list = self.get_manager()().get_list(criteria, page=page, **kwargs)
+        headers = get_validator_headers(etag, last_modified)
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        # the schema out can differ per instance (e.g. holder), so only the compiled serializer is shared
+        result = [
+            get_serializer(self.get_schema_out(instance=instance)).dump(instance) for instance in obj_list if instance
+        ]
+        return result, 200, headers
+
+    def get_list_validators(self):
+        """ETag and Last-Modified of the listing from the versions of its tables, the caller and the query string"""
+        table_names = self.LIST_TABLES or (self.get_manager().get_model().__tablename__,)
+        versions = TableVersionManager.get_versions(table_names)
+        user = auth.current_user()
+        etag = make_etag(
+            request.full_path,
+            user.role.name if user else None,
+            user.id if user else None,
+            *[f"{version.table_name}:{version.version}" for version in sorted(versions, key=lambda v: v.table_name)],
+        )
+        last_modified = max((version.last_changed for version in versions), default=None)
+        return etag, last_modified
+
+    def stream_json_array(self, obj_list):
+        """Yields the JSON array in chunks, so only one batch of rows is in memory at once"""
+        chunk = ["["]
+        for index, instance in enumerate(obj_list):
+            serializer = get_serializer(self.get_schema_out(instance=instance))
+            chunk.append(("," if index else "") + json.dumps(serializer.dump(instance)))
+            if len(chunk) >= STREAM_BATCH_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        chunk.append("]")
+        yield "".join(chunk)
 
     def filter_by(self):
-        return {}
+        if not self.FILTER_SCHEMA:
+            return {}
+        return self.FILTER_SCHEMA().get_criteria(request.args)
+
+    def get_page(self):
+        if not self.FILTER_SCHEMA:
+            return Page.from_request_args(request.args)
+        return Page.from_request_args(
+            request.args,
+            self.FILTER_SCHEMA.SORT_FIELDS,
+            self.FILTER_SCHEMA.DEFAULT_SORT,
+            self.FILTER_SCHEMA.get_sort_expressions(),
+        )
 
 
 class EditResourceMixin(ABC, BaseResource):
@@ -0,0 +1,21 @@
+from managers.auth_manager import auth
+from models import AdminRoles
+from resources.helpers.access_validators import ValidateRole
+from resources.helpers.resources_mixins import BaseResource
+from schemas.validators.password_validator import PasswordValidator
+from utils.decorators import execute_access_validators
+from utils.principal_cache import principal_cache
+
+
+class MetricsResource(BaseResource):
+    ALLOWED_ROLES = [AdminRoles.admin, AdminRoles.super_admin]
+
+    @auth.login_required
+    @execute_access_validators(
+        ValidateRole(),
+    )
+    def get(self):
+        return {
+            "principal_cache": principal_cache.get_stats(),
+            "password_validator": PasswordValidator.get_stats(),
+        }, 200
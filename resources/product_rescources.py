@@ -1,11 +1,14 @@
 from flask import request
+from marshmallow import ValidationError
+from werkzeug.exceptions import BadRequest
 
 from managers.auth_manager import auth
 from managers.product_manager import ProductManager
-from models import UserRoles, AdminRoles
+from models import UserRoles, AdminRoles, ProductModel, ShopModel
 from resources.helpers.access_validators import ValidateRole, ValidateSchema
-from resources.helpers.resources_mixins import CreateResourceMixin, GetListResourceMixin
-from schemas.request.product_schemas_in import ProductSchemaIn
+from resources.helpers.resources_mixins import BaseResource, CreateResourceMixin, GetListResourceMixin
+from schemas.request.product_schemas_in import ProductSchemaIn, ProductFilterSchemaIn, ProductSearchSchemaIn, \
+    ProductFacetsSchemaIn
 from schemas.response.product_schema_out import ProductSchemaOut
 from utils.decorators import execute_access_validators
 
@@ -14,6 +17,9 @@ class ProductResource(CreateResourceMixin, GetListResourceMixin):
     MANAGER = ProductManager
     SCHEMA_IN = ProductSchemaIn
     SCHEMA_OUT = ProductSchemaOut
+    FILTER_SCHEMA = ProductFilterSchemaIn
+    LIST_TABLES = (ProductModel.__tablename__, ShopModel.__tablename__)
+    MANY_IN = True
     ALLOWED_ROLES = [UserRoles.owner, AdminRoles.admin, AdminRoles.super_admin]
 
     @auth.login_required
@@ -24,15 +30,31 @@ class ProductResource(CreateResourceMixin, GetListResourceMixin):
     def post(self):
         return super().post()
 
-    @auth.login_optional
+    @auth.login_optional(stateless=True)
     def get(self):
         user = auth.current_user()
         return super().get(user=user)
 
-    def filter_by(self):
-        criteria = {}
-        if request.query_string:
-            queries = request.query_string.decode("utf-8").split("&")
-            criteria = {field: criteria for field, criteria in [query.split("=") for query in queries]}
 
-        return criteria
+class ProductSearchResource(GetListResourceMixin):
+    MANAGER = ProductManager
+    SCHEMA_OUT = ProductSchemaOut
+    FILTER_SCHEMA = ProductSearchSchemaIn
+    LIST_TABLES = (ProductModel.__tablename__, ShopModel.__tablename__)
+
+    @auth.login_optional(stateless=True)
+    def get(self):
+        user = auth.current_user()
+        return super().get(user=user)
+
+
+class ProductFacetsResource(BaseResource):
+    MANAGER = ProductManager
+    SCHEMA_IN = ProductFacetsSchemaIn
+
+    def get(self):
+        try:
+            facets = self.get_schema_in()().load(request.args)["by"]
+        except ValidationError as ex:
+            raise BadRequest(ex.messages)
+        return self.get_manager()().get_facets(facets), 200
@@ -1,20 +1,26 @@
-from resources.auth_resources import RegisterResource, LoginResource, RegisterAdminResource
+from resources.auth_resources import RegisterResource, LoginResource, RegisterAdminResource, RefreshTokenResource, \
+    LogoutResource, AvailabilityResource
 from resources.details_resources.customer_details_resources import CreateCustomerDetailsResource, \
     CustomerDetailsResource, CustomerProfilePictureResource
 from resources.details_resources.delivery_address_resources import \
     DeliveryAddressDetailsResource, DeliveryAddressDetailsSingleResource
 from resources.details_resources.shop_owner_details_resources import CreateShopOwnerDetailsResource, \
     ShopOwnerDetailsResource, ShopOwnerProfilePictureResource, VerifyShopOwnerDetailsResource
+from resources.metrics_resources import MetricsResource
 from resources.order_resources import OrderResource
-from resources.product_rescources import ProductResource
+from resources.product_rescources import ProductResource, ProductSearchResource, ProductFacetsResource
 from resources.shop_resources import ShopResource, ShopSingleResource, VerifyShopResource, BrandLogoResource, \
     DeactivateShopResource
+from resources.upload_resources import UploadResource, FinalizeUploadResource
 from resources.webhook_resource import WebhookResource
 
 routes = (
     (RegisterResource, "/users/register"),  # POST
+    (AvailabilityResource, "/users/availability"),  # GET
     (RegisterAdminResource, "/admins/register"),  # POST
     (LoginResource, "/login"),  # POST
+    (RefreshTokenResource, "/token/refresh"),  # POST
+    (LogoutResource, "/logout"),  # POST
 
     # ("pass", "/customer/<:id>"),
     # ("pass", "/owner/<:id>"),
@@ -39,10 +45,17 @@ routes = (
     (BrandLogoResource, "/shops/<int:pk>/brand_logo"),  # DELETE
 
     (ProductResource, "/products"),  # POST - list of products, GET
+    (ProductSearchResource, "/products/search"),  # GET
+    (ProductFacetsResource, "/products/facets"),  # GET
     # (ShopSingleResource, "/products/<int:pk>"),  # GET, PUT, DELETE
     # (ProductPhotoResource, "/product/<int:pk>/photo"),  # DELETE
 
+    (UploadResource, "/uploads"),  # POST
+    (FinalizeUploadResource, "/uploads/<string:key>/finalize"),  # PUT
+
     (OrderResource, "/orders"),
 
-    (WebhookResource, "/webhook")
+    (WebhookResource, "/webhook"),
+
+    (MetricsResource, "/metrics"),  # GET
 )
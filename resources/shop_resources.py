@@ -1,5 +1,3 @@
-from flask import request
-
 from managers.auth_manager import auth
 from managers.shop_manager import ShopManager
 from models import UserRoles, AdminRoles
@@ -7,7 +5,7 @@ from resources.helpers.access_validators import ValidateRole, ValidateSchema
 from resources.helpers.base_resources import VerifyBaseResource, RemoveImageBaseResource
 from resources.helpers.resources_mixins import CreateResourceMixin, GetResourceMixin, EditResourceMixin, \
     GetListResourceMixin, DeleteResourceMixin
-from schemas.request.shop_schema_in import ShopSchemaIn, ShopChangeBrandLogoSchemaIn
+from schemas.request.shop_schema_in import ShopSchemaIn, ShopChangeBrandLogoSchemaIn, ShopFilterSchemaIn
 from schemas.response.shop_schemas_out import ShopExtendedSchemaOut, ShopShortSchemaOut
 from utils import helpers
 from utils.decorators import execute_access_validators
@@ -27,6 +25,7 @@ class ShopGetSchemaOutMixin:
 class ShopResource(ShopGetSchemaOutMixin, CreateResourceMixin, GetListResourceMixin):
     MANAGER = ShopManager
     SCHEMA_IN = ShopSchemaIn
+    FILTER_SCHEMA = ShopFilterSchemaIn
     ALLOWED_ROLES = [UserRoles.owner, AdminRoles.admin, AdminRoles.super_admin]
 
     @auth.login_required
@@ -37,26 +36,18 @@ class ShopResource(ShopGetSchemaOutMixin, CreateResourceMixin, GetListResourceMi
     def post(self):
         return super().post()
 
-    @auth.login_optional
+    @auth.login_optional(stateless=True)
     def get(self):
         user = auth.current_user()
         return super().get(user=user)
 
-    def filter_by(self):
-        criteria = {}
-        if request.query_string:
-            queries = request.query_string.decode("utf-8").split("&")
-            criteria = {field: criteria for field, criteria in [query.split("=") for query in queries]}
-
-        return criteria
-
 
 class ShopSingleResource(ShopGetSchemaOutMixin, GetResourceMixin, EditResourceMixin, DeleteResourceMixin):
     MANAGER = ShopManager
     SCHEMA_IN = ShopSchemaIn
     ALLOWED_ROLES = [UserRoles.owner, AdminRoles.admin, AdminRoles.super_admin]
 
-    @auth.login_optional
+    @auth.login_optional(stateless=True)
     def get(self, pk):
         user = auth.current_user()
         return super().get(pk, user=user)
@@ -0,0 +1,39 @@
+from managers.auth_manager import auth
+from managers.upload_manager import UploadManager
+from resources.helpers.access_validators import ValidateSchema
+from resources.helpers.resources_mixins import BaseResource
+from schemas.request.upload_schema_in import UploadSchemaIn
+from schemas.response.details_schemas_out import DetailsSchemaOut, ShopOwnerDetailsSchemaOut
+from schemas.response.product_schema_out import ProductSchemaOut
+from schemas.response.shop_schemas_out import ShopExtendedSchemaOut
+from utils.decorators import execute_access_validators
+
+
+class UploadResource(BaseResource):
+    SCHEMA_IN = UploadSchemaIn
+
+    @auth.login_required
+    @execute_access_validators(
+        ValidateSchema(),
+    )
+    def post(self):
+        data = self.get_data()
+        return UploadManager.issue(data, auth.current_user()), 201
+
+
+class FinalizeUploadResource(BaseResource):
+    # the record is returned to its holder or to admin, so with all of its info
+    SCHEMAS_OUT = {
+        "shop": ShopExtendedSchemaOut,
+        "product": ProductSchemaOut,
+        "customer_details": DetailsSchemaOut,
+        "shop_owner_details": ShopOwnerDetailsSchemaOut,
+    }
+
+    @auth.login_required
+    def put(self, key):
+        instance = UploadManager.finalize(key, auth.current_user())
+        return self.get_schema_out(instance=instance)().dump(instance), 200
+
+    def get_schema_out(self, *args, **kwargs):
+        return self.SCHEMAS_OUT[kwargs["instance"].__tablename__]
@@ -1,33 +1,33 @@
-from marshmallow import fields, Schema, validate, post_load
+from marshmallow import fields, Schema, validate, post_load, validates_schema, ValidationError
 from marshmallow_enum import EnumField
-from werkzeug.security import generate_password_hash
 
 from models import UserRoles, CustomerModel, ShopOwnerModel
 from schemas.validators.common_validators import ValidateUniqueness, ValidateIsAlphaNumeric
 from schemas.validators.password_validator import PasswordValidator
+from utils.password_hasher import password_hasher
 
 
 class RegisterSchemaIn(Schema):
     role = EnumField(UserRoles, required=True, error_messages={'by_name': "Invalid role"})
 
-    email = fields.Email(required=True,
-                         validate=validate.And(
-                             ValidateUniqueness("email", CustomerModel, ShopOwnerModel).validate,
-                         ))
+    email = fields.Email(required=True)
 
     username = fields.Str(required=True,
                           validate=validate.And(
                               validate.Length(min=3, max=64),
                               ValidateIsAlphaNumeric().validate,
-                              ValidateUniqueness("username", CustomerModel, ShopOwnerModel).validate,
                           ))
 
     password = fields.Str(required=True,
                           validate=PasswordValidator().validate_password)
 
+    @validates_schema(skip_on_field_errors=False)
+    def validate_uniqueness(self, data, **kwargs):
+        ValidateUniqueness(("email", "username"), CustomerModel, ShopOwnerModel).validate(data)
+
     @post_load
     def hash_password(self, data, *args, **kwargs):
-        data["password"] = generate_password_hash(data["password"])
+        data["password"] = password_hasher.hash(data["password"])
         return data
 
 
@@ -42,3 +42,20 @@ class LoginSchemaIn(Schema):
     password = fields.Str(required=True)
 
     role = fields.Str(required=True)
+
+
+class RefreshTokenSchemaIn(Schema):
+    refresh_token = fields.Str(required=True)
+
+
+class AvailabilitySchemaIn(Schema):
+    NO_FIELDS_ERROR = "Username or email must be provided!"
+
+    username = fields.Str(validate=validate.Length(min=1, max=255))
+
+    email = fields.Str(validate=validate.Length(min=1, max=255))
+
+    @validates_schema
+    def validate_any_field(self, data, **kwargs):
+        if not data:
+            raise ValidationError(self.NO_FIELDS_ERROR)
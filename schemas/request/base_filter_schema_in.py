@@ -0,0 +1,109 @@
+from functools import lru_cache
+
+from marshmallow import Schema, fields, ValidationError
+from sqlalchemy import bindparam, func, PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy.orm import RelationshipProperty
+from werkzeug.exceptions import BadRequest, InternalServerError
+
+from constants.pagination import PAGINATION_QUERY_PARAMS, DEFAULT_SORT
+from constants.search import SEARCH_CONFIG
+
+
+class DelimitedList(fields.List):
+    """List field which is passed as a single delimited query param e.g. ?category=books,games"""
+
+    def __init__(self, cls_or_instance, delimiter=",", **kwargs):
+        super().__init__(cls_or_instance, **kwargs)
+        self.delimiter = delimiter
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if not isinstance(value, str):
+            raise self.make_error("invalid")
+        return super()._deserialize(value.split(self.delimiter), attr, data, **kwargs)
+
+
+class FilterCriteria:
+    def __init__(self, expressions, params):
+        self.expressions = expressions
+        self.params = params
+
+    def apply(self, query):
+        if not self.expressions:
+            return query
+        return query.filter(*self.expressions).params(**self.params)
+
+
+class BaseFilterSchemaIn(Schema):
+    """Typed and whitelisted query string filters for listing endpoints
+
+    FILTERS maps every declared field to (model attribute, operator). Only indexed columns
+    can be used for filtering and sorting, so a listing cannot fall back to a sequential scan.
+    """
+    MODEL = None
+    FILTERS = {}
+    SORT_FIELDS = ("registered_on",)
+    DEFAULT_SORT = DEFAULT_SORT
+    NOT_INDEXED_ERROR_MESSAGE = "Filtering by {} is not supported without an index!"
+
+    OPERATORS = {
+        "eq": lambda attribute, param: attribute == param,
+        "gt": lambda attribute, param: attribute > param,
+        "gte": lambda attribute, param: attribute >= param,
+        "lte": lambda attribute, param: attribute <= param,
+        "in": lambda attribute, param: attribute.in_(param),
+        "any": lambda attribute, param: attribute.any(attribute.property.mapper.class_.id.in_(param)),
+        "match": lambda attribute, param: attribute.op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, param)),
+    }
+    EXPANDING_OPERATORS = ("in", "any")
+
+    def get_criteria(self, args):
+        query_params = {field: value for field, value in args.items() if field not in PAGINATION_QUERY_PARAMS}
+        try:
+            data = self.load(query_params)
+        except ValidationError as ex:
+            raise BadRequest(ex.messages)
+
+        expressions = self.compile(frozenset(data))
+        return FilterCriteria(expressions, {self._get_param_name(field): value for field, value in data.items()})
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def compile(cls, fields_names):
+        """Builds SQLAlchemy expressions with bound params once per set of requested filters"""
+        expressions = []
+        for field_name in sorted(fields_names):
+            attribute_name, operator = cls.FILTERS[field_name]
+            attribute = getattr(cls.MODEL, attribute_name)
+            if not cls.is_indexed(attribute):
+                raise InternalServerError(cls.NOT_INDEXED_ERROR_MESSAGE.format(field_name))
+
+            param = bindparam(cls._get_param_name(field_name), expanding=operator in cls.EXPANDING_OPERATORS)
+            expressions.append(cls.OPERATORS[operator](attribute, param))
+        return tuple(expressions)
+
+    @classmethod
+    def get_sort_expressions(cls):
+        """Sort fields which are not model columns but are computed per query, mapped to their expressions"""
+        return {}
+
+    @staticmethod
+    def is_indexed(attribute):
+        if isinstance(attribute.property, RelationshipProperty):
+            # for many-to-many filters the lookup is by the secondary table column which references the target
+            target = attribute.property.mapper.local_table
+            column = [c for c in attribute.property.secondary.c if c.references(target.c.id)][0]
+        else:
+            column = attribute.property.columns[0]
+
+        if column.primary_key or column.unique or column.index:
+            return True
+        constraints = [
+            constraint for constraint in column.table.constraints
+            if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+        ]
+        # the column must be the leading column of an index so the index can be used for the predicate
+        return any(list(index.columns)[0] is column for index in list(column.table.indexes) + constraints)
+
+    @staticmethod
+    def _get_param_name(field_name):
+        return f"filter_{field_name}"
@@ -1,6 +1,7 @@
 from marshmallow import Schema, fields, validate
 
 from constants.extensions import VALID_PHOTO_EXTENSIONS
+from schemas.request.photo_field import PhotoField
 from schemas.validators.common_validators import ValidateIsNumeric, ValidateExtension, ValidateIsAlpha
 
 
@@ -23,13 +24,13 @@ class DetailsSchemaIn(Schema):
         ValidateIsNumeric().validate
     ))
 
-    profile_picture_photo = fields.String()
+    profile_picture_photo = PhotoField()
 
     profile_picture_extension = fields.String(validate=ValidateExtension("photos", VALID_PHOTO_EXTENSIONS).validate)
 
 
 class ChangeProfilePictureSchemaIn(Schema):
-    profile_picture_photo = fields.String(required=True)
+    profile_picture_photo = PhotoField(required=True)
 
     profile_picture_extension = fields.String(required=True,
                                               validate=ValidateExtension("photos", VALID_PHOTO_EXTENSIONS).validate)
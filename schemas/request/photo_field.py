@@ -0,0 +1,11 @@
+from marshmallow import fields
+from werkzeug.datastructures import FileStorage
+
+
+class PhotoField(fields.String):
+    """Photo as base64 string in JSON body or as file part of multipart/form-data body, the file is kept unread"""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, FileStorage):
+            return value
+        return super()._deserialize(value, attr, data, **kwargs)
@@ -1,8 +1,13 @@
 from marshmallow import Schema, fields, validate, ValidationError, validates_schema
 from marshmallow_enum import EnumField
+from sqlalchemy import bindparam, cast, func, Float
 
 from constants.extensions import VALID_PHOTO_EXTENSIONS
-from models import ProductCategories
+from constants.facets import PRODUCT_FACETS, DEFAULT_PRODUCT_FACETS
+from constants.search import SEARCH_CONFIG
+from models import ProductCategories, ProductModel
+from schemas.request.base_filter_schema_in import BaseFilterSchemaIn, DelimitedList
+from schemas.request.photo_field import PhotoField
 from schemas.validators.common_validators import ValidateExtension
 
 
@@ -26,7 +31,7 @@ class ProductSchemaIn(Schema):
 
     listed = fields.Boolean(required=True, default=False)
 
-    product_photo = fields.String()
+    product_photo = PhotoField()
 
     product_extension = fields.String(validate=ValidateExtension("photos", VALID_PHOTO_EXTENSIONS).validate)
 
@@ -60,3 +65,49 @@ class EditProductSchemaIn(ProductSchemaIn):
     def validate_shops(self, data, **kwargs):
         if data["listed"] and not data["shops_id"]:
             raise ValidationError("No shops provided!")
+
+
+class ProductFilterSchemaIn(BaseFilterSchemaIn):
+    MODEL = ProductModel
+    FILTERS = {
+        "holder_id": ("holder_id", "eq"),
+        "listed": ("listed", "eq"),
+        "category": ("category", "in"),
+        "price_min": ("price", "gte"),
+        "price_max": ("price", "lte"),
+        "created_after": ("registered_on", "gt"),
+        "shop_ids": ("in_shops", "any"),
+    }
+    SORT_FIELDS = ("registered_on", "price")
+
+    holder_id = fields.Integer()
+
+    listed = fields.Boolean()
+
+    category = DelimitedList(EnumField(ProductCategories, error_messages={'by_name': "Invalid category"}))
+
+    price_min = fields.Float(validate=validate.Range(min=0))
+
+    price_max = fields.Float(validate=validate.Range(min=0))
+
+    created_after = fields.DateTime()
+
+    shop_ids = DelimitedList(fields.Integer(), delimiter="-")
+
+
+class ProductSearchSchemaIn(ProductFilterSchemaIn):
+    FILTERS = {**ProductFilterSchemaIn.FILTERS, "q": ("search_vector", "match")}
+    SORT_FIELDS = ("search_rank", "registered_on", "price")
+    DEFAULT_SORT = "-search_rank"
+
+    q = fields.Str(required=True, validate=validate.Length(min=1, max=255))
+
+    @classmethod
+    def get_sort_expressions(cls):
+        # ts_rank is real, casting it to double precision makes the rank exact in the cursor
+        search_query = func.websearch_to_tsquery(SEARCH_CONFIG, bindparam(cls._get_param_name("q")))
+        return {"search_rank": cast(func.ts_rank(cls.MODEL.search_vector, search_query), Float)}
+
+
+class ProductFacetsSchemaIn(Schema):
+    by = DelimitedList(fields.Str(validate=validate.OneOf(PRODUCT_FACETS)), load_default=DEFAULT_PRODUCT_FACETS)
@@ -1,6 +1,9 @@
 from marshmallow import Schema, validate, fields
 
 from constants.extensions import VALID_PHOTO_EXTENSIONS, VALID_DOCUMENT_EXTENSIONS
+from models import ShopModel
+from schemas.request.base_filter_schema_in import BaseFilterSchemaIn
+from schemas.request.photo_field import PhotoField
 from schemas.validators.common_validators import ValidateIsNumeric, ValidateIsAlphaAndSpace, \
     ValidateExtension
 
@@ -34,11 +37,11 @@ class ShopSchemaIn(Schema):
 
     description = fields.Str()
 
-    brand_logo_photo = fields.String()
+    brand_logo_photo = PhotoField()
 
     brand_logo_extension = fields.String(validate=ValidateExtension("photos", VALID_PHOTO_EXTENSIONS).validate)
 
-    verifying_documents_photo = fields.String(required=True)
+    verifying_documents_photo = PhotoField(required=True)
 
     verifying_documents_extension = fields.String(required=True,
                                                   validate=ValidateExtension("documents",
@@ -46,7 +49,29 @@ class ShopSchemaIn(Schema):
 
 
 class ShopChangeBrandLogoSchemaIn(Schema):
-    brand_logo_photo = fields.String(required=True)
+    brand_logo_photo = PhotoField(required=True)
 
     brand_logo_extension = fields.String(required=True,
                                          validate=ValidateExtension("photos", VALID_PHOTO_EXTENSIONS).validate)
+
+
+class ShopFilterSchemaIn(BaseFilterSchemaIn):
+    MODEL = ShopModel
+    FILTERS = {
+        "holder_id": ("holder_id", "eq"),
+        "name": ("name", "eq"),
+        "city": ("city", "eq"),
+        "active": ("active", "eq"),
+        "created_after": ("registered_on", "gt"),
+    }
+    SORT_FIELDS = ("registered_on", "name")
+
+    holder_id = fields.Integer()
+
+    name = fields.Str()
+
+    city = fields.Str()
+
+    active = fields.Boolean()
+
+    created_after = fields.DateTime()
@@ -0,0 +1,35 @@
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+from constants.extensions import VALID_PHOTO_EXTENSIONS, VALID_DOCUMENT_EXTENSIONS, DOCUMENT_IMAGE_SUFFIX
+from models import ShopModel, ProductModel, CustomerDetailsModel, ShopOwnerDetailsModel
+from schemas.validators.common_validators import ValidateExtension
+
+
+class UploadSchemaIn(Schema):
+    TARGET_MODELS = {
+        model.__tablename__: model for model in (ShopModel, ProductModel, CustomerDetailsModel, ShopOwnerDetailsModel)
+    }
+    INVALID_IMAGE_ERROR = "Valid images for {} are {}!"
+
+    target = fields.String(required=True, validate=validate.OneOf(TARGET_MODELS))
+
+    target_id = fields.Integer(required=True)
+
+    image = fields.String(required=True)
+
+    extension = fields.String(required=True)
+
+    @validates_schema
+    def validate_image(self, data, **kwargs):
+        images = self.TARGET_MODELS[data["target"]].get_all_image_field_names()
+        if data["image"] not in images:
+            raise ValidationError({"image": [self.INVALID_IMAGE_ERROR.format(data["target"], ", ".join(images))]})
+
+        if data["image"].endswith(DOCUMENT_IMAGE_SUFFIX):
+            validator = ValidateExtension("documents", VALID_DOCUMENT_EXTENSIONS)
+        else:
+            validator = ValidateExtension("photos", VALID_PHOTO_EXTENSIONS)
+        try:
+            validator.validate(data["extension"].lower())
+        except ValidationError as ex:
+            raise ValidationError({"extension": ex.messages})
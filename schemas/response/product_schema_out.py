@@ -25,3 +25,5 @@ class ProductSchemaOut(Schema):
     listed = fields.Boolean(required=True, default=False)
 
     product_image_url = fields.String()
+
+    product_image_variants = fields.Dict()
@@ -8,6 +8,7 @@ class ShopShortSchemaOut(Schema):
     website = fields.Str()
     description = fields.Str()
     brand_logo_image_url = fields.String()
+    brand_logo_image_variants = fields.Dict()
 
 
 class ShopExtendedSchemaOut(ShopShortSchemaOut):
@@ -1,22 +1,48 @@
+from flask import request, has_request_context
 from marshmallow import ValidationError
 from schwifty import IBAN
+from sqlalchemy import select, literal, union, func
 
+from db import db
 from schemas.request.base_custom_validator import BaseCustomValidator
 
 
 class ValidateUniqueness(BaseCustomValidator):
+    """Schema validator, checks all columns in all models with one query and reports each taken column
+
+    The values are compared case-insensitively, as the login and the availability check compare the identifiers.
+
+    The schema is validated by ValidateSchema and loaded again in the same request,
+    so the taken columns are kept in the environ of the request and the query runs once per request.
+    """
     ERROR = "is already taken"
 
-    def __init__(self, column, *models):
+    def __init__(self, columns, *models):
         self.models = models
-        self.column = column
-
-    def validate(self, value):
-        criteria = {self.column: value}
-        for model in self.models:
-            obj = model.query.filter_by(**criteria).first()
-            if obj:
-                raise ValidationError(self._get_error_message(value))
+        self.columns = columns
+
+    def validate(self, data):
+        # columns with invalid values are not in the data
+        values = {column: data[column] for column in self.columns if data.get(column) is not None}
+        if not values:
+            return
+
+        taken = self._get_taken_columns(values)
+        if taken:
+            raise ValidationError({column: [self._get_error_message(values[column])] for column in taken})
+
+    def _get_taken_columns(self, values):
+        values = {column: value.lower() for column, value in values.items()}
+        key = (tuple(model.__tablename__ for model in self.models), tuple(sorted(values.items())))
+        # not flask.g, the app context is shared by the requests of the test client
+        results = request.environ.setdefault("uniqueness_results", {}) if has_request_context() else {}
+        if key not in results:
+            query = union(*[
+                select(literal(column).label("column")).where(func.lower(getattr(model, column)) == value)
+                for model in self.models for column, value in values.items()
+            ])
+            results[key] = sorted(row.column for row in db.session.execute(query))
+        return results[key]
 
     def _get_error_message(self, value):
         return value + ' ' + self.ERROR
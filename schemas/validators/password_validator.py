@@ -1,6 +1,47 @@
+import mmap
+import time
+from threading import Lock
+
 from marshmallow import ValidationError
 from password_strength import PasswordPolicy, PasswordStats
 
+from constants.roots import COMMON_PASSWORDS_PATH
+
+
+class PasswordBlocklist:
+    """Sorted file of lower-cased passwords, searched with binary search in a memory map, so it is never loaded"""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+        self._lock = Lock()
+
+    def __contains__(self, password):
+        key = password.lower().encode("utf-8")
+        data = self._get_data()
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            # the line which contains the middle byte
+            start = data.rfind(b"\n", 0, middle) + 1
+            end = data.find(b"\n", start)
+            end = len(data) if end == -1 else end
+            line = data[start:end]
+            if line == key:
+                return True
+            if line < key:
+                low = end + 1
+            else:
+                high = start
+        return False
+
+    def _get_data(self):
+        with self._lock:
+            if self._data is None:
+                with open(self.path, "rb") as file:
+                    self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._data
+
 
 class PasswordValidator:
     _policy = PasswordPolicy.from_names(
@@ -17,13 +58,48 @@ class PasswordValidator:
         "special": "Must contain at least one special symbol!",
     }
 
-    def validate_password(self, value):
-        errors = self._policy.test(value)
-        errors_messages = [self._policy_error_mapper[error.name()] for error in errors]
+    TOO_COMMON_ERROR = "Too common!"
 
-        password_strength = PasswordStats(value).strength()
-        if password_strength < 0.2:
-            errors_messages.append("Too common!")
+    _blocklist = PasswordBlocklist(COMMON_PASSWORDS_PATH)
+
+    # time spent in validation and the rejections by check, shared by all instances
+    _stats = {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+              "rejected": {"policy": 0, "blocklist": 0, "strength": 0}}
+    _stats_lock = Lock()
+
+    def validate_password(self, value):
+        # the checks are ordered from the cheapest, the entropy is computed only for passwords which pass the others
+        started = time.perf_counter()
+        check, errors_messages = self._check(value)
+        self._record(check, time.perf_counter() - started)
 
         if errors_messages:
             raise ValidationError(errors_messages)
+
+    def _check(self, value):
+        errors = self._policy.test(value)
+        if errors:
+            return "policy", [self._policy_error_mapper[error.name()] for error in errors]
+
+        if value in self._blocklist:
+            return "blocklist", [self.TOO_COMMON_ERROR]
+
+        if PasswordStats(value).strength() < 0.2:
+            return "strength", [self.TOO_COMMON_ERROR]
+        return None, []
+
+    @classmethod
+    def _record(cls, rejected_by, seconds):
+        with cls._stats_lock:
+            cls._stats["calls"] += 1
+            cls._stats["total_seconds"] += seconds
+            cls._stats["max_seconds"] = max(cls._stats["max_seconds"], seconds)
+            if rejected_by:
+                cls._stats["rejected"][rejected_by] += 1
+
+    @classmethod
+    def get_stats(cls):
+        with cls._stats_lock:
+            stats = {**cls._stats, "rejected": dict(cls._stats["rejected"])}
+        stats["average_seconds"] = stats["total_seconds"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
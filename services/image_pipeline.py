@@ -0,0 +1,126 @@
+import io
+import os
+
+from decouple import config
+from flask import current_app
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from constants.extensions import CONTENT_TYPES
+from constants.image_suffix import IMAGE_SUFFIX_IN_DB, IMAGE_VARIANTS_SUFFIX_IN_DB
+from constants.uploads import DEFAULT_IMAGE_VARIANT_WORKERS, IMAGE_VARIANT_SIZES, ORIGINAL_VARIANT, WEBP_QUALITY, \
+    JPEG_QUALITY
+from db import db
+from managers.photo_deletion_manager import photo_deletion_manager
+from services.s3 import s3
+from utils.helpers import sniff_content_type, get_variant_photo_names
+from utils.post_commit_jobs import PostCommitJobs
+from utils.process_pool import ProcessPool
+
+# formats of the variants by the content type of the original, documents (e.g. pdf) have no variants
+VARIANT_FORMATS = {
+    "image/jpeg": ("jpeg", "webp"),
+    "image/png": ("png", "webp"),
+}
+SAVE_OPTIONS = {
+    "jpeg": {"format": "JPEG", "quality": JPEG_QUALITY, "optimize": True},
+    "png": {"format": "PNG", "optimize": True},
+    "webp": {"format": "WEBP", "quality": WEBP_QUALITY, "method": 4},
+}
+
+
+def create_variants(content, formats):
+    """Returns {size: {format: content}} of the image, runs in the worker process"""
+    with Image.open(io.BytesIO(content)) as image:
+        # the orientation from the camera is applied, because the exif data is not kept in the variants
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            transparent = image.mode in ("LA", "P", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if transparent else "RGB")
+
+        variants = {ORIGINAL_VARIANT: {"webp": _save(image, "webp")}}
+        for size, box in IMAGE_VARIANT_SIZES.items():
+            thumbnail = image.copy()
+            thumbnail.thumbnail(box, Image.Resampling.LANCZOS)
+            variants[size] = {image_format: _save(thumbnail, image_format) for image_format in formats}
+        return variants
+
+
+def _save(image, image_format):
+    if image_format == "jpeg" and image.mode == "RGBA":
+        image = image.convert("RGB")
+    output = io.BytesIO()
+    image.save(output, **SAVE_OPTIONS[image_format])
+    return output.getvalue()
+
+
+class ImagePipeline:
+    """Creates thumbnails and webp variants of the uploaded images in the background
+
+    The images are scheduled in the session and processed only after its commit. The original is downloaded from
+    S3, resized in a process pool and the variants are uploaded next to it. Their urls are saved in the variants
+    column of the record, only if it still has the same image, otherwise the variants are queued for deletion.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or config("IMAGE_VARIANT_WORKERS", default=DEFAULT_IMAGE_VARIANT_WORKERS, cast=int)
+        self._processes = ProcessPool(self.workers)
+        # the threads download, upload and save the variants, while the processes resize
+        self._jobs = PostCommitJobs("image-pipeline", self._create_variants, self.workers)
+
+    def listen(self):
+        self._jobs.listen()
+
+    def schedule(self, model, image_field_name, key):
+        """Creates the variants of the photo after the commit, if the image of the model has variants"""
+        if not hasattr(model, image_field_name + IMAGE_VARIANTS_SUFFIX_IN_DB):
+            return
+        if not current_app.config.get("IMAGE_VARIANTS_ENABLED", True):
+            return
+        self._jobs.schedule(model, image_field_name, key)
+
+    def wait(self):
+        """Waits for all scheduled images, e.g. in tests"""
+        self._jobs.wait()
+
+    def _create_variants(self, model, image_field_name, key):
+        url_column = getattr(model, image_field_name + IMAGE_SUFFIX_IN_DB)
+        variants_column = getattr(model, image_field_name + IMAGE_VARIANTS_SUFFIX_IN_DB)
+        url = s3.get_url(key)
+        # the same photo is stored once, so its variants can be created already for other record
+        variant_urls = db.session.query(variants_column) \
+            .filter(url_column == url, variants_column.isnot(None)).limit(1).scalar()
+        created = not variant_urls
+        if created:
+            variant_urls = self._upload_variants(key)
+        if not variant_urls:
+            return
+
+        updated = model.query.filter(url_column == url) \
+            .update({variants_column.key: variant_urls}, synchronize_session=False)
+        # the image was changed or deleted in the meantime
+        if created and not updated:
+            photo_deletion_manager.enqueue((name, key) for name in get_variant_photo_names(variant_urls))
+        db.session.commit()
+
+    def _upload_variants(self, key):
+        """Returns {size: {format: url}} of the uploaded variants, None if the photo is not an image"""
+        content = s3.download_photo(key)
+        formats = VARIANT_FORMATS.get(sniff_content_type(content))
+        if not formats:
+            return None
+        try:
+            variants = self._processes.run(create_variants, content, formats)
+        except UnidentifiedImageError:
+            return None
+
+        stem = os.path.splitext(key)[0]
+        return {
+            size: {
+                image_format: s3.upload_photo(variant, f"{stem}_{size}.{image_format}", CONTENT_TYPES[image_format])
+                for image_format, variant in contents.items()
+            }
+            for size, contents in variants.items()
+        }
+
+
+image_pipeline = ImagePipeline()
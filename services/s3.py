@@ -1,10 +1,23 @@
+import io
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import boto3
 from botocore.exceptions import ClientError
 from decouple import config
 from werkzeug.exceptions import InternalServerError
 
+from constants.uploads import S3_UPLOAD_WORKERS
+from utils.helpers import sniff_content_type
+
+# bytes read from the start of the photo to find its content type
+SNIFF_SIZE = 16
+
 
 class S3Service:
+    UNAVAILABLE_MESSAGE = "S3 is not available at the moment"
+    # objects deleted with one request
+    DELETE_BATCH_SIZE = 1000
+
     def __init__(self):
         key = config("AWS_ACCESS_KEY")
         secret = config("AWS_SECRET_ACCESS_KEY")
@@ -14,16 +27,87 @@ class S3Service:
                                region_name=self.region,
                                aws_access_key_id=key,
                                aws_secret_access_key=secret)
+        self.executor = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS, thread_name_prefix="s3-upload")
+
+    def upload_photo(self, photo, key, content_type=None):
+        """The photo is bytes or file object, which is read in chunks
 
-    def upload_photo(self, path, key):
+        The content type is taken from the leading bytes of the photo, if it is not given.
+        """
+        fileobj = io.BytesIO(photo) if isinstance(photo, bytes) else photo
+        content_type = content_type or self._sniff_content_type(fileobj)
         try:
-            self.s3.upload_file(path, self.bucket, key, ExtraArgs={'ContentType': "image/jpeg"})
-            return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+            self.s3.upload_fileobj(fileobj, self.bucket, key, ExtraArgs={'ContentType': content_type})
+            return self.get_url(key)
         except ClientError as ex:
-            raise InternalServerError("S3 is not available at the moment")
+            raise InternalServerError(self.UNAVAILABLE_MESSAGE)
+
+    def upload_photos(self, photos):
+        """Uploads list of (key, photo) concurrently and returns their urls in the same order
+
+        If any of the uploads fails, the uploaded photos are deleted and the first error is raised.
+        """
+        futures = [self.executor.submit(self.upload_photo, photo, key) for key, photo in photos]
+        wait(futures)
+        errors = [future.exception() for future in futures if future.exception()]
+        if errors:
+            [self.delete_photo(key) for (key, _), future in zip(photos, futures) if not future.exception()]
+            raise errors[0]
+        return [future.result() for future in futures]
+
+    def create_presigned_upload(self, key, content_type, max_size, expires_in):
+        """Returns url and form fields of POST request which uploads the object with the content type and size"""
+        try:
+            return self.s3.generate_presigned_post(
+                self.bucket,
+                key,
+                Fields={"Content-Type": content_type},
+                Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_size]],
+                ExpiresIn=expires_in,
+            )
+        except ClientError:
+            raise InternalServerError(self.UNAVAILABLE_MESSAGE)
+
+    def get_photo_info(self, key):
+        """Returns (size, content type) of the object or None if it does not exist"""
+        try:
+            response = self.s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as ex:
+            if ex.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise InternalServerError(self.UNAVAILABLE_MESSAGE)
+        return response["ContentLength"], response["ContentType"]
+
+    def download_photo(self, key):
+        try:
+            return self.s3.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        except ClientError:
+            raise InternalServerError(self.UNAVAILABLE_MESSAGE)
+
+    def get_url(self, key):
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
 
     def delete_photo(self, key):
         self.s3.delete_object(Bucket=self.bucket, Key=key)
 
+    def delete_photos(self, keys):
+        """Deletes the objects in batches, returns the keys which are not deleted"""
+        failed = []
+        for index in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            objects = [{"Key": key} for key in keys[index:index + self.DELETE_BATCH_SIZE]]
+            try:
+                response = self.s3.delete_objects(Bucket=self.bucket, Delete={"Objects": objects, "Quiet": True})
+            except ClientError:
+                raise InternalServerError(self.UNAVAILABLE_MESSAGE)
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
+    @staticmethod
+    def _sniff_content_type(fileobj):
+        position = fileobj.tell()
+        head = fileobj.read(SNIFF_SIZE)
+        fileobj.seek(position)
+        return sniff_content_type(head)
+
 
 s3 = S3Service()
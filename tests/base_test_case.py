@@ -2,7 +2,15 @@ from flask_testing import TestCase
 
 from config import create_app
 from db import db
-from tests.constants import TEST_CONFIGURATION
+from managers.availability_manager import availability_manager
+from managers.rate_limit_manager import rate_limiter
+from managers.token_revocation_manager import token_revocation_manager
+from managers.upload_manager import UploadManager
+from services.s3 import s3
+from tests.constants import TEST_CONFIGURATION, Endpoints, ENCODED_PICTURE
+from tests.factories import OwnerFactory
+from tests.helpers import mock_s3_bucket, generate_token
+from utils.principal_cache import principal_cache
 
 
 class BaseTestCase(TestCase):
@@ -21,7 +29,41 @@ class BaseTestCase(TestCase):
     def setUp(self):
         db.init_app(self.app)
         db.create_all()
+        principal_cache.clear()
+        token_revocation_manager.clear()
+        availability_manager.clear()
+        rate_limiter.clear()
+        UploadManager.clear()
 
     def tearDown(self):
         db.session.remove()
         db.drop_all()
+
+
+class S3TestCase(BaseTestCase):
+    """Test case with S3 replaced by moto and an authorized shop owner"""
+    DATA = {
+        "name": "Testov shop",
+        "bulstat": "123465789",
+        "city": "Testov grad",
+        "address": "My test address",
+        "verifying_documents_photo": ENCODED_PICTURE,
+        "verifying_documents_extension": "jpg",
+        "brand_logo_photo": ENCODED_PICTURE,
+        "brand_logo_extension": "png",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self._client = mock_s3_bucket(self)
+        self._owner = OwnerFactory()
+        self._headers = self._HEADER_CONT_TYPE_JSON | {"Authorization": f"Bearer {generate_token(self._owner)}"}
+
+    def _get_keys(self):
+        return {obj["Key"] for obj in self._client.list_objects_v2(Bucket=s3.bucket).get("Contents", [])}
+
+    def _create_shop(self, name=None):
+        data = self.DATA | {"name": name} if name else self.DATA
+        resp = self.client.post(Endpoints.SHOPS, headers=self._headers, json=data)
+        self.assertEqual(201, resp.status_code)
+        return resp.json["id"]
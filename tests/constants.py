@@ -4,7 +4,10 @@ TEST_CONFIGURATION = "config.TestingConfiguration"
 class Endpoints:
     REGISTER_USER = ("/users/register", "post")
     REGISTER_ADMIN = ("/admins/register", "post")
+    USER_AVAILABILITY = ("/users/availability", "get")
     LOGIN = ("/login", "post")
+    REFRESH_TOKEN = ("/token/refresh", "post")
+    LOGOUT = ("/logout", "post")
 
     CUSTOMER_DETAILS = "/customer_details"
     CREATE_CUSTOMER_DETAILS = ("/customer_details", "post")
@@ -37,6 +40,13 @@ class Endpoints:
     DELETE_SHOP_BRAND_LOGO = ("/shops/<int:pk>/brand_logo", "delete")
 
     PRODUCT = "/products"
+    SEARCH_PRODUCT = "/products/search"
+    PRODUCT_FACETS = "/products/facets"
+
+    UPLOADS = "/uploads"
+    FINALIZE_UPLOAD = "/uploads/{}/finalize"
+
+    METRICS = "/metrics"
     CREATE_PRODUCT = ("/products", "get")
 
 
@@ -5,7 +5,7 @@ from resources.helpers.access_validators import ValidateRole
 from tests import helpers
 from tests.base_test_case import BaseTestCase
 from tests.factories import CustomerFactory, AdminFactory, OwnerFactory
-from tests.helpers import generate_token, assert_count_equal
+from tests.helpers import generate_token, assert_count_equal, capture_queries
 
 
 class DeliveryAddressDetails(BaseTestCase):
@@ -89,6 +89,15 @@ class DeliveryAddressDetails(BaseTestCase):
         self.assertEqual(data["address"], resp.json["address"])
         self.assertEqual(data["extra_informations"], resp.json["extra_informations"])
 
+    def test_create_DAD_with_customer_with_details_expect_details_selected_once(self):
+        self._create_in_db(CustomerDetailsModel, self.DATA_NO_AUTH, self._customer.id)
+
+        with capture_queries() as statements:
+            resp = self.client.post(self.URL, headers=self._HEADERS, json=self.DATA_AUTH)
+
+        self.assertEqual(201, resp.status_code)
+        self.assertEqual(1, len([statement for statement in statements if "\nFROM customer_details" in statement]))
+
     def test_get_DAD_with_customer_holder_expect_200_and_correct_json(self):
         details = self._create_in_db(DeliveryAddressDetailsModel, self.DATA, self._customer.id)
         url = self.URL + "/" + str(details.id)
@@ -1,4 +1,13 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+from sqlalchemy import event
+
+from db import db
 from managers.auth_manager import AuthManager
+from services.s3 import s3
 
 
 def assert_count_equal(count, model):
@@ -8,3 +17,32 @@ def assert_count_equal(count, model):
 def generate_token(user):
     token = AuthManager.encode_token(user)
     return token
+
+
+@contextmanager
+def capture_queries(with_parameters=False):
+    """Collects all SQL statements executed inside the block, optionally as (statement, parameters)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def mock_s3_bucket(test_case):
+    """Replaces S3 with moto until the end of the test, returns client of the bucket"""
+    mock = mock_s3()
+    mock.start()
+    test_case.addCleanup(mock.stop)
+    # the client of the service is replaced, because it is created before the mock
+    client = boto3.client("s3", region_name=s3.region, aws_access_key_id="x", aws_secret_access_key="x")
+    client.create_bucket(Bucket=s3.bucket, CreateBucketConfiguration={"LocationConstraint": s3.region})
+    client_patch = patch.object(s3, "s3", client)
+    client_patch.start()
+    test_case.addCleanup(client_patch.stop)
+    return client
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from werkzeug.security import generate_password_hash
 
 from db import db
@@ -10,8 +12,9 @@ from tests import helpers as test_helpers
 from tests.base_test_case import BaseTestCase
 from tests.constants import Endpoints
 from tests.factories import SuperAdminFactory, AdminFactory, CustomerFactory, OwnerFactory
-from tests.helpers import generate_token
+from tests.helpers import generate_token, capture_queries
 from utils import helpers
+from utils.password_hasher import password_hasher
 
 
 class TestUserRegistration(BaseTestCase):
@@ -57,6 +60,37 @@ class TestUserRegistration(BaseTestCase):
         self.assertIn("test@test.com is already taken", resp.json["message"]["email"])
         test_helpers.assert_count_equal(0, CustomerModel)
 
+    def test_reg_customer_with_taken_email_and_invalid_username_expect_400_with_both_errors(self):
+        self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=self.VALID_OWNER_DATA)
+        invalid_data = {**self.VALID_CUSTOMER_DATA, "username": "test@"}
+
+        resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=invalid_data)
+
+        self.assert400(resp)
+        self.assertIn("test@test.com is already taken", resp.json["message"]["email"])
+        self.assertEqual([ValidateIsAlphaNumeric.ERROR], resp.json["message"]["username"])
+
+    def test_reg_customer_with_username_and_email_differing_only_in_case_expect_400_and_not_added_to_db(self):
+        self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=self.VALID_OWNER_DATA)
+        data = {**self.VALID_CUSTOMER_DATA, "username": "TEST", "email": "Test@Test.com"}
+
+        resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=data)
+
+        self.assert400(resp)
+        self.assertIn("TEST is already taken", resp.json["message"]["username"])
+        self.assertIn("Test@Test.com is already taken", resp.json["message"]["email"])
+        test_helpers.assert_count_equal(0, CustomerModel)
+
+    def test_reg_customer_expect_uniqueness_of_all_fields_checked_with_single_query(self):
+        with capture_queries() as statements:
+            resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=self.VALID_CUSTOMER_DATA)
+
+        self.assertEqual(201, resp.status_code)
+        selects = [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+        # the schema is validated by ValidateSchema and once again on load, the result of the validation is reused
+        self.assertEqual(1, len(selects))
+        self.assertIn(" UNION ", selects[0])
+
     def test_reg_owner_with_invalid_email_and_username_expect_400_and_not_added_to_db(self):
         invalid_data = {"username": "test@", "email": "testtest.com", "password": "testP@ss1!", "role": "owner"}
         resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=invalid_data)
@@ -200,6 +234,46 @@ class TestLogin(BaseTestCase):
         role = "super_admin"
         self._login_test(self.VAlID_SUPER_ADMIN_CREDENTIALS, identifier, role, self._assert_successful_login)
 
+    def test_login_with_identifier_in_other_case_expect_200_and_return_token(self):
+        for identifier in ("TEST", "Test@Test.com"):
+            credentials = {"identifier": identifier, "password": self.VAlID_CREDENTIALS["password"], "role": "customer"}
+
+            resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=credentials)
+
+            self._assert_successful_login(resp, "customer")
+
+    def test_login_with_identifier_matching_two_users_in_other_case_expect_exact_match_logged_in(self):
+        self._create_user_in_test_db("customer", {"username": "Test", "email": "Test@test.com", "password": "other"})
+        credentials = {"identifier": "Test", "password": "other", "role": "customer"}
+
+        resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=credentials)
+
+        self._assert_successful_login(resp, "customer")
+
+    def test_login_with_identifier_matching_two_users_without_exact_match_expect_first_registered_logged_in(self):
+        self._create_user_in_test_db("customer", {"username": "Test", "email": "Test@test.com", "password": "other"})
+        credentials = {"identifier": "TEST", "password": self.VAlID_CREDENTIALS["password"], "role": "customer"}
+
+        resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=credentials)
+
+        self._assert_successful_login(resp, "customer")
+
+    def test_login_via_username_expect_single_user_query(self):
+        credentials = {"identifier": "test", "password": self.VAlID_CREDENTIALS["password"], "role": "customer"}
+        with capture_queries() as statements:
+            resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=credentials)
+
+        self.assert200(resp)
+        self.assertEqual(1, len([statement for statement in statements if "\nFROM customer" in statement]))
+
+    def test_login_with_not_existing_identifier_expect_password_still_checked(self):
+        credentials = {"identifier": "not_existing", "password": "some_password", "role": "customer"}
+        with patch.object(password_hasher, "check", wraps=password_hasher.check) as check:
+            resp = self.client.post(self.URL, headers=self._HEADER_CONT_TYPE_JSON, json=credentials)
+
+        self._assert_login_fail(resp)
+        check.assert_called_once()
+
     def test_login_with_customer_via_email_invalid_password_expect_400(self):
         identifier = "email"
         role = "customer"
@@ -300,6 +374,7 @@ class TestLogin(BaseTestCase):
     def _assert_successful_login(self, resp, role):
         self.assert200(resp)
         self.assertIn("token", resp.json)
+        self.assertIn("refresh_token", resp.json)
         token = resp.json['token']
 
         self.assertEqual(role, AuthManager.decode_token(token)["role"])
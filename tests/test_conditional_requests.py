@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from werkzeug.http import http_date
+
+from db import db
+from models import ShopModel, ProductModel, TableVersionModel
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import OwnerFactory, ShopFactory, ProductFactory
+from tests.helpers import generate_token, capture_queries
+
+
+class TestConditionalRequests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.shop_owner = OwnerFactory()
+        self.shop = ShopFactory(active=True, holder_id=self.shop_owner.id)
+        self.product = ProductFactory(holder_id=self.shop_owner.id, listed=True)
+        self.shop.products.append(self.product)
+        db.session.commit()
+        self.authorization_headers = {"Authorization": f"Bearer {generate_token(self.shop_owner)}"}
+        self.shop_url = f"{Endpoints.SHOPS}/{self.shop.id}"
+
+    def test_get_shop_with_matching_etag_expect_304_without_body(self):
+        resp = self.client.get(self.shop_url)
+        self.assertEqual(200, resp.status_code)
+        self.assertIn("ETag", resp.headers)
+        self.assertEqual("Authorization", resp.headers["Vary"])
+
+        resp = self.client.get(self.shop_url, headers={"If-None-Match": resp.headers["ETag"]})
+        self.assertEqual(304, resp.status_code)
+        self.assertEqual(b"", resp.data)
+
+    def test_get_shop_with_etag_of_other_role_expect_200(self):
+        holder_resp = self.client.get(self.shop_url, headers=self.authorization_headers)
+        resp = self.client.get(self.shop_url, headers={"If-None-Match": holder_resp.headers["ETag"]})
+
+        self.assertEqual(200, resp.status_code)
+        self.assertNotEqual(holder_resp.headers["ETag"], resp.headers["ETag"])
+        self.assertNotIn("bulstat", resp.json)
+
+    def test_get_shop_after_change_expect_200_and_new_etag(self):
+        etag = self.client.get(self.shop_url).headers["ETag"]
+        ShopModel.query.filter_by(id=self.shop.id).update({"description": "Changed"})
+        db.session.commit()
+
+        resp = self.client.get(self.shop_url, headers={"If-None-Match": etag})
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual("Changed", resp.json["description"])
+        self.assertNotEqual(etag, resp.headers["ETag"])
+
+    def test_get_shop_with_if_modified_since_expect_304_if_not_modified(self):
+        last_modified = self.client.get(self.shop_url).headers["Last-Modified"]
+
+        resp = self.client.get(self.shop_url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(304, resp.status_code)
+
+        earlier = http_date(self.shop.registered_on - timedelta(seconds=1))
+        resp = self.client.get(self.shop_url, headers={"If-Modified-Since": earlier})
+        self.assertEqual(200, resp.status_code)
+
+    def test_get_list_with_matching_etag_expect_304_without_listing_query(self):
+        etag = self.client.get(Endpoints.PRODUCT).headers["ETag"]
+
+        with capture_queries() as statements:
+            resp = self.client.get(Endpoints.PRODUCT, headers={"If-None-Match": etag})
+
+        self.assertEqual(304, resp.status_code)
+        self.assertFalse([statement for statement in statements if "\nFROM product" in statement])
+
+    def test_get_list_with_etag_of_other_user_or_query_expect_200(self):
+        etag = self.client.get(Endpoints.PRODUCT).headers["ETag"]
+
+        resp = self.client.get(Endpoints.PRODUCT, headers={"If-None-Match": etag} | self.authorization_headers)
+        self.assertEqual(200, resp.status_code)
+        resp = self.client.get(Endpoints.PRODUCT + "?limit=1", headers={"If-None-Match": etag})
+        self.assertEqual(200, resp.status_code)
+
+    def test_get_list_after_changes_of_listed_tables_expect_200_and_new_etag(self):
+        changes = (
+            lambda: ProductFactory(holder_id=self.shop_owner.id, listed=True),
+            lambda: ProductModel.query.filter_by(id=self.product.id).update({"name": "Renamed"}),
+            lambda: setattr(self.shop, "name", "Renamed shop"),
+            lambda: self.shop.products.remove(self.product),
+            lambda: ProductModel.query.filter_by(id=self.product.id).delete(synchronize_session=False),
+        )
+        etag = self.client.get(Endpoints.PRODUCT).headers["ETag"]
+        for change in changes:
+            change()
+            db.session.commit()
+
+            resp = self.client.get(Endpoints.PRODUCT, headers={"If-None-Match": etag})
+
+            self.assertEqual(200, resp.status_code)
+            self.assertNotEqual(etag, resp.headers["ETag"])
+            etag = resp.headers["ETag"]
+
+    def test_table_versions_are_bumped_once_per_commit(self):
+        version = TableVersionModel.query.get(ProductModel.__tablename__).version
+        [ProductFactory.build(holder_id=self.shop_owner.id) for _ in range(2)]
+        db.session.add_all([ProductFactory.build(holder_id=self.shop_owner.id) for _ in range(2)])
+        db.session.flush()
+        ProductModel.query.filter_by(holder_id=self.shop_owner.id).update({"quantity": 5})
+
+        with capture_queries() as statements:
+            db.session.add(ProductFactory.build(holder_id=self.shop_owner.id))
+            db.session.flush()
+        self.assertFalse([statement for statement in statements if "table_version" in statement])
+
+        db.session.commit()
+
+        self.assertEqual(version + 1, TableVersionModel.query.get(ProductModel.__tablename__).version)
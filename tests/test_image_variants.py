@@ -0,0 +1,130 @@
+import base64
+import io
+
+from PIL import Image
+
+from constants.uploads import IMAGE_VARIANT_SIZES, ORIGINAL_VARIANT
+from managers.photo_deletion_manager import photo_deletion_manager
+from models import ShopModel, ProductModel, ProductCategories
+from services.image_pipeline import image_pipeline
+from services.s3 import s3
+from tests.base_test_case import S3TestCase
+from tests.constants import Endpoints
+from tests.factories import ShopFactory
+from utils.helpers import get_photo_name_by_url, get_variant_photo_names
+
+
+def encode_image(image_format, size=(1200, 900), mode="RGB"):
+    output = io.BytesIO()
+    Image.new(mode, size, "red").save(output, format=image_format)
+    return base64.b64encode(output.getvalue()).decode("utf-8")
+
+
+class TestImageVariants(S3TestCase):
+    DATA = S3TestCase.DATA | {
+        "verifying_documents_photo": base64.b64encode(b"%PDF-1.4 documents").decode("utf-8"),
+        "verifying_documents_extension": "pdf",
+        "brand_logo_photo": encode_image("PNG", mode="RGBA"),
+        "brand_logo_extension": "png",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.app.config["IMAGE_VARIANTS_ENABLED"] = True
+        self.addCleanup(image_pipeline.wait)
+
+    def _get_object(self, url):
+        return self._client.get_object(Bucket=s3.bucket, Key=get_photo_name_by_url(url))
+
+    def test_create_shop_expect_real_content_types_and_variants_of_logo_only(self):
+        resp = self.client.post(Endpoints.SHOPS, headers=self._headers, json=self.DATA)
+        image_pipeline.wait()
+
+        self.assertEqual(201, resp.status_code)
+        shop = ShopModel.query.get(resp.json["id"])
+        self.assertEqual("image/png", self._get_object(shop.brand_logo_image_url)["ContentType"])
+        self.assertEqual("application/pdf", self._get_object(shop.verifying_documents_image_url)["ContentType"])
+
+        variants = shop.brand_logo_image_variants
+        self.assertEqual({ORIGINAL_VARIANT, *IMAGE_VARIANT_SIZES}, set(variants))
+        self.assertEqual({"webp"}, set(variants[ORIGINAL_VARIANT]))
+        for size, box in IMAGE_VARIANT_SIZES.items():
+            self.assertEqual({"png", "webp"}, set(variants[size]))
+            for image_format, url in variants[size].items():
+                variant = self._get_object(url)
+                self.assertEqual(f"image/{image_format}", variant["ContentType"])
+                with Image.open(io.BytesIO(variant["Body"].read())) as image:
+                    self.assertEqual(image_format.upper(), image.format)
+                    # the aspect ratio is kept and the image fits in the box
+                    self.assertEqual((box[0], box[0] * 3 // 4), image.size)
+        self.assertEqual(2 + 7, len(self._get_keys()))
+
+    def test_get_shops_and_products_expect_variant_urls(self):
+        shop = ShopFactory(holder_id=self._owner.id)
+        data = {
+            "name": "Test",
+            "quantity": 20,
+            "price": 10.5,
+            "category": ProductCategories.pets.name,
+            "listed": False,
+            "shops_id": [shop.id],
+            "product_photo": encode_image("JPEG"),
+            "product_extension": "jpg",
+        }
+        self.client.post(Endpoints.SHOPS, headers=self._headers, json=self.DATA)
+        self.client.post(Endpoints.PRODUCT, headers=self._headers, json=[data])
+        image_pipeline.wait()
+
+        shops = self.client.get(Endpoints.SHOPS, headers=self._headers).json
+        products = self.client.get(Endpoints.PRODUCT, headers=self._headers).json
+
+        logo_variants = [shop["brand_logo_image_variants"] for shop in shops if shop["brand_logo_image_variants"]]
+        self.assertEqual([ShopModel.query.filter_by(name=self.DATA["name"]).first().brand_logo_image_variants],
+                         logo_variants)
+        product = ProductModel.query.first()
+        self.assertEqual(product.product_image_variants, products[0]["product_image_variants"])
+        self.assertEqual({"jpeg", "webp"}, set(product.product_image_variants["small"]))
+        small_jpeg = self._get_object(product.product_image_variants["small"]["jpeg"])
+        self.assertEqual("image/jpeg", small_jpeg["ContentType"])
+        self.assertEqual("image/jpeg", self._get_object(product.product_image_url)["ContentType"])
+
+    def test_change_and_delete_logo_expect_variants_of_previous_logo_deleted(self):
+        shop_id = self.client.post(Endpoints.SHOPS, headers=self._headers, json=self.DATA).json["id"]
+        image_pipeline.wait()
+        previous = ShopModel.query.get(shop_id)
+        previous_keys = {get_photo_name_by_url(previous.brand_logo_image_url),
+                         *get_variant_photo_names(previous.brand_logo_image_variants)}
+        data = {"brand_logo_photo": encode_image("JPEG"), "brand_logo_extension": "jpg"}
+
+        resp = self.client.put(f"{Endpoints.SHOPS}/{shop_id}/brand_logo", headers=self._headers, json=data)
+        image_pipeline.wait()
+        photo_deletion_manager.drain()
+
+        self.assert200(resp)
+        shop = ShopModel.query.get(shop_id)
+        self.assertFalse(previous_keys & self._get_keys())
+        self.assertEqual({"jpeg", "webp"}, set(shop.brand_logo_image_variants["small"]))
+
+        resp = self.client.delete(f"{Endpoints.SHOPS}/{shop_id}/brand_logo", headers=self._headers)
+        photo_deletion_manager.drain()
+
+        self.assert200(resp)
+        self.assertIsNone(ShopModel.query.get(shop_id).brand_logo_image_variants)
+        self.assertEqual({get_photo_name_by_url(shop.verifying_documents_image_url)}, self._get_keys())
+
+    def test_create_variants_of_replaced_image_expect_variants_deleted(self):
+        self._client.put_object(Bucket=s3.bucket, Key="replaced.png", Body=base64.b64decode(encode_image("PNG")))
+
+        image_pipeline._jobs.run(self.app, ShopModel, "brand_logo", "replaced.png")
+        photo_deletion_manager.drain()
+
+        self.assertEqual({"replaced.png"}, self._get_keys())
+
+    def test_create_shop_with_variants_disabled_expect_no_variants(self):
+        self.app.config["IMAGE_VARIANTS_ENABLED"] = False
+
+        resp = self.client.post(Endpoints.SHOPS, headers=self._headers, json=self.DATA)
+        image_pipeline.wait()
+
+        self.assertIsNone(ShopModel.query.get(resp.json["id"]).brand_logo_image_variants)
+        self.assertEqual(2, len(self._get_keys()))
@@ -0,0 +1,94 @@
+from sqlalchemy import text
+
+from db import db
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import OwnerFactory, CustomerFactory, AdminFactory
+from tests.helpers import generate_token, capture_queries
+
+
+class TestListingIndexes(BaseTestCase):
+    """Every listing query must be answered by indexes, sequential scans are disabled so the planner
+    falls back to Seq Scan only if there is no usable index for the predicate"""
+    SHOPS_COUNT = 100
+    PRODUCTS_COUNT = 5000
+    INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+    def setUp(self):
+        super().setUp()
+        self.shop_owner = OwnerFactory()
+        # seeded with SQL, so the dataset is big enough for the planner to prefer the indexes
+        params = {"holder_id": self.shop_owner.id, "shops": self.SHOPS_COUNT, "products": self.PRODUCTS_COUNT}
+        db.session.execute(text("""
+            INSERT INTO shop (id, name, bulstat, city, address, verifying_documents_image_url, verified, active,
+                              registered_on, holder_id)
+            SELECT i, 'Shop ' || i, '123456789', 'City ' || i % 20, 'Address', 'url', true, i % 2 = 0,
+                   now() - i * interval '1 hour', :holder_id
+            FROM generate_series(1, :shops) AS i"""), params)
+        db.session.execute(text("""
+            INSERT INTO product (id, name, description, quantity, price, category, listed, registered_on, holder_id)
+            SELECT i, 'Product ' || i, 'Description ' || i, 1, i % 500,
+                   (enum_range(NULL::productcategories))[i % 14 + 1], i % 3 > 0, now() - i * interval '1 minute',
+                   :holder_id
+            FROM generate_series(1, :products) AS i"""), params)
+        db.session.execute(text("""
+            INSERT INTO shops_products (shop_id, product_id)
+            SELECT i % :shops + 1, i FROM generate_series(1, :products) AS i"""), params)
+        db.session.commit()
+        db.session.execute("ANALYZE")
+
+    @staticmethod
+    def _get_authorization_header(user):
+        return {"Authorization": f"Bearer {generate_token(user)}"}
+
+    def _assert_no_seq_scan(self, url, user=None):
+        headers = self._get_authorization_header(user) if user else None
+        with capture_queries(with_parameters=True) as executions:
+            resp = self.client.get(url, headers=headers)
+        self.assertEqual(200, resp.status_code, resp.json)
+
+        db.session.execute("SET enable_seqscan = off")
+        try:
+            for statement, parameters in executions:
+                if not statement.lstrip().upper().startswith("SELECT"):
+                    continue
+                plan = db.session.connection().exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()[0]["Plan"]
+                for node, parent in self._get_plan_nodes(plan):
+                    self.assertNotEqual("Seq Scan", node["Node Type"], f"{url}\n{statement}\n{plan}")
+                    # a full index scan is allowed only to read the first rows of a page in index order
+                    if node["Node Type"] in self.INDEX_SCANS and "Index Cond" not in node:
+                        self.assertEqual("Limit", parent and parent["Node Type"], f"{url}\n{statement}\n{plan}")
+        finally:
+            db.session.execute("RESET enable_seqscan")
+
+    def _get_plan_nodes(self, node, parent=None):
+        yield node, parent
+        for child in node.get("Plans", []):
+            yield from self._get_plan_nodes(child, node)
+
+    def test_product_listings_expect_index_scans_only(self):
+        urls = [
+            Endpoints.PRODUCT + "?limit=10",
+            Endpoints.PRODUCT + "?category=books,pets",
+            Endpoints.PRODUCT + "?price_min=10&price_max=50&sort=price",
+            Endpoints.PRODUCT + "?sort=-price&limit=10",
+            Endpoints.PRODUCT + "?created_after=2020-01-01T00:00:00",
+            Endpoints.PRODUCT + f"?holder_id={self.shop_owner.id}",
+            Endpoints.PRODUCT + "?shop_ids=1-2",
+            Endpoints.SEARCH_PRODUCT + "?q=dog",
+        ]
+        for user in (None, CustomerFactory(), self.shop_owner, AdminFactory()):
+            for url in urls:
+                self._assert_no_seq_scan(url, user)
+
+    def test_shop_listings_expect_index_scans_only(self):
+        urls = [
+            Endpoints.SHOPS + "?limit=10",
+            Endpoints.SHOPS + "?city=Sofia",
+            Endpoints.SHOPS + f"?holder_id={self.shop_owner.id}&sort=-registered_on",
+            Endpoints.SHOPS + "?created_after=2020-01-01T00:00:00&active=true",
+        ]
+        for user in (None, CustomerFactory(), self.shop_owner, AdminFactory()):
+            for url in urls:
+                self._assert_no_seq_scan(url, user)
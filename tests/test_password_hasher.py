@@ -0,0 +1,69 @@
+import os
+import signal
+from unittest.mock import patch
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from constants.auth import PASSWORD_HASH_METHOD, PASSWORD_HASH_RETRY_AFTER
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import CustomerFactory
+from utils.password_hasher import password_hasher, PasswordHasher
+
+
+class TestPasswordHasher(BaseTestCase):
+    PASSWORD = "testP@ss1!"
+
+    def test_hash_in_pool_expect_configured_method_and_valid_hash(self):
+        pwhash = password_hasher.hash(self.PASSWORD)
+
+        self.assertTrue(pwhash.startswith(PASSWORD_HASH_METHOD + "$"))
+        self.assertTrue(check_password_hash(pwhash, self.PASSWORD))
+        self.assertTrue(password_hasher.check(pwhash, self.PASSWORD))
+        self.assertFalse(password_hasher.check(pwhash, "wrong"))
+        self.assertFalse(password_hasher.needs_rehash(pwhash))
+
+    def test_check_unknown_user_expect_single_check_in_pool(self):
+        hasher = PasswordHasher(workers=1)
+
+        with patch.object(hasher._pool, "run", wraps=hasher._pool.run) as run:
+            self.assertFalse(hasher.check_unknown_user(self.PASSWORD))
+
+        self.assertEqual([check_password_hash], [call.args[0] for call in run.call_args_list])
+        hasher._pool._executor.shutdown()
+
+    def test_hasher_saturated_expect_503_with_retry_after_and_user_not_added(self):
+        data = {"username": "test", "email": "test@test.com", "password": self.PASSWORD, "role": "customer"}
+        [password_hasher._pending.acquire() for _ in range(password_hasher.max_pending)]
+        try:
+            resp = self.client.post(Endpoints.REGISTER_USER[0], headers=self._HEADER_CONT_TYPE_JSON, json=data)
+        finally:
+            [password_hasher._pending.release() for _ in range(password_hasher.max_pending)]
+
+        self.assertEqual(503, resp.status_code)
+        self.assertEqual(PasswordHasher.BUSY_MESSAGE, resp.json["message"])
+        self.assertEqual(str(PASSWORD_HASH_RETRY_AFTER), resp.headers["Retry-After"])
+
+    def test_login_with_outdated_hash_parameters_expect_password_rehashed(self):
+        customer = CustomerFactory(password=generate_password_hash(self.PASSWORD, "pbkdf2:sha256:1000", 8))
+        self.assertTrue(password_hasher.needs_rehash(customer.password))
+
+        resp = self.client.post(Endpoints.LOGIN[0], headers=self._HEADER_CONT_TYPE_JSON,
+                                json={"identifier": customer.email, "password": self.PASSWORD, "role": "customer"})
+
+        self.assert200(resp)
+        self.assertTrue(customer.password.startswith(PASSWORD_HASH_METHOD + "$"))
+        self.assertFalse(password_hasher.needs_rehash(customer.password))
+        self.assertTrue(check_password_hash(customer.password, self.PASSWORD))
+
+    def test_hash_after_worker_died_expect_pool_replaced(self):
+        hasher = PasswordHasher(workers=1)
+        hasher.hash(self.PASSWORD)
+        executor = hasher._pool._executor
+        [os.kill(pid, signal.SIGKILL) for pid in list(executor._processes)]
+
+        pwhash = hasher.hash(self.PASSWORD)
+
+        self.assertTrue(check_password_hash(pwhash, self.PASSWORD))
+        self.assertIsNot(executor, hasher._pool._executor)
+        hasher._pool._executor.shutdown()
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from marshmallow import ValidationError
+
+from constants.roots import COMMON_PASSWORDS_PATH
+from schemas.validators.password_validator import PasswordValidator, PasswordBlocklist
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import AdminFactory
+from tests.helpers import generate_token
+
+
+class TestPasswordValidator(BaseTestCase):
+    def _get_errors(self, password):
+        try:
+            PasswordValidator().validate_password(password)
+        except ValidationError as ex:
+            return ex.messages
+        return []
+
+    def test_policy_failure_expect_policy_errors_without_strength_computed(self):
+        with patch("schemas.validators.password_validator.PasswordStats") as password_stats:
+            errors = self._get_errors("short")
+
+        password_stats.assert_not_called()
+        self.assertIn("Too short!", errors)
+        self.assertNotIn(PasswordValidator.TOO_COMMON_ERROR, errors)
+
+    def test_common_password_passing_policy_expect_too_common_from_blocklist(self):
+        rejected = PasswordValidator.get_stats()["rejected"]["blocklist"]
+
+        with patch("schemas.validators.password_validator.PasswordStats") as password_stats:
+            errors = self._get_errors("P@ssw0rd123")
+
+        password_stats.assert_not_called()
+        self.assertEqual([PasswordValidator.TOO_COMMON_ERROR], errors)
+        self.assertEqual(rejected + 1, PasswordValidator.get_stats()["rejected"]["blocklist"])
+
+    def test_strong_password_expect_valid(self):
+        self.assertEqual([], self._get_errors("Tr4vel-Kettle-Orbit"))
+
+    def test_blocklist_expect_every_entry_found_and_others_not(self):
+        blocklist = PasswordBlocklist(COMMON_PASSWORDS_PATH)
+        with open(COMMON_PASSWORDS_PATH) as file:
+            entries = file.read().split()
+
+        self.assertTrue(all(entry in blocklist for entry in entries))
+        self.assertTrue(entries[0].upper() in blocklist)
+        self.assertFalse([entry for entry in entries if entry + "~" in blocklist or "~" + entry in blocklist])
+        self.assertFalse("" in blocklist)
+
+    def test_metrics_expect_password_validator_timings(self):
+        self._get_errors("Tr4vel-Kettle-Orbit")
+        headers = {"Authorization": f"Bearer {generate_token(AdminFactory())}"}
+
+        resp = self.client.get(Endpoints.METRICS, headers=headers)
+
+        stats = resp.json["password_validator"]
+        self.assertGreater(stats["calls"], 0)
+        self.assertGreater(stats["total_seconds"], 0)
+        self.assertGreaterEqual(stats["max_seconds"], stats["average_seconds"])
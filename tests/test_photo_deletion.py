@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+from db import db
+from managers.photo_deletion_manager import photo_deletion_manager, PhotoDeletionManager
+from models import PhotoDeletionModel
+from services.s3 import s3
+from tests import helpers
+from tests.base_test_case import S3TestCase
+from tests.constants import Endpoints
+
+
+class TestPhotoDeletion(S3TestCase):
+    def _put_objects(self, keys):
+        [self._client.put_object(Bucket=s3.bucket, Key=key, Body=b"photo") for key in keys]
+
+    def _delete_shop(self, shop_id):
+        resp = self.client.delete(f"{Endpoints.SHOPS}/{shop_id}", headers=self._headers)
+        self.assertEqual(204, resp.status_code)
+
+    def test_delete_shop_expect_photos_queued_and_deleted_by_drain(self):
+        shop_id = self._create_shop()
+        keys = self._get_keys()
+
+        self._delete_shop(shop_id)
+
+        self.assertEqual(keys, self._get_keys())
+        self.assertEqual(keys, {deletion.key for deletion in PhotoDeletionModel.query.all()})
+
+        self.assertEqual(2, photo_deletion_manager.drain())
+
+        self.assertEqual(set(), self._get_keys())
+        helpers.assert_count_equal(0, PhotoDeletionModel)
+
+    def test_rolled_back_transaction_expect_photos_kept(self):
+        self._put_objects(["a.png"])
+        photo_deletion_manager.enqueue([("a.png", "a.png")])
+
+        db.session.rollback()
+
+        self.assertEqual(0, photo_deletion_manager.drain())
+        self.assertEqual({"a.png"}, self._get_keys())
+
+    def test_store_queued_photo_again_expect_deletion_cancelled(self):
+        self._delete_shop(self._create_shop())
+        keys = self._get_keys()
+
+        self._create_shop()
+
+        helpers.assert_count_equal(0, PhotoDeletionModel)
+        self.assertEqual(0, photo_deletion_manager.drain())
+        self.assertEqual(keys, self._get_keys())
+
+    def test_drain_expect_objects_deleted_in_batches(self):
+        keys = ["a.png", "b.png", "c.png"]
+        self._put_objects(keys)
+        photo_deletion_manager.enqueue((key, key) for key in keys)
+        db.session.commit()
+
+        with patch.object(s3, "DELETE_BATCH_SIZE", 2), \
+                patch.object(s3.s3, "delete_objects", wraps=s3.s3.delete_objects) as delete_objects:
+            self.assertEqual(3, photo_deletion_manager.drain())
+
+        self.assertEqual(2, delete_objects.call_count)
+        self.assertEqual(set(), self._get_keys())
+
+    def test_drain_with_failed_object_expect_it_kept_in_queue(self):
+        photo_deletion_manager.enqueue([("a.png", "a.png"), ("b.png", "b.png")])
+        db.session.commit()
+
+        with patch.object(s3, "delete_photos", return_value=["b.png"]):
+            self.assertEqual(1, photo_deletion_manager.drain())
+
+        self.assertEqual(["b.png"], [deletion.key for deletion in PhotoDeletionModel.query.all()])
+
+    def test_drain_with_first_batch_failing_persistently_expect_later_rows_deleted(self):
+        photo_deletion_manager.enqueue([("a.png", "a.png"), ("b.png", "b.png")])
+        db.session.commit()
+        photo_deletion_manager.enqueue([("c.png", "c.png"), ("d.png", "d.png")])
+        db.session.commit()
+
+        def delete_photos(keys):
+            return [key for key in keys if key in ("a.png", "b.png")]
+
+        with patch.object(s3, "DELETE_BATCH_SIZE", 2), \
+                patch.object(s3, "delete_photos", side_effect=delete_photos) as delete_photos_mock:
+            self.assertEqual(2, photo_deletion_manager.drain())
+            # the failed rows wait for their backoff
+            self.assertEqual(0, photo_deletion_manager.drain())
+
+        self.assertEqual(2, delete_photos_mock.call_count)
+        deletions = PhotoDeletionModel.query.order_by(PhotoDeletionModel.key).all()
+        self.assertEqual(["a.png", "b.png"], [deletion.key for deletion in deletions])
+        self.assertEqual([1, 1], [deletion.attempts for deletion in deletions])
+
+    def test_commit_with_worker_enabled_expect_photos_deleted_in_background(self):
+        self.app.config["PHOTO_DELETION_WORKER_ENABLED"] = True
+        shop_id = self._create_shop()
+
+        self._delete_shop(shop_id)
+        photo_deletion_manager.wait()
+
+        self.assertEqual(set(), self._get_keys())
+        helpers.assert_count_equal(0, PhotoDeletionModel)
+
+    def test_periodic_drain_expect_photos_queued_before_deleted(self):
+        self._put_objects(["a.png"])
+        photo_deletion_manager.enqueue([("a.png", "a.png")])
+        db.session.commit()
+        manager = PhotoDeletionManager()
+
+        manager._drain_periodically(self.app)
+        manager.wait()
+        manager._timer.cancel()
+
+        self.assertEqual(set(), self._get_keys())
+        helpers.assert_count_equal(0, PhotoDeletionModel)
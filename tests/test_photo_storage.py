@@ -0,0 +1,145 @@
+import hashlib
+
+from db import db
+from managers.photo_deletion_manager import photo_deletion_manager
+from managers.photo_storage_manager import PhotoStorageManager
+from models import ShopModel, ProductModel, ProductCategories, StoredPhotoModel, PhotoDeletionModel
+from services.image_pipeline import image_pipeline
+from services.s3 import s3
+from tests import helpers
+from tests.base_test_case import S3TestCase
+from tests.constants import Endpoints, ENCODED_PICTURE
+from tests.factories import ShopFactory
+from utils.helpers import decode_file, get_photo_name_by_url
+
+
+class TestPhotoStorage(S3TestCase):
+    LOGO_KEY = f"{hashlib.sha256(decode_file(ENCODED_PICTURE)).hexdigest()}.png"
+
+    def _get_reference_count(self, key):
+        stored_photo = StoredPhotoModel.query.get(key)
+        return stored_photo.reference_count if stored_photo else 0
+
+    def test_create_products_with_same_photo_expect_photo_stored_once(self):
+        shop = ShopFactory(holder_id=self._owner.id)
+        data = {
+            "quantity": 20,
+            "price": 10.5,
+            "category": ProductCategories.pets.name,
+            "listed": False,
+            "shops_id": [shop.id],
+            "product_photo": ENCODED_PICTURE,
+            "product_extension": "jpg",
+        }
+
+        resp = self.client.post(Endpoints.PRODUCT, headers=self._headers,
+                                json=[data | {"name": f"Product {index}"} for index in range(3)])
+
+        self.assertEqual(201, resp.status_code)
+        urls = {product.product_image_url for product in ProductModel.query.all()}
+        self.assertEqual(1, len(urls))
+        key = get_photo_name_by_url(urls.pop())
+        self.assertEqual({key}, self._get_keys())
+        self.assertEqual(3, self._get_reference_count(key))
+
+    def test_delete_shops_with_same_logo_expect_logo_deleted_with_last_shop(self):
+        first, second = self._create_shop("First shop"), self._create_shop("Second shop")
+        self.assertEqual(2, self._get_reference_count(self.LOGO_KEY))
+        self.assertEqual(2, len(self._get_keys()))
+
+        self.assertEqual(204, self.client.delete(f"{Endpoints.SHOPS}/{first}", headers=self._headers).status_code)
+
+        self.assertIn(self.LOGO_KEY, self._get_keys())
+        self.assertEqual(1, self._get_reference_count(self.LOGO_KEY))
+
+        self.assertEqual(204, self.client.delete(f"{Endpoints.SHOPS}/{second}", headers=self._headers).status_code)
+        photo_deletion_manager.drain()
+
+        self.assertEqual(set(), self._get_keys())
+        helpers.assert_count_equal(0, StoredPhotoModel)
+
+    def test_delete_shared_logo_expect_kept_for_other_shop(self):
+        first, second = self._create_shop("First shop"), self._create_shop("Second shop")
+
+        resp = self.client.delete(f"{Endpoints.SHOPS}/{first}/brand_logo", headers=self._headers)
+
+        self.assert200(resp)
+        self.assertIn(self.LOGO_KEY, self._get_keys())
+        self.assertEqual(s3.get_url(self.LOGO_KEY), ShopModel.query.get(second).brand_logo_image_url)
+        self.assertEqual(1, self._get_reference_count(self.LOGO_KEY))
+
+    def test_change_logo_to_same_photo_expect_photo_kept(self):
+        shop_id = self._create_shop("First shop")
+        data = {"brand_logo_photo": ENCODED_PICTURE, "brand_logo_extension": "png"}
+
+        resp = self.client.put(f"{Endpoints.SHOPS}/{shop_id}/brand_logo", headers=self._headers, json=data)
+
+        self.assert200(resp)
+        self.assertIn(self.LOGO_KEY, self._get_keys())
+        self.assertEqual(1, self._get_reference_count(self.LOGO_KEY))
+
+    def test_create_shop_with_taken_name_expect_shared_photos_kept(self):
+        self._create_shop("First shop")
+
+        resp = self.client.post(Endpoints.SHOPS, headers=self._headers, json=self.DATA | {"name": "First shop"})
+
+        self.assert400(resp)
+        self.assertEqual(2, len(self._get_keys()))
+        self.assertEqual(1, self._get_reference_count(self.LOGO_KEY))
+
+    def test_edit_shop_with_new_logo_and_taken_name_expect_400_and_photos_discarded(self):
+        taken_name = ShopFactory(holder_id=self._owner.id).name
+        shop = ShopFactory(holder_id=self._owner.id)
+
+        resp = self.client.put(f"{Endpoints.SHOPS}/{shop.id}", headers=self._headers,
+                               json=self.DATA | {"name": taken_name})
+        photo_deletion_manager.drain()
+
+        self.assert400(resp)
+        self.assertIn("is already taken!", resp.json["message"])
+        helpers.assert_count_equal(0, StoredPhotoModel)
+        self.assertEqual(set(), self._get_keys())
+
+    def test_delete_photo_stored_before_reference_counting_expect_deleted(self):
+        self._client.put_object(Bucket=s3.bucket, Key="legacy.png", Body=b"logo")
+        shop = ShopFactory(holder_id=self._owner.id)
+        ShopModel.query.filter_by(id=shop.id).update({"brand_logo_image_url": s3.get_url("legacy.png")})
+
+        resp = self.client.delete(f"{Endpoints.SHOPS}/{shop.id}/brand_logo", headers=self._headers)
+        photo_deletion_manager.drain()
+
+        self.assert200(resp)
+        self.assertNotIn("legacy.png", self._get_keys())
+
+    def test_acquire_and_release_expect_counts_by_occurrences(self):
+        self.assertEqual({"a.png", "b.png"}, PhotoStorageManager.acquire(["a.png", "a.png", "b.png"]))
+        self.assertEqual({"c.png"}, PhotoStorageManager.acquire(["a.png", "c.png"]))
+
+        self.assertEqual({"b.png"}, PhotoStorageManager.release(["a.png", "a.png", "b.png", None]))
+        self.assertEqual(1, self._get_reference_count("a.png"))
+        self.assertEqual(0, self._get_reference_count("b.png"))
+
+    def test_discard_photos_of_failed_transaction_expect_only_unreferenced_queued(self):
+        PhotoStorageManager.acquire(["kept.png"])
+        db.session.commit()
+
+        PhotoStorageManager.discard(["new.png", "kept.png", None])
+
+        self.assertEqual(["new.png"], [deletion.key for deletion in PhotoDeletionModel.query.all()])
+        self.assertEqual(1, self._get_reference_count("kept.png"))
+        self.assertIsNone(StoredPhotoModel.query.get("new.png"))
+
+    def test_create_variants_of_shared_photo_expect_created_once(self):
+        self.app.config["IMAGE_VARIANTS_ENABLED"] = True
+        self.addCleanup(image_pipeline.wait)
+        first = self._create_shop("First shop")
+        image_pipeline.wait()
+        keys = self._get_keys()
+
+        second = self._create_shop("Second shop")
+        image_pipeline.wait()
+
+        self.assertEqual(keys, self._get_keys())
+        self.assertIsNotNone(ShopModel.query.get(first).brand_logo_image_variants)
+        self.assertEqual(ShopModel.query.get(first).brand_logo_image_variants,
+                         ShopModel.query.get(second).brand_logo_image_variants)
@@ -0,0 +1,129 @@
+import io
+import threading
+from unittest.mock import patch
+
+from werkzeug.exceptions import InternalServerError
+
+from models import ShopModel, ProductModel, ProductCategories
+from services.s3 import s3
+from tests import helpers
+from tests.base_test_case import BaseTestCase
+from tests.constants import ENCODED_PICTURE, Endpoints
+from tests.factories import OwnerFactory, ShopFactory
+from tests.helpers import generate_token
+from utils.helpers import decode_file
+
+
+class TestPhotoUploads(BaseTestCase):
+    URL = Endpoints.SHOPS
+    DATA = {
+        "name": "Testov shop",
+        "bulstat": "123465789",
+        "city": "Testov grad",
+        "address": "My test address",
+        "verifying_documents_photo": ENCODED_PICTURE,
+        "verifying_documents_extension": "pdf",
+        "brand_logo_photo": ENCODED_PICTURE,
+        "brand_logo_extension": "png",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self._shop_owner = OwnerFactory()
+        self._authorization_header = {"Authorization": f"Bearer {generate_token(self._shop_owner)}"}
+        self._headers = self._HEADER_CONT_TYPE_JSON | self._authorization_header
+
+    @staticmethod
+    def _upload_from_stream(uploads):
+        def upload_photo(photo, key):
+            uploads[key] = (type(photo), photo.read())
+            return f"https://bucket/{key}"
+
+        return upload_photo
+
+    def test_create_shop_with_two_photos_expect_uploaded_concurrently_from_memory(self):
+        # each upload waits for the other one, so the request completes only if they run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        uploads = []
+
+        def upload_photo(content, key):
+            uploads.append((content, key))
+            barrier.wait()
+            return f"https://bucket/{key}"
+
+        with patch.object(s3, "upload_photo", side_effect=upload_photo):
+            resp = self.client.post(self.URL, headers=self._headers, json=self.DATA)
+
+        self.assertEqual(201, resp.status_code)
+        self.assertEqual([decode_file(ENCODED_PICTURE)] * 2, [content for content, _ in uploads])
+        self.assertEqual(
+            {f"https://bucket/{key}" for _, key in uploads},
+            {resp.json["brand_logo_image_url"], resp.json["verifying_documents_image_url"]},
+        )
+
+    def test_create_shop_with_failed_upload_expect_other_photo_deleted_and_no_shop(self):
+        def upload_photo(content, key):
+            if key.endswith(".pdf"):
+                raise InternalServerError("S3 is not available at the moment")
+            return f"https://bucket/{key}"
+
+        with patch.object(s3, "upload_photo", side_effect=upload_photo), \
+                patch.object(s3, "delete_photo", return_value=None) as delete_photo:
+            resp = self.client.post(self.URL, headers=self._headers, json=self.DATA)
+
+        self.assertEqual(500, resp.status_code)
+        helpers.assert_count_equal(0, ShopModel)
+        self.assertEqual(1, delete_photo.call_count)
+        self.assertTrue(delete_photo.call_args[0][0].endswith(".png"))
+
+    def test_create_shop_with_multipart_files_expect_201_and_files_streamed_without_decoding(self):
+        photo = decode_file(ENCODED_PICTURE)
+        data = {key: value for key, value in self.DATA.items() if not key.endswith(("_photo", "_extension"))}
+        data["verifying_documents_photo"] = (io.BytesIO(photo), "documents.PDF")
+        data["brand_logo_photo"] = (io.BytesIO(photo), "logo.png")
+        uploads = {}
+
+        with patch.object(s3, "upload_photo", side_effect=self._upload_from_stream(uploads)):
+            resp = self.client.post(self.URL, headers=self._authorization_header, data=data,
+                                    content_type="multipart/form-data")
+
+        self.assertEqual(201, resp.status_code)
+        self.assertEqual({"pdf", "png"}, {key.split(".")[-1] for key in uploads})
+        self.assertFalse([photo_type for photo_type, _ in uploads.values() if photo_type is bytes])
+        self.assertEqual([photo, photo], [content for _, content in uploads.values()])
+        self.assertEqual(f"https://bucket/{resp.json['brand_logo_image_url'].split('/')[-1]}",
+                         resp.json["brand_logo_image_url"])
+
+    def test_create_shop_with_multipart_file_with_invalid_extension_expect_400(self):
+        data = {key: value for key, value in self.DATA.items() if not key.endswith(("_photo", "_extension"))}
+        data["verifying_documents_photo"] = (io.BytesIO(b"data"), "documents.exe")
+
+        resp = self.client.post(self.URL, headers=self._authorization_header, data=data,
+                                content_type="multipart/form-data")
+
+        self.assert400(resp)
+        self.assertIn("verifying_documents_extension", resp.json["message"])
+        helpers.assert_count_equal(0, ShopModel)
+
+    def test_create_product_with_multipart_expect_201_with_list_field_and_photo(self):
+        shops = [ShopFactory(active=False, holder_id=self._shop_owner.id) for _ in range(2)]
+        data = {
+            "name": "Test",
+            "quantity": "20",
+            "price": "10.5",
+            "category": ProductCategories.pets.name,
+            "listed": "false",
+            "shops_id": [str(shop.id) for shop in shops],
+            "product_photo": (io.BytesIO(b"photo"), "product.jpg"),
+        }
+        uploads = {}
+
+        with patch.object(s3, "upload_photo", side_effect=self._upload_from_stream(uploads)):
+            resp = self.client.post(Endpoints.PRODUCT, headers=self._authorization_header, data=data,
+                                    content_type="multipart/form-data")
+
+        self.assertEqual(201, resp.status_code)
+        self.assertEqual([b"photo"], [content for _, content in uploads.values()])
+        product = ProductModel.query.first()
+        self.assertEqual(10.5, product.price)
+        self.assertEqual({shop.id for shop in shops}, {shop.id for shop in product.in_shops})
@@ -0,0 +1,167 @@
+import requests
+from sqlalchemy import func
+
+from db import db
+from managers.photo_deletion_manager import photo_deletion_manager
+from managers.upload_manager import UploadManager
+from models import PendingUploadModel, ShopModel
+from services.s3 import s3
+from tests import helpers
+from tests.base_test_case import S3TestCase
+from tests.constants import Endpoints
+from tests.factories import OwnerFactory, ShopFactory, CustomerFactory
+from tests.helpers import generate_token
+
+
+class TestPresignedUploads(S3TestCase):
+    URL = Endpoints.UPLOADS
+    CONTENT = b"\x89PNG logo"
+
+    def setUp(self):
+        super().setUp()
+        self._shop = ShopFactory(holder_id=self._owner.id)
+        self._data = {"target": "shop", "target_id": self._shop.id, "image": "brand_logo", "extension": "png"}
+
+    def _issue(self, data=None, headers=None):
+        return self.client.post(self.URL, headers=headers or self._headers, json=data or self._data)
+
+    def _upload(self, upload, content=None):
+        return requests.post(upload["url"], data=upload["fields"],
+                             files={"file": ("logo.png", content or self.CONTENT)})
+
+    def _finalize(self, key, headers=None):
+        return self.client.put(Endpoints.FINALIZE_UPLOAD.format(key), headers=headers or self._headers)
+
+    def test_issue_upload_and_finalize_expect_object_attached_to_shop(self):
+        resp = self._issue()
+
+        self.assertEqual(201, resp.status_code)
+        upload = resp.json
+        self.assertTrue(upload["key"].endswith(".png"))
+        self.assertEqual("image/png", upload["fields"]["Content-Type"])
+        self.assertEqual(204, self._upload(upload).status_code)
+
+        resp = self._finalize(upload["key"])
+
+        self.assert200(resp)
+        self.assertEqual(s3.get_url(upload["key"]), resp.json["brand_logo_image_url"])
+        self.assertEqual(s3.get_url(upload["key"]), ShopModel.query.get(self._shop.id).brand_logo_image_url)
+        self.assertEqual(self.CONTENT, self._client.get_object(Bucket=s3.bucket, Key=upload["key"])["Body"].read())
+        helpers.assert_count_equal(0, PendingUploadModel)
+
+    def test_finalize_expect_previous_photo_deleted(self):
+        first = self._issue().json
+        self._upload(first)
+        self._finalize(first["key"])
+        second = self._issue().json
+        self._upload(second)
+
+        resp = self._finalize(second["key"])
+        photo_deletion_manager.drain()
+
+        self.assert200(resp)
+        self.assertEqual({second["key"]}, self._get_keys())
+
+    def test_issue_upload_for_foreign_shop_expect_403(self):
+        other_owner = OwnerFactory()
+        headers = self._HEADER_CONT_TYPE_JSON | {"Authorization": f"Bearer {generate_token(other_owner)}"}
+
+        resp = self._issue(headers=headers)
+
+        self.assert403(resp)
+        helpers.assert_count_equal(0, PendingUploadModel)
+
+    def test_issue_upload_with_invalid_image_or_extension_expect_400(self):
+        for data in (
+                self._data | {"image": "product"},
+                self._data | {"extension": "pdf"},
+                self._data | {"target": "order"},
+        ):
+            resp = self._issue(data)
+
+            self.assert400(resp)
+        helpers.assert_count_equal(0, PendingUploadModel)
+
+    def test_issue_upload_for_documents_expect_pdf_allowed(self):
+        resp = self._issue(self._data | {"image": "verifying_documents", "extension": "pdf"})
+
+        self.assertEqual(201, resp.status_code)
+        self.assertEqual("application/pdf", resp.json["fields"]["Content-Type"])
+
+    def test_finalize_not_uploaded_expect_400_and_upload_kept(self):
+        upload = self._issue().json
+
+        resp = self._finalize(upload["key"])
+
+        self.assert400(resp)
+        self.assertEqual(UploadManager.NOT_UPLOADED_MESSAGE, resp.json["message"])
+        helpers.assert_count_equal(1, PendingUploadModel)
+
+    def test_finalize_object_with_other_content_type_expect_400(self):
+        upload = self._issue().json
+        self._client.put_object(Bucket=s3.bucket, Key=upload["key"], Body=b"<html>", ContentType="text/html")
+
+        resp = self._finalize(upload["key"])
+
+        self.assert400(resp)
+        self.assertEqual(UploadManager.INVALID_UPLOAD_MESSAGE, resp.json["message"])
+        self.assertIsNone(ShopModel.query.get(self._shop.id).brand_logo_image_url)
+
+    def test_finalize_by_other_user_or_unknown_key_expect_404(self):
+        upload = self._issue().json
+        self._upload(upload)
+        customer_headers = {"Authorization": f"Bearer {generate_token(CustomerFactory())}"}
+
+        self.assert404(self._finalize(upload["key"], headers=customer_headers))
+        self.assert404(self._finalize("unknown.png"))
+        helpers.assert_count_equal(1, PendingUploadModel)
+
+    def test_finalize_expired_upload_expect_404(self):
+        upload = self._issue().json
+        self._upload(upload)
+        PendingUploadModel.query.update({"expires_on": func.now()})
+        db.session.commit()
+
+        self.assert404(self._finalize(upload["key"]))
+
+    def test_collect_garbage_expect_only_expired_uploads_and_objects_deleted(self):
+        expired, pending = self._issue().json, self._issue().json
+        self._upload(expired)
+        self._upload(pending)
+        PendingUploadModel.query.filter_by(key=expired["key"]).update({"expires_on": func.now()})
+        db.session.commit()
+
+        self.assertEqual(1, UploadManager.collect_garbage(force=True))
+        db.session.commit()
+        photo_deletion_manager.drain()
+
+        self.assertEqual({pending["key"]}, self._get_keys())
+        self.assertEqual([pending["key"]], [upload.key for upload in PendingUploadModel.query.all()])
+
+    def test_periodic_drain_expect_expired_uploads_and_objects_deleted(self):
+        expired = self._issue().json
+        self._upload(expired)
+        PendingUploadModel.query.update({"expires_on": func.now()})
+        db.session.commit()
+        UploadManager.clear()
+
+        photo_deletion_manager._drain_periodically(self.app)
+        photo_deletion_manager.wait()
+        photo_deletion_manager._timer.cancel()
+        photo_deletion_manager._timer = None
+
+        self.assertEqual(set(), self._get_keys())
+        helpers.assert_count_equal(0, PendingUploadModel)
+
+    def test_issue_upload_expect_garbage_collected_at_most_once_per_interval(self):
+        expired = self._issue().json
+        PendingUploadModel.query.update({"expires_on": func.now()})
+        db.session.commit()
+
+        self._issue()
+
+        helpers.assert_count_equal(2, PendingUploadModel)
+        UploadManager.clear()
+        self._issue()
+        self.assertNotIn(expired["key"], [upload.key for upload in PendingUploadModel.query.all()])
+        helpers.assert_count_equal(2, PendingUploadModel)
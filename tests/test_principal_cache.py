@@ -0,0 +1,98 @@
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
+
+from db import db
+from models import UserRoles, CustomerModel
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import OwnerFactory, CustomerFactory, AdminFactory, SuperAdminFactory
+from tests.helpers import generate_token, capture_queries
+from utils.principal_cache import PrincipalCache, Principal, principal_cache
+
+
+class TestPrincipalCache(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.customer = CustomerFactory()
+        self.authorization_headers = {"Authorization": f"Bearer {generate_token(self.customer)}"}
+
+    def test_authenticated_requests_expect_user_selected_only_once(self):
+        with capture_queries() as statements:
+            for _ in range(3):
+                resp = self.client.get(Endpoints.DELIVERY_ADDRESS_DETAILS, headers=self.authorization_headers)
+                self.assertEqual(200, resp.status_code)
+
+        self.assertEqual(1, len([statement for statement in statements if "\nFROM customer \n" in statement]))
+        self.assertEqual({"hits": 2, "misses": 1, "size": 1}, principal_cache.get_stats())
+
+    def test_stateless_endpoints_expect_principal_from_claims_without_user_query(self):
+        shop_owner = OwnerFactory()
+        headers = {"Authorization": f"Bearer {generate_token(shop_owner)}"}
+        with capture_queries() as statements:
+            for url in (Endpoints.PRODUCT, Endpoints.SHOPS, Endpoints.SEARCH_PRODUCT + "?q=test"):
+                resp = self.client.get(url, headers=headers)
+                self.assertEqual(200, resp.status_code)
+
+        self.assertFalse([statement for statement in statements if "\nFROM shop_owner" in statement])
+        self.assertEqual({"hits": 0, "misses": 0, "size": 0}, principal_cache.get_stats())
+
+    def test_stateless_endpoints_with_invalid_role_claim_expect_401(self):
+        token = generate_token(SimpleNamespace(id=self.customer.id, role=SimpleNamespace(name="unknown")))
+
+        resp = self.client.get(Endpoints.PRODUCT, headers={"Authorization": f"Bearer {token}"})
+
+        self.assertEqual(401, resp.status_code)
+
+    def test_get_metrics_with_admin_expect_200_and_principal_cache_stats(self):
+        headers = {"Authorization": f"Bearer {generate_token(AdminFactory())}"}
+        self.client.get(Endpoints.DELIVERY_ADDRESS_DETAILS, headers=self.authorization_headers)
+
+        resp = self.client.get(Endpoints.METRICS, headers=headers)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual({"hits": 0, "misses": 2, "size": 2}, resp.json["principal_cache"])
+
+        resp = self.client.get(Endpoints.METRICS, headers=self.authorization_headers)
+        self.assertEqual(403, resp.status_code)
+
+    def test_register_admin_expect_principal_of_promoted_user_invalidated(self):
+        customer = self.customer
+        self.client.get(Endpoints.DELIVERY_ADDRESS_DETAILS, headers=self.authorization_headers)
+        self.assertEqual(1, principal_cache.get_stats()["size"])
+
+        headers = {"Authorization": f"Bearer {generate_token(SuperAdminFactory())}"}
+        resp = self.client.post(
+            Endpoints.REGISTER_ADMIN[0],
+            headers=headers | self._HEADER_CONT_TYPE_JSON,
+            json={"role": customer.role.name, "id": customer.id})
+
+        self.assertEqual(200, resp.status_code)
+        # only the principal of the super admin is left
+        self.assertEqual(1, principal_cache.get_stats()["size"])
+
+    def test_principal_expect_immutable_snapshot_with_user_and_details_loaded_on_demand(self):
+        customer = self.customer
+        principal = Principal.from_claims(customer.id, customer.role.name)
+
+        self.assertEqual((customer.id, UserRoles.customer), (principal.id, principal.role))
+        self.assertEqual(customer.username, principal.user.username)
+        self.assertIsNone(principal.details)
+        with self.assertRaises(FrozenInstanceError):
+            principal.id = 1
+
+        customer.details = CustomerModel.details.property.mapper.class_(first_name="Test", last_name="Testov")
+        db.session.commit()
+        self.assertEqual("Test", principal.details.first_name)
+
+    def test_cache_expect_expired_and_least_recently_used_principals_evicted(self):
+        users = [SimpleNamespace(id=i, role=UserRoles.customer) for i in range(3)]
+
+        cache = PrincipalCache(max_size=2, ttl=60)
+        [cache.get("customer", user.id, lambda: user) for user in users[:2]]
+        cache.get("customer", 0, lambda: None)
+        cache.get("customer", 2, lambda: users[2])
+        self.assertEqual({"hits": 1, "misses": 3, "size": 2}, cache.get_stats())
+        self.assertIsNone(cache.get("customer", 1, lambda: None))
+
+        cache = PrincipalCache(ttl=0)
+        [cache.get("customer", 0, lambda: users[0]) for _ in range(2)]
+        self.assertEqual({"hits": 0, "misses": 2, "size": 1}, cache.get_stats())
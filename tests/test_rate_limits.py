@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from constants.rate_limits import LOGIN_IDENTIFIER_RATE_LIMIT, LOGIN_IP_RATE_LIMIT, REGISTER_IP_RATE_LIMIT
+from managers.rate_limit_manager import MemoryRateLimitBackend, DatabaseRateLimitBackend
+from models import RateLimitBucketModel
+from resources.helpers.access_validators import ValidateRateLimit
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.helpers import capture_queries
+from utils.password_hasher import password_hasher
+
+
+class TestRateLimits(BaseTestCase):
+    LOGIN_URL = Endpoints.LOGIN[0]
+    REGISTER_URL = Endpoints.REGISTER_USER[0]
+
+    def _login(self, identifier, remote_addr="127.0.0.1"):
+        credentials = {"identifier": identifier, "password": "some_password", "role": "customer"}
+        return self.client.post(self.LOGIN_URL, headers=self._HEADER_CONT_TYPE_JSON, json=credentials,
+                                environ_base={"REMOTE_ADDR": remote_addr})
+
+    def test_login_above_identifier_limit_expect_429_before_queries_and_hashing(self):
+        capacity, period = LOGIN_IDENTIFIER_RATE_LIMIT
+        for index in range(capacity):
+            self.assert400(self._login("Guessed", f"10.0.0.{index}"))
+
+        with capture_queries() as statements, patch.object(password_hasher, "check") as check:
+            resp = self._login("guessed", "10.0.1.1")
+
+        self.assertEqual(429, resp.status_code)
+        self.assertEqual(ValidateRateLimit.ERROR_MESSAGE, resp.json["message"])
+        self.assertEqual(str(period // capacity), resp.headers["Retry-After"])
+        check.assert_not_called()
+        self.assertFalse([statement for statement in statements if "\nFROM customer" in statement])
+        self.assert400(self._login("other", "10.0.1.1"))
+
+    def test_login_above_ip_limit_expect_429_for_any_identifier(self):
+        capacity, _ = LOGIN_IP_RATE_LIMIT
+        for index in range(capacity):
+            self.assert400(self._login(f"user{index}"))
+
+        self.assertEqual(429, self._login("new_user").status_code)
+        self.assert400(self._login("new_user", "10.0.0.1"))
+
+    def test_login_with_long_identifier_expect_400(self):
+        self.assert400(self._login("a" * 1000))
+
+    def test_login_with_body_which_is_not_object_expect_400(self):
+        for body in ("identifier", ["identifier"]):
+            resp = self.client.post(self.LOGIN_URL, headers=self._HEADER_CONT_TYPE_JSON, json=body)
+
+            self.assert400(resp)
+
+    def test_register_above_ip_limit_expect_429(self):
+        capacity, _ = REGISTER_IP_RATE_LIMIT
+        for _ in range(capacity):
+            self.assert400(self.client.post(self.REGISTER_URL, headers=self._HEADER_CONT_TYPE_JSON, json={}))
+
+        resp = self.client.post(self.REGISTER_URL, headers=self._HEADER_CONT_TYPE_JSON, json={})
+
+        self.assertEqual(429, resp.status_code)
+
+
+class TestRateLimitBackends(BaseTestCase):
+    def test_backends_expect_capacity_consumed_then_retry_after_until_refilled(self):
+        for backend in (MemoryRateLimitBackend(), DatabaseRateLimitBackend()):
+            self.assertEqual([0, 0], [backend.consume("key", 2, 10) for _ in range(2)])
+
+            retry_after = backend.consume("key", 2, 10)
+
+            self.assertGreater(retry_after, 4)
+            self.assertLessEqual(retry_after, 5)
+            self.assertEqual(0, backend.consume("other", 2, 10))
+
+    def test_database_backend_expect_expired_buckets_pruned(self):
+        backend = DatabaseRateLimitBackend()
+        backend.consume("expired", 1, 0.001)
+        backend.clear()
+
+        backend.consume("key", 1, 10)
+
+        self.assertEqual(["key"], [bucket.key for bucket in RateLimitBucketModel.query.all()])
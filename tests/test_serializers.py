@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from marshmallow import Schema, fields, post_dump
+from marshmallow_enum import EnumField
+
+from db import db
+from models import ProductCategories
+from schemas.response.details_schemas_out import DeliveryAddressDetailsSchemaOut, ShopOwnerDetailsSchemaOut
+from schemas.response.product_schema_out import ProductSchemaOut
+from schemas.response.shop_schemas_out import ShopExtendedSchemaOut, ShopShortSchemaOut
+from tests.base_test_case import BaseTestCase
+from tests.factories import OwnerFactory, ShopFactory, ProductFactory
+from utils.serializers import get_serializer
+
+
+class TestSerializers(BaseTestCase):
+    def _assert_parity(self, schema_cls, obj):
+        self.assertEqual(schema_cls().dump(obj), get_serializer(schema_cls).dump(obj))
+
+    def test_get_serializer_expect_compiled_once_per_schema(self):
+        self.assertIs(get_serializer(ProductSchemaOut), get_serializer(ProductSchemaOut))
+        self.assertIsNot(get_serializer(ShopShortSchemaOut), get_serializer(ShopExtendedSchemaOut))
+
+    def test_dump_models_expect_same_output_as_schema(self):
+        owner = OwnerFactory()
+        shops = [ShopFactory(holder_id=owner.id, active=bool(i % 2)) for i in range(2)]
+        product = ProductFactory(holder_id=owner.id, listed=True)
+        not_listed_product = ProductFactory(holder_id=owner.id, listed=False)
+        product.description = "Description"
+        [shop.products.append(product) for shop in shops]
+        db.session.commit()
+
+        for schema_cls in (ShopShortSchemaOut, ShopExtendedSchemaOut):
+            [self._assert_parity(schema_cls, shop) for shop in shops]
+        self._assert_parity(ProductSchemaOut, product)
+        self._assert_parity(ProductSchemaOut, not_listed_product)
+
+    def test_dump_objects_with_none_and_missing_values_expect_same_output_as_schema(self):
+        product = SimpleNamespace(id="1", name=None, price=3, category=ProductCategories.books, in_shops=[])
+        self._assert_parity(ProductSchemaOut, product)
+        self._assert_parity(ShopOwnerDetailsSchemaOut, SimpleNamespace(id=1, verified=0, age=None))
+        self._assert_parity(DeliveryAddressDetailsSchemaOut, SimpleNamespace())
+
+    def test_dump_with_not_compiled_fields_and_hooks_expect_same_output_as_schema(self):
+        class CustomSchemaOut(Schema):
+            id = fields.Integer(as_string=True)
+            category = EnumField(ProductCategories, by_value=True)
+            name = fields.Str(data_key="title", attribute="full_name")
+            registered_on = fields.DateTime()
+
+        class HookSchemaOut(CustomSchemaOut):
+            @post_dump
+            def add_type(self, data, **kwargs):
+                return data | {"type": "custom"}
+
+        obj = SimpleNamespace(id=5, category=ProductCategories.pets, full_name="Name", registered_on=None)
+        self._assert_parity(CustomSchemaOut, obj)
+        self._assert_parity(HookSchemaOut, obj)
+
+    def test_dump_dicts_and_dotted_attributes_expect_same_output_as_schema(self):
+        class DottedSchemaOut(Schema):
+            id = fields.Integer()
+            owner_name = fields.Str(attribute="owner.name")
+            shop_ids = fields.List(fields.Integer(), attribute="shops.ids")
+
+        owner = SimpleNamespace(name="Owner")
+        self._assert_parity(DottedSchemaOut, SimpleNamespace(id=1, owner=owner, shops={"ids": [1, 2]}))
+        self._assert_parity(DottedSchemaOut, SimpleNamespace(id=1, owner=None, shops={}))
+        self._assert_parity(DottedSchemaOut, {"id": 2, "owner": {"name": "Owner"}, "shops": {"ids": [3]}})
+        self._assert_parity(ProductSchemaOut, {"id": 3, "name": "Product", "price": 5, "in_shops": [{"id": 1}]})
+        self.assertEqual("Owner", get_serializer(DottedSchemaOut).dump({"owner": {"name": "Owner"}})["owner_name"])
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+from constants.pagination import NEXT_CURSOR_HEADER
 from db import db
 from managers.shop_manager import ShopManager
 from models import ShopModel
@@ -178,8 +179,30 @@ class TestShop(BaseTestCase):
 
         url = self.URL + f"?holder=pesho&name={item.name}"
         resp = self.client.get(url, headers=self._AUTHORIZATION_HEADER)
+        self.assertEqual(400, resp.status_code)
+        self.assertIn("Unknown field.", resp.json["message"]["holder"])
+
+        url = self.URL + f"?holder_id=pesho"
+        resp = self.client.get(url, headers=self._AUTHORIZATION_HEADER)
+        self.assertEqual(400, resp.status_code)
+        self.assertIn("Not a valid integer.", resp.json["message"]["holder_id"])
+
+    def test_get_shops_with_url_encoded_query_params_and_sort_expect_200_and_sorted_filtered_list(self):
+        [self._create_in_db(ShopModel, self._get_create_data(True) | {"city": "Stara Zagora"}, self._shop_owner.id)
+         for _ in range(3)]
+        [self._create_in_db(ShopModel, self._get_create_data(True), self._shop_owner.id) for _ in range(2)]
+
+        resp = self.client.get(self.URL + "?city=Stara%20Zagora&sort=-name", headers=self._AUTHORIZATION_HEADER)
+
         self.assertEqual(200, resp.status_code)
-        self.assertEqual(0, len(resp.json))
+        self.assertEqual(3, len(resp.json))
+        names = [item["name"] for item in resp.json]
+        self.assertEqual(sorted(names, reverse=True), names)
+
+    def test_get_shops_with_not_allowed_sort_expect_400(self):
+        resp = self.client.get(self.URL + "?sort=bulstat", headers=self._AUTHORIZATION_HEADER)
+
+        self.assertEqual(400, resp.status_code)
 
     def test_get_single_shop_holder_user_expect_200_and_correct_json(self):
         [self._create_in_db(ShopModel, self._get_create_data(True), self._shop_owner.id) for _ in range(4)]
@@ -277,6 +300,36 @@ class TestShop(BaseTestCase):
         self.assertEqual(200, resp.status_code)
         self.assertEqual(13, len(resp.json))
 
+    def test_get_with_holder_and_inactive_shops_expect_200_single_query_and_ordered_list(self):
+        own_shops = [self._create_in_db(ShopModel, self._get_create_data(active=False), self._shop_owner.id)
+                     for _ in range(2)]
+        second_shop_owner = OwnerFactory()
+        [self._create_in_db(ShopModel, self._get_create_data(active=False), second_shop_owner.id) for _ in range(2)]
+        foreign_shops = [self._create_in_db(ShopModel, self._get_create_data(active=True), second_shop_owner.id)
+                         for _ in range(2)]
+
+        with helpers.capture_queries() as statements:
+            resp = self.client.get(self.URL, headers=self._AUTHORIZATION_HEADER)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, len([statement for statement in statements if "\nFROM shop \n" in statement]))
+        self.assertEqual([shop.id for shop in own_shops + foreign_shops], [item["id"] for item in resp.json])
+
+    def test_get_shops_with_limit_and_cursor_expect_200_and_consecutive_pages(self):
+        shops = [self._create_in_db(ShopModel, self._get_create_data(True), self._shop_owner.id) for _ in range(5)]
+
+        resp = self.client.get(self.URL + "?limit=3")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([shop.id for shop in shops[:3]], [item["id"] for item in resp.json])
+        cursor = resp.headers[NEXT_CURSOR_HEADER]
+
+        resp = self.client.get(self.URL + f"?limit=3&cursor={cursor}")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([shop.id for shop in shops[3:]], [item["id"] for item in resp.json])
+        self.assertNotIn(NEXT_CURSOR_HEADER, resp.headers)
+
     @patch.object(s3, "upload_photo", return_value="some.s3.url")
     def test_edit_not_verified_with_name_and_bulstat_expect_status_200_db_updated_correct_json(self, mocked_s3):
         shop = self._create_in_db(ShopModel, self._get_create_data(active=False), self._shop_owner.id)
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+from db import db
+from managers.auth_manager import AuthManager
+from managers.token_revocation_manager import token_revocation_manager
+from models import RevokedTokenModel
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import CustomerFactory
+from tests.helpers import capture_queries
+from utils.bloom_filter import BloomFilter
+
+
+class TestRefreshTokens(BaseTestCase):
+    REFRESH_URL = Endpoints.REFRESH_TOKEN[0]
+    LOGOUT_URL = Endpoints.LOGOUT[0]
+
+    def setUp(self):
+        super().setUp()
+        self.customer = CustomerFactory()
+        self.tokens = AuthManager.issue_tokens(self.customer)
+
+    def test_refresh_with_valid_refresh_token_expect_200_and_new_tokens_of_same_user(self):
+        resp = self._refresh(self.tokens["refresh_token"])
+
+        self.assert200(resp)
+        self.assertNotEqual(self.tokens["refresh_token"], resp.json["refresh_token"])
+        self.assertEqual({"id": self.customer.id, "role": "customer"}, AuthManager.decode_token(resp.json["token"]))
+
+    def test_refresh_with_access_token_expect_401(self):
+        resp = self._refresh(self.tokens["token"])
+
+        self.assert401(resp)
+        self.assertEqual(AuthManager.INVALID_TOKEN_MESSAGE, resp.json["message"])
+
+    def test_authenticate_with_refresh_token_expect_401(self):
+        resp = self.client.post(self.LOGOUT_URL, headers={"Authorization": f"Bearer {self.tokens['refresh_token']}"})
+
+        self.assert401(resp)
+
+    def test_refresh_token_reused_expect_401_and_whole_session_revoked(self):
+        rotated = self._refresh(self.tokens["refresh_token"]).json
+
+        resp = self._refresh(self.tokens["refresh_token"])
+
+        self.assert401(resp)
+        self.assertEqual(AuthManager.TOKEN_REVOKED_MESSAGE, resp.json["message"])
+        self.assert401(self._refresh(rotated["refresh_token"]))
+        self.assert401(self._logout(rotated["token"]))
+
+    def test_logout_expect_204_and_tokens_of_session_revoked_but_not_other_sessions(self):
+        other_session = AuthManager.issue_tokens(self.customer)
+
+        resp = self._logout(self.tokens["token"])
+
+        self.assertEqual(204, resp.status_code)
+        self.assert401(self._logout(self.tokens["token"]))
+        self.assert401(self._refresh(self.tokens["refresh_token"]))
+        self.assertEqual(204, self._logout(other_session["token"]).status_code)
+
+    def test_revocation_check_of_not_revoked_token_expect_no_query(self):
+        AuthManager.revoke_session(AuthManager.encode_token(self.customer))
+        token_revocation_manager.is_revoked()
+
+        with capture_queries() as statements:
+            AuthManager.decode_token(self.tokens["token"])
+
+        self.assertEqual([], statements)
+
+    def test_revocation_by_other_process_expect_synced_from_db(self):
+        db.session.add(RevokedTokenModel(jti="a" * 32, expires_on=datetime.utcnow() + timedelta(hours=1)))
+        db.session.add(RevokedTokenModel(jti="b" * 32, expires_on=datetime.utcnow() - timedelta(hours=1)))
+        db.session.flush()
+        token_revocation_manager.clear()
+
+        self.assertTrue(token_revocation_manager.is_revoked("a" * 32))
+        self.assertFalse(token_revocation_manager.is_revoked("b" * 32))
+
+    def _refresh(self, refresh_token):
+        return self.client.post(self.REFRESH_URL, headers=self._HEADER_CONT_TYPE_JSON,
+                                json={"refresh_token": refresh_token})
+
+    def _logout(self, token):
+        return self.client.post(self.LOGOUT_URL, headers={"Authorization": f"Bearer {token}"})
+
+
+class TestBloomFilter(BaseTestCase):
+    def test_added_keys_expect_always_contained_and_few_false_positives(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [f"key{index}" for index in range(1000)]
+        [bloom.add(key) for key in keys]
+
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = len([index for index in range(10000) if f"other{index}" in bloom])
+        self.assertLess(false_positives, 300)
+        self.assertEqual(1000, len(bloom))
@@ -0,0 +1,64 @@
+from db import db
+from managers.availability_manager import availability_manager
+from models import ShopOwnerModel
+from schemas.request.authentication_schemas_in import AvailabilitySchemaIn
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import CustomerFactory
+from tests.helpers import capture_queries
+
+
+class TestUserAvailability(BaseTestCase):
+    URL = Endpoints.USER_AVAILABILITY[0]
+
+    def setUp(self):
+        super().setUp()
+        self.customer = CustomerFactory(username="taken", email="taken@test.com")
+        availability_manager.load()
+
+    def test_free_username_and_email_expect_available_without_query(self):
+        with capture_queries() as statements:
+            resp = self.client.get(self.URL, query_string={"username": "free", "email": "free@test.com"})
+
+        self.assert200(resp)
+        self.assertEqual({"username": True, "email": True}, resp.json)
+        self.assertEqual([], statements)
+
+    def test_taken_username_and_email_in_other_case_expect_not_available(self):
+        resp = self.client.get(self.URL, query_string={"username": "TAKEN", "email": "Taken@Test.com"})
+
+        self.assert200(resp)
+        self.assertEqual({"username": False, "email": False}, resp.json)
+
+    def test_user_registered_after_filter_is_loaded_expect_not_available(self):
+        data = {"username": "newuser", "email": "new@test.com", "password": "testP@ss1!", "role": "owner"}
+        self.client.post(Endpoints.REGISTER_USER[0], headers=self._HEADER_CONT_TYPE_JSON, json=data)
+
+        resp = self.client.get(self.URL, query_string={"username": "newuser"})
+
+        self.assertEqual({"username": False}, resp.json)
+
+    def test_user_registered_by_other_process_expect_not_available_after_sync(self):
+        db.session.add(ShopOwnerModel(username="other", email="other@test.com", password="password"))
+        db.session.commit()
+        availability_manager._next_sync = 0
+
+        resp = self.client.get(self.URL, query_string={"username": "other"})
+
+        self.assertEqual({"username": False}, resp.json)
+
+    def test_before_filter_loaded_expect_availability_from_db_without_loading_users(self):
+        availability_manager.clear()
+
+        with capture_queries() as statements:
+            resp = self.client.get(self.URL, query_string={"username": "taken", "email": "free@test.com"})
+
+        self.assertEqual({"username": False, "email": True}, resp.json)
+        self.assertEqual(2, len(statements))
+        self.assertFalse([statement for statement in statements if "registered_on" in statement])
+
+    def test_without_username_and_email_expect_400(self):
+        resp = self.client.get(self.URL)
+
+        self.assert400(resp)
+        self.assertIn(AvailabilitySchemaIn.NO_FIELDS_ERROR, resp.json["message"]["_schema"])
@@ -1,8 +1,12 @@
+from constants.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
 from db import db
+from models import ProductCategories
+from schemas.request.product_schemas_in import ProductFilterSchemaIn
+from schemas.request.shop_schema_in import ShopFilterSchemaIn
 from tests.base_test_case import BaseTestCase
 from tests.constants import Endpoints
 from tests.factories import OwnerFactory, ShopFactory, ProductFactory, CustomerFactory, AdminFactory
-from tests.helpers import generate_token
+from tests.helpers import generate_token, capture_queries
 
 
 class TessGetListProducts(BaseTestCase):
@@ -144,3 +148,155 @@ class TessGetListProducts(BaseTestCase):
 
         self.assertEqual(200, resp.status_code)
         self.assertEqual(5, len(resp.json))
+
+    def test_with_limit_expect_200_first_page_and_next_cursor_header(self):
+        resp = self.client.get(self.URL + "?limit=2")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, len(resp.json))
+        self.assertEqual([product.id for product in self.products[:2]], [item["id"] for item in resp.json])
+        self.assertIn(NEXT_CURSOR_HEADER, resp.headers)
+
+    def test_with_next_cursor_expect_200_last_page_and_no_next_cursor_header(self):
+        resp = self.client.get(self.URL + "?limit=2")
+        cursor = resp.headers[NEXT_CURSOR_HEADER]
+
+        resp = self.client.get(self.URL + f"?limit=2&cursor={cursor}")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([self.products[2].id], [item["id"] for item in resp.json])
+        self.assertNotIn(NEXT_CURSOR_HEADER, resp.headers)
+
+    def test_with_cursor_and_not_listed_products_user_holder_expect_all_pages_without_duplicates(self):
+        [ProductFactory(holder_id=self.shop_owner.id, listed=False) for _ in range(4)]
+        second_shop_owner = OwnerFactory()
+        [ProductFactory(holder_id=second_shop_owner.id, listed=False) for _ in range(2)]
+
+        ids = []
+        url = self.URL + "?limit=3"
+        while url:
+            resp = self.client.get(url, headers=self.authorization_headers)
+            self.assertEqual(200, resp.status_code)
+            ids += [item["id"] for item in resp.json]
+            cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+            url = self.URL + f"?limit=3&cursor={cursor}" if cursor else None
+
+        self.assertEqual(7, len(ids))
+        self.assertEqual(sorted(ids), ids)
+
+    def test_with_limit_above_max_page_size_expect_200_and_max_page_size_items(self):
+        [ProductFactory(holder_id=self.shop_owner.id, listed=True) for _ in range(MAX_PAGE_SIZE)]
+
+        resp = self.client.get(self.URL + f"?limit={MAX_PAGE_SIZE + 50}")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(MAX_PAGE_SIZE, len(resp.json))
+        self.assertIn(NEXT_CURSOR_HEADER, resp.headers)
+
+    def test_with_invalid_cursor_or_limit_expect_400(self):
+        for query in ("?cursor=invalid", "?limit=0", "?limit=ten"):
+            resp = self.client.get(self.URL + query)
+
+            self.assertEqual(400, resp.status_code)
+
+    def test_with_own_not_listed_and_foreign_products_user_holder_expect_single_query_and_ordered_json(self):
+        second_shop_owner = OwnerFactory()
+        foreign_products = [ProductFactory(holder_id=second_shop_owner.id, listed=True) for _ in range(2)]
+        [ProductFactory(holder_id=second_shop_owner.id, listed=False) for _ in range(2)]
+        own_products = [ProductFactory(holder_id=self.shop_owner.id, listed=False) for _ in range(2)]
+
+        with capture_queries() as statements:
+            resp = self.client.get(
+                self.URL,
+                headers=self.authorization_headers)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, len([statement for statement in statements if "\nFROM product \n" in statement]))
+        expected_ids = [product.id for product in self.products + foreign_products + own_products]
+        self.assertEqual(expected_ids, [item["id"] for item in resp.json])
+
+    def test_with_products_in_shops_expect_200_and_constant_number_of_queries(self):
+        [shop.products.append(product) for shop in self.shops for product in self.products]
+        db.session.commit()
+
+        with capture_queries() as statements:
+            resp = self.client.get(self.URL)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(len(self.shops), len(resp.json[0]["in_shops"]))
+
+        [self.shops[0].products.append(ProductFactory(holder_id=self.shop_owner.id, listed=True)) for _ in range(5)]
+        db.session.commit()
+
+        with capture_queries() as more_products_statements:
+            resp = self.client.get(self.URL)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(8, len(resp.json))
+        self.assertEqual(len(statements), len(more_products_statements))
+
+    def test_with_typed_filters_expect_200_and_filtered_json(self):
+        second_shop_owner = OwnerFactory()
+        cheap_book = ProductFactory(holder_id=second_shop_owner.id, listed=True)
+        expensive_game = ProductFactory(holder_id=second_shop_owner.id, listed=True)
+        cheap_book.category, cheap_book.price = ProductCategories.books, 10
+        expensive_game.category, expensive_game.price = ProductCategories.games, 500
+        db.session.commit()
+
+        resp = self.client.get(self.URL + "?category=books,games")
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([cheap_book.id, expensive_game.id], [item["id"] for item in resp.json])
+
+        resp = self.client.get(self.URL + "?category=books,games&price_min=5&price_max=100")
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([cheap_book.id], [item["id"] for item in resp.json])
+
+        resp = self.client.get(self.URL + f"?holder_id={second_shop_owner.id}&sort=-price")
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([expensive_game.id, cheap_book.id], [item["id"] for item in resp.json])
+
+    def test_with_sort_by_price_and_cursor_expect_200_and_all_pages_sorted(self):
+        prices = [item["price"] for item in self.client.get(self.URL + "?sort=price").json]
+        resp = self.client.get(self.URL + "?sort=price&limit=2")
+        cursor = resp.headers[NEXT_CURSOR_HEADER]
+        next_page = self.client.get(self.URL + f"?sort=price&limit=2&cursor={cursor}")
+
+        self.assertEqual(200, next_page.status_code)
+        self.assertEqual(sorted(prices), [item["price"] for item in resp.json + next_page.json])
+
+        resp = self.client.get(self.URL + f"?sort=-price&cursor={cursor}")
+        self.assertEqual(400, resp.status_code)
+
+    def test_with_invalid_or_unknown_filters_expect_400_and_correct_json(self):
+        resp = self.client.get(self.URL + "?category=books,unknown&price_min=cheap&color=red")
+
+        self.assertEqual(400, resp.status_code)
+        self.assertIn("Invalid category", resp.json["message"]["category"]["1"])
+        self.assertIn("Not a valid number.", resp.json["message"]["price_min"])
+        self.assertIn("Unknown field.", resp.json["message"]["color"])
+
+    def test_filters_and_sort_fields_are_backed_by_indexes(self):
+        for schema in (ProductFilterSchemaIn, ShopFilterSchemaIn):
+            for attribute_name, _ in schema.FILTERS.values():
+                self.assertTrue(schema.is_indexed(getattr(schema.MODEL, attribute_name)), attribute_name)
+            for field_name in schema.SORT_FIELDS:
+                self.assertTrue(schema.is_indexed(getattr(schema.MODEL, field_name)), field_name)
+
+    def test_stream_with_admin_expect_200_and_all_products_in_single_streamed_array(self):
+        [ProductFactory(holder_id=self.shop_owner.id, listed=bool(i % 2)) for i in range(MAX_PAGE_SIZE + 1)]
+        headers = self._create_authorization_header(AdminFactory)
+
+        resp = self.client.get(self.URL + "?stream=true&sort=-price&limit=2", headers=headers)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertTrue(resp.is_streamed)
+        self.assertNotIn(NEXT_CURSOR_HEADER, resp.headers)
+        self.assertEqual(len(self.products) + MAX_PAGE_SIZE + 1, len(resp.json))
+        prices = [item["price"] for item in resp.json]
+        self.assertEqual(sorted(prices, reverse=True), prices)
+        first_page = self.client.get(self.URL + "?sort=-price&limit=2", headers=headers)
+        self.assertEqual(first_page.json, resp.json[:2])
+
+    def test_stream_with_not_admin_expect_403(self):
+        for headers in ({}, self.authorization_headers, self._create_authorization_header(CustomerFactory)):
+            resp = self.client.get(self.URL + "?stream=1", headers=headers)
+
+            self.assertEqual(403, resp.status_code)
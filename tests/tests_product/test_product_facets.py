@@ -0,0 +1,87 @@
+from db import db
+from managers.product_manager import ProductManager
+from models import ProductCategories, ProductModel, ShopModel
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import OwnerFactory, ShopFactory, ProductFactory
+from tests.helpers import capture_queries
+
+
+class TestProductFacets(BaseTestCase):
+    URL = Endpoints.PRODUCT_FACETS
+
+    def setUp(self):
+        super().setUp()
+        ProductManager._FACETS_CACHE.clear()
+        self.shop_owner = OwnerFactory()
+        self.shops = [ShopFactory(active=True, holder_id=self.shop_owner.id) for _ in range(2)]
+        data = [
+            (ProductCategories.books, 5, True, self.shops),
+            (ProductCategories.books, 30, True, self.shops[:1]),
+            (ProductCategories.pets, 600, True, []),
+            (ProductCategories.pets, 5, False, self.shops),
+        ]
+        self.products = []
+        for category, price, listed, shops in data:
+            product = ProductFactory(holder_id=self.shop_owner.id, listed=listed)
+            product.category, product.price = category, price
+            [shop.products.append(product) for shop in shops]
+            self.products.append(product)
+        db.session.commit()
+
+    def test_get_facets_expect_200_and_category_counts_of_listed_products(self):
+        resp = self.client.get(self.URL)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(["category"], list(resp.json))
+        self.assertEqual(len(ProductCategories), len(resp.json["category"]))
+        self.assertEqual(2, resp.json["category"]["books"])
+        self.assertEqual(1, resp.json["category"]["pets"])
+        self.assertEqual(0, resp.json["category"]["games"])
+
+    def test_get_all_facets_expect_200_counts_from_single_query(self):
+        with capture_queries() as statements:
+            resp = self.client.get(self.URL + "?by=category,shop,price")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, len([statement for statement in statements if "GROUP BY" in statement]))
+        self.assertEqual(2, resp.json["category"]["books"])
+        self.assertEqual(1, resp.json["category"]["pets"])
+        self.assertEqual({str(self.shops[0].id): 2, str(self.shops[1].id): 1}, resp.json["shop"])
+        self.assertEqual(1, resp.json["price"]["0-10"])
+        self.assertEqual(1, resp.json["price"]["25-50"])
+        self.assertEqual(1, resp.json["price"]["500+"])
+        self.assertEqual(0, resp.json["price"]["10-25"])
+
+    def test_get_facets_twice_expect_cached_until_products_change(self):
+        self.client.get(self.URL)
+        with capture_queries() as statements:
+            resp = self.client.get(self.URL)
+        self.assertFalse([statement for statement in statements if "GROUP BY" in statement])
+        self.assertEqual(2, resp.json["category"]["books"])
+
+        ProductModel.query.filter_by(id=self.products[0].id).update({"listed": False})
+        db.session.commit()
+        resp = self.client.get(self.URL)
+        self.assertEqual(1, resp.json["category"]["books"])
+
+        ProductFactory(holder_id=self.shop_owner.id, listed=True)
+        resp = self.client.get(self.URL)
+        self.assertEqual(2, resp.json["category"]["pets"])
+
+    def test_get_shop_facet_after_shop_deactivated_expect_shop_not_counted(self):
+        self.client.get(self.URL + "?by=shop,category")
+
+        ShopModel.query.filter_by(id=self.shops[1].id).update({"active": False})
+        db.session.commit()
+        resp = self.client.get(self.URL + "?by=shop,category")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual({str(self.shops[0].id): 2}, resp.json["shop"])
+        self.assertEqual(2, resp.json["category"]["books"])
+
+    def test_get_facets_with_invalid_facet_expect_400(self):
+        resp = self.client.get(self.URL + "?by=category,color")
+
+        self.assertEqual(400, resp.status_code)
+        self.assertIn("1", resp.json["message"]["by"])
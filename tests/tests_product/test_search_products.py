@@ -0,0 +1,81 @@
+from constants.pagination import NEXT_CURSOR_HEADER
+from db import db
+from tests.base_test_case import BaseTestCase
+from tests.constants import Endpoints
+from tests.factories import OwnerFactory, ProductFactory, CustomerFactory
+from tests.helpers import generate_token
+
+
+class TestSearchProducts(BaseTestCase):
+    URL = Endpoints.SEARCH_PRODUCT
+
+    def setUp(self):
+        super().setUp()
+        self.shop_owner = OwnerFactory()
+        token = generate_token(self.shop_owner)
+        self.authorization_headers = {"Authorization": f"Bearer {token}"}
+
+    def _create_product(self, name, description=None, listed=True, holder_id=None):
+        product = ProductFactory(holder_id=holder_id or self.shop_owner.id, listed=listed)
+        product.name, product.description = name, description
+        db.session.commit()
+        return product
+
+    def test_search_expect_200_and_matching_products_ordered_by_relevance(self):
+        in_description = self._create_product("Leash", "Strong leash for big dogs")
+        in_name = self._create_product("Dog bed", "Soft and warm")
+        self._create_product("Cat toy", "Mouse with a bell")
+
+        resp = self.client.get(self.URL + "?q=dogs")
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([in_name.id, in_description.id], [item["id"] for item in resp.json])
+
+    def test_search_with_not_listed_products_expect_visibility_rules_applied(self):
+        listed = self._create_product("Dog bed")
+        not_listed = self._create_product("Dog collar", listed=False)
+        foreign_not_listed = self._create_product("Dog bowl", listed=False, holder_id=OwnerFactory().id)
+
+        resp = self.client.get(self.URL + "?q=dog", headers=self._create_authorization_header(CustomerFactory))
+        self.assertEqual([listed.id], [item["id"] for item in resp.json])
+
+        resp = self.client.get(self.URL + "?q=dog", headers=self.authorization_headers)
+        self.assertCountEqual([listed.id, not_listed.id], [item["id"] for item in resp.json])
+        self.assertNotIn(foreign_not_listed.id, [item["id"] for item in resp.json])
+
+    def test_search_with_limit_and_cursor_expect_200_and_all_matches_without_duplicates(self):
+        products = [self._create_product("Dog bed", "Big dog bed" if i % 2 else None) for i in range(5)]
+
+        resp = self.client.get(self.URL + "?q=dog&limit=2")
+        found = [item["id"] for item in resp.json]
+        while NEXT_CURSOR_HEADER in resp.headers:
+            resp = self.client.get(self.URL + f"?q=dog&limit=2&cursor={resp.headers[NEXT_CURSOR_HEADER]}")
+            self.assertEqual(200, resp.status_code)
+            found += [item["id"] for item in resp.json]
+
+        self.assertEqual(len(products), len(found))
+        self.assertCountEqual([product.id for product in products], found)
+        self.assertEqual({products[1].id, products[3].id}, set(found[:2]))
+
+    def test_search_with_filters_and_sort_expect_200_and_filtered_json(self):
+        cheap, expensive = self._create_product("Dog bed"), self._create_product("Dog bed")
+        cheap.price, expensive.price = 10, 100
+        db.session.commit()
+
+        resp = self.client.get(self.URL + "?q=dog&price_max=50")
+        self.assertEqual([cheap.id], [item["id"] for item in resp.json])
+
+        resp = self.client.get(self.URL + "?q=dog&sort=-price")
+        self.assertEqual([expensive.id, cheap.id], [item["id"] for item in resp.json])
+
+    def test_search_without_query_expect_400(self):
+        for query in ("", "?q=", "?sort=name&q=dog"):
+            resp = self.client.get(self.URL + query)
+
+            self.assertEqual(400, resp.status_code)
+
+    @staticmethod
+    def _create_authorization_header(factory):
+        user = factory()
+        token = generate_token(user)
+        return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,27 @@
+from hashlib import sha1
+
+from flask import request, Response
+from werkzeug.http import is_resource_modified, quote_etag, http_date
+
+
+def make_etag(*parts):
+    return sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def get_last_modified(instance):
+    return getattr(instance, "last_changed", None) or getattr(instance, "registered_on", None)
+
+
+def get_validator_headers(etag, last_modified=None):
+    # the body depends on the caller (e.g. extended schema for the holder), so caches must vary by it
+    headers = {"ETag": quote_etag(etag), "Vary": "Authorization"}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(etag, last_modified=None):
+    """Returns 304 response if the request validators match the current ones, else None"""
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return Response(status=304, headers=get_validator_headers(etag, last_modified))
@@ -1,9 +1,12 @@
 import base64
-import uuid
+import hashlib
 
+from werkzeug.datastructures import FileStorage
 from werkzeug.exceptions import BadRequest, NotFound
 
-from models import UserRoles, CustomerModel, ShopOwnerModel, AdminRoles, AdminModel
+from constants.extensions import CONTENT_TYPE_SIGNATURES, DEFAULT_CONTENT_TYPE
+from constants.uploads import HASH_CHUNK_SIZE
+from models import UserRoles, CustomerModel, ShopOwnerModel, AdminRoles, AdminModel, PendingUploadModel
 
 
 def get_user_model(role):
@@ -43,14 +46,39 @@ def decode_file(encoded_file):
     return base64.b64decode(encoded_file.encode("utf-8"))
 
 
-def save_file(path, file):
-    with open(path, "wb") as f:
-        f.write(file)
+def create_photo(photo, extension):
+    # presigned upload is already in S3 with its own name, it is only attached
+    if isinstance(photo, PendingUploadModel):
+        return photo.key, None
+    # uploaded file is passed as stream (spooled to disk by werkzeug when big), base64 string is decoded
+    content = photo.stream if isinstance(photo, FileStorage) else decode_file(photo)
+    # named by the content, so the same photo has the same name and is stored once
+    return f"{get_content_hash(content)}.{extension}", content
 
 
-def create_photo(photo_str, extension):
-    file_name = f"{str(uuid.uuid4())}.{extension}"
-    return file_name, decode_file(photo_str)
+def get_content_hash(content):
+    """sha256 of bytes or of file object, which is read in chunks and rewound"""
+    if isinstance(content, bytes):
+        return hashlib.sha256(content).hexdigest()
+    digest = hashlib.sha256()
+    position = content.tell()
+    for chunk in iter(lambda: content.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    content.seek(position)
+    return digest.hexdigest()
+
+
+def sniff_content_type(head):
+    """Content type by the leading bytes of the file"""
+    for signature, content_type in CONTENT_TYPE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return DEFAULT_CONTENT_TYPE
+
+
+def get_variant_photo_names(variants):
+    """Names of the photos in the variants column, which is {size: {format: url}}"""
+    return [get_photo_name_by_url(url) for formats in (variants or {}).values() for url in formats.values()]
 
 
 def has_photo(photo_str, extension):
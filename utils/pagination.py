@@ -0,0 +1,106 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import with_expression
+from werkzeug.exceptions import BadRequest
+
+from constants.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CURSOR_QUERY_PARAM, LIMIT_QUERY_PARAM, \
+    SORT_QUERY_PARAM, DEFAULT_SORT, STREAM_QUERY_PARAM, STREAM_BATCH_SIZE
+
+
+class Page:
+    """Keyset pagination over (sort field, id), sort field is prefixed with '-' for descending order
+
+    A streamed page has no limit, it returns all rows after the cursor in batches from a server side cursor.
+    """
+    INVALID_CURSOR_MESSAGE = "Invalid cursor!"
+    INVALID_LIMIT_MESSAGE = "Limit must be a positive integer!"
+    INVALID_SORT_MESSAGE = "Sorting is allowed only by {}!"
+
+    def __init__(self, cursor=None, limit=DEFAULT_PAGE_SIZE, sort=DEFAULT_SORT, sort_expressions=None, stream=False):
+        self.sort = sort
+        # sort fields which are computed per query (e.g. search rank) mapped to their SQL expressions
+        self.sort_expressions = sort_expressions or {}
+        self.sort_field = sort.lstrip("-")
+        self.descending = sort.startswith("-")
+        self.cursor = self.decode_cursor(cursor) if cursor else None
+        self.limit = min(limit, MAX_PAGE_SIZE)
+        self.stream = stream
+        self.next_cursor = None
+
+    @classmethod
+    def from_request_args(cls, args, sort_fields=(DEFAULT_SORT,), default_sort=DEFAULT_SORT, sort_expressions=None):
+        limit = args.get(LIMIT_QUERY_PARAM, DEFAULT_PAGE_SIZE)
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise BadRequest(cls.INVALID_LIMIT_MESSAGE)
+        if limit < 1:
+            raise BadRequest(cls.INVALID_LIMIT_MESSAGE)
+
+        sort = args.get(SORT_QUERY_PARAM, default_sort)
+        if sort.lstrip("-") not in sort_fields:
+            raise BadRequest(cls.INVALID_SORT_MESSAGE.format(", ".join(sort_fields)))
+
+        stream = args.get(STREAM_QUERY_PARAM, "").lower() in ("true", "1")
+        return cls(args.get(CURSOR_QUERY_PARAM), limit, sort, sort_expressions, stream)
+
+    def get_sort_key(self, model):
+        if self.sort_field in self.sort_expressions:
+            return self.sort_expressions[self.sort_field], model.id
+        return getattr(model, self.sort_field), model.id
+
+    def paginate(self, query, model):
+        """Returns single page of the query result and sets next_cursor if there are more rows"""
+        sort_key = self.get_sort_key(model)
+        if self.sort_field in self.sort_expressions:
+            # load the computed value in the instance so the cursor can be encoded from it
+            query = query.options(with_expression(getattr(model, self.sort_field), sort_key[0]))
+        if self.cursor:
+            row_key, cursor_key = tuple_(*sort_key), tuple_(*self._get_cursor_values(sort_key[0]))
+            query = query.filter(row_key < cursor_key if self.descending else row_key > cursor_key)
+
+        order_by = [column.desc() for column in sort_key] if self.descending else sort_key
+        if self.stream:
+            # not executed here, the rows are fetched while the response is sent
+            return query.order_by(*order_by).yield_per(STREAM_BATCH_SIZE)
+
+        # Fetch one extra row to know if there is a next page without counting
+        items = query.order_by(*order_by).limit(self.limit + 1).all()
+        if len(items) > self.limit:
+            items = items[:self.limit]
+            self.next_cursor = self.encode_cursor(items[-1])
+        return items
+
+    def encode_cursor(self, instance):
+        value = getattr(instance, self.sort_field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([self.sort, value, instance.id]).encode("utf-8")
+        # Padding is stripped so the cursor is safe in a query string
+        return base64.urlsafe_b64encode(payload).decode("utf-8").rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            sort, value, pk = json.loads(payload)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise BadRequest(self.INVALID_CURSOR_MESSAGE)
+
+        # Cursor is valid only for the sorting it was created with
+        if not sort == self.sort:
+            raise BadRequest(self.INVALID_CURSOR_MESSAGE)
+        return value, pk
+
+    def _get_cursor_values(self, sort_column):
+        value, pk = self.cursor
+        try:
+            if sort_column.type.python_type is datetime:
+                return datetime.fromisoformat(value), pk
+            return sort_column.type.python_type(value), pk
+        except (ValueError, TypeError):
+            raise BadRequest(self.INVALID_CURSOR_MESSAGE)
@@ -0,0 +1,57 @@
+import secrets
+from threading import BoundedSemaphore
+
+from decouple import config
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from constants.auth import PASSWORD_HASH_METHOD, PASSWORD_HASH_SALT_LENGTH, DEFAULT_PASSWORD_HASH_WORKERS, \
+    DEFAULT_PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_RETRY_AFTER
+from utils.process_pool import ProcessPool
+
+
+class PasswordHasher:
+    """Hashes and checks passwords in a process pool, so the request thread waits without holding the GIL
+
+    At most max_pending hashes are queued or running at once, the rest are rejected with 503.
+    """
+    BUSY_MESSAGE = "Too many login and registration requests, try again later!"
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or config("PASSWORD_HASH_WORKERS", default=DEFAULT_PASSWORD_HASH_WORKERS, cast=int)
+        self.max_pending = max_pending or config(
+            "PASSWORD_HASH_MAX_PENDING", default=DEFAULT_PASSWORD_HASH_MAX_PENDING, cast=int)
+        self._pending = BoundedSemaphore(self.max_pending)
+        self._pool = ProcessPool(self.workers)
+        # created up front, so the first login of unknown user does not cost one more hash than the wrong password
+        self._dummy_hash = generate_password_hash(
+            secrets.token_hex(16), PASSWORD_HASH_METHOD, PASSWORD_HASH_SALT_LENGTH)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, PASSWORD_HASH_METHOD, PASSWORD_HASH_SALT_LENGTH)
+
+    def check(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def check_unknown_user(self, password):
+        """Takes the same time as check of existing user's password, so unknown identifiers can't be told by timing"""
+        self.check(self._dummy_hash, password)
+        return False
+
+    @staticmethod
+    def needs_rehash(pwhash):
+        # the hash is method$salt$hash
+        method, _, rest = pwhash.partition("$")
+        salt = rest.partition("$")[0]
+        return not method == PASSWORD_HASH_METHOD or not len(salt) == PASSWORD_HASH_SALT_LENGTH
+
+    def _run(self, func, *args):
+        if not self._pending.acquire(blocking=False):
+            raise ServiceUnavailable(self.BUSY_MESSAGE, retry_after=PASSWORD_HASH_RETRY_AFTER)
+        try:
+            return self._pool.run(func, *args)
+        finally:
+            self._pending.release()
+
+
+password_hasher = PasswordHasher()
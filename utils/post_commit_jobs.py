@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock
+
+from flask import current_app
+from sqlalchemy import event
+
+from db import db
+
+
+class PostCommitJobs:
+    """Jobs which are scheduled in the session and run by background threads only after its commit
+
+    The jobs of the rolled back transaction are dropped. Every job runs func(*job) in the app context with its own
+    session, the errors are logged. The same job which still waits for a thread is not submitted again.
+    """
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._futures = set()
+        self._waiting = set()
+        self._lock = Lock()
+
+    def listen(self):
+        if not event.contains(db.session, "after_commit", self._after_commit):
+            event.listen(db.session, "after_commit", self._after_commit)
+            event.listen(db.session, "after_soft_rollback", self._after_soft_rollback)
+
+    def schedule(self, *job):
+        db.session.info.setdefault(self.name, []).append(job)
+
+    def submit(self, app, *job):
+        """Runs the job in a background thread right away"""
+        with self._lock:
+            if job in self._waiting:
+                return
+            self._waiting.add(job)
+            future = self._threads.submit(self.run, app, *job)
+            self._futures.add(future)
+        future.add_done_callback(self._done)
+
+    def run(self, app, *job):
+        with self._lock:
+            self._waiting.discard(job)
+        with app.app_context():
+            try:
+                self.func(*job)
+            except Exception:
+                app.logger.exception("Job %s%s failed", self.name, job)
+            finally:
+                db.session.remove()
+
+    def wait(self):
+        """Waits for all submitted jobs, e.g. in tests"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+
+    def _after_commit(self, session):
+        jobs = session.info.pop(self.name, [])
+        if not jobs:
+            return
+        app = current_app._get_current_object()
+        for job in jobs:
+            self.submit(app, *job)
+
+    def _after_soft_rollback(self, session, previous_transaction):
+        session.info.pop(self.name, None)
+
+    def _done(self, future):
+        with self._lock:
+            self._futures.discard(future)
@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from threading import Lock
+
+from constants.auth import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL
+from models import UserRoles, AdminRoles
+from utils.helpers import get_user_or_admin_model
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user, it is not bound to the db session"""
+    id: int
+    role: Enum
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(id=user.id, role=user.role)
+
+    @classmethod
+    def from_claims(cls, user_id, role_name):
+        roles = AdminRoles if role_name in AdminRoles.__members__ else UserRoles
+        return cls(id=int(user_id), role=roles[role_name])
+
+    @property
+    def user(self):
+        """The user row, loaded on every access, so the principal stays safe to share between requests"""
+        return get_user_or_admin_model(self.role.name).query.filter_by(id=self.id).first()
+
+    @property
+    def details(self):
+        # not part of the snapshot, details are created and changed while the principal is cached
+        details = getattr(get_user_or_admin_model(self.role.name), "details", None)
+        if details is None:
+            return None
+        return details.property.mapper.class_.query.filter_by(holder_id=self.id).first()
+
+
+class PrincipalCache:
+    """Thread safe LRU cache of principals by (role name, user id) with expiration"""
+
+    def __init__(self, max_size=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._principals = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, role, user_id, load):
+        """Returns the cached principal or creates it from the user returned by load(), None if there is no user"""
+        key = (role, user_id)
+        with self._lock:
+            principal, expires_at = self._principals.get(key, (None, 0))
+            if principal and expires_at > time.monotonic():
+                self._principals.move_to_end(key)
+                self.hits += 1
+                return principal
+            self.misses += 1
+
+        user = load()
+        if not user:
+            return None
+        principal = Principal.from_user(user)
+        with self._lock:
+            self._principals[key] = (principal, time.monotonic() + self.ttl)
+            self._principals.move_to_end(key)
+            while len(self._principals) > self.max_size:
+                self._principals.popitem(last=False)
+        return principal
+
+    def invalidate(self, role, user_id):
+        with self._lock:
+            self._principals.pop((role, user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._principals.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._principals)}
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,44 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+
+# the workers are started from a clean server process, not forked from the app with its threads and locks
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ProcessPool:
+    """Process pool which is created on first use and created again when one of its workers dies
+
+    The dead worker (e.g. killed by OOM) breaks the whole executor, every later submit would fail, so the broken
+    executor is replaced and the call is retried once.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = None
+        self._lock = Lock()
+
+    def run(self, func, *args):
+        """Runs func(*args) in a worker and waits for the result"""
+        executor = self._get_executor()
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            self._replace(executor)
+            return self._get_executor().submit(func, *args).result()
+
+    def _get_executor(self):
+        # created on first use, so the workers are not started by processes which never use them
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(START_METHOD))
+            return self._executor
+
+    def _replace(self, executor):
+        with self._lock:
+            # other thread may have replaced it already
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
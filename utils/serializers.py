@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+from marshmallow import fields, missing
+from marshmallow.utils import get_value
+from marshmallow_enum import EnumField, LoadDumpOptions
+
+
+class Serializer:
+    """Dumps objects with the output of schema_cls().dump, but without building a schema per object
+
+    Every field is compiled once to (data key, attribute name, converter, default). Fields which are not
+    compiled use the bound marshmallow field, and schemas with processing hooks use the schema itself. Values are
+    read with getattr, dotted attributes with marshmallow's get_value, and objects which can be indexed (e.g. dicts),
+    which get_value reads by key, are dumped by the schema.
+    """
+
+    def __init__(self, schema_cls):
+        self.schema = schema_cls()
+        self.fields = None if any(self.schema._hooks.values()) else [
+            self._compile_field(name, field) for name, field in self.schema.dump_fields.items()
+        ]
+
+    def dump(self, obj):
+        if self.fields is None or hasattr(obj, "__getitem__"):
+            return self.schema.dump(obj)
+
+        result = {}
+        for key, attribute, converter, default in self.fields:
+            value = get_value(obj, attribute) if "." in attribute else getattr(obj, attribute, missing)
+            if value is missing:
+                value = default() if callable(default) else default
+                if value is missing:
+                    continue
+            result[key] = converter(value) if value is not None else None
+        return result
+
+    def dump_many(self, objs):
+        return [self.dump(obj) for obj in objs]
+
+    @classmethod
+    def _compile_field(cls, name, field):
+        key = field.data_key if field.data_key is not None else name
+        attribute = field.attribute or name
+        return key, attribute, cls._get_converter(attribute, field), field.dump_default
+
+    @classmethod
+    def _get_converter(cls, attribute, field):
+        converter = cls._get_fast_converter(field)
+        if converter:
+            return converter
+        return lambda value: field._serialize(value, attribute, None)
+
+    @classmethod
+    def _get_fast_converter(cls, field):
+        if isinstance(field, fields.Number) and field.as_string:
+            return None
+        if isinstance(field, fields.Integer):
+            return int
+        if isinstance(field, fields.Float):
+            return float
+        if isinstance(field, fields.String):
+            return str
+        if isinstance(field, EnumField):
+            if field.dump_by == LoadDumpOptions.value:
+                return lambda value: value.value
+            return lambda value: value.name
+        if isinstance(field, fields.Nested) and isinstance(field.nested, type) and not (field.only or field.exclude):
+            serializer = get_serializer(field.nested)
+            return serializer.dump_many if field.many else serializer.dump
+        if isinstance(field, fields.List):
+            inner = cls._get_fast_converter(field.inner)
+            if inner:
+                return lambda value: [inner(item) if item is not None else None for item in value]
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_serializer(schema_cls):
+    """Returns the serializer of the schema, it is compiled only on the first call"""
+    return Serializer(schema_cls)